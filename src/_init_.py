@@ -5,12 +5,21 @@ A framework integrating number-theoretic resonance with graph-based information
 processing and meta-cognitive learning.
 """
 
+from typing import TYPE_CHECKING
+
+from core.lazy import lazy_attributes
+
 __version__ = "0.1.0"
 __author__ = "Your Name"
 
-from . import pprp
-from . import learning
-from . import qica
-from . import core
+if TYPE_CHECKING:
+    from . import pprp
+    from . import learning
+    from . import qica
+    from . import core
 
 __all__ = ['pprp', 'learning', 'qica', 'core']
+
+
+# Subpackages are imported on first access
+__getattr__, __dir__ = lazy_attributes(__name__, dict.fromkeys(__all__), __all__)
@@ -0,0 +1,29 @@
+import importlib
+import sys
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+def lazy_attributes(package: str, lazy_attrs: Dict[str, Optional[str]],
+                    public: Iterable[str]) -> Tuple[Callable, Callable]:
+    """
+    PEP 562 ``__getattr__`` and ``__dir__`` for ``package``. Each name in
+    ``lazy_attrs`` is imported from its module (relative to ``package``)
+    on first access and cached on the package; a name mapped to ``None``
+    is the subpackage of that name.
+    """
+    public = frozenset(public)
+
+    def __getattr__(name: str):
+        if name not in lazy_attrs:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module = lazy_attrs[name]
+        if module is None:
+            value = importlib.import_module('.' + name, package)
+        else:
+            value = getattr(importlib.import_module(module, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package])) | public)
+
+    return __getattr__, __dir__
@@ -4,15 +4,35 @@ Autonomous Learning Cycle
 Meta-cognitive learning system with energy awareness and provenance tracking.
 """
 
+from typing import TYPE_CHECKING
+
+from core.lazy import lazy_attributes
+
 __version__ = "0.1.0"
 
-from .cycle import EnhancedAutonomousLearningCycle
-from .model_registry import ModelRegistry, ModelCapability
-from .provenance import ProvenanceGraph, ProvenanceNode
-from .memory import MemoryHierarchy
-from .validation import ValidationLayer
+# Public name -> defining module, imported on first access
+_LAZY_ATTRS = {
+    'EnhancedAutonomousLearningCycle': '.cycle',
+    'ModelRegistry': '.model_registry',
+    'ModelCapability': '.model_registry',
+    'ProvenanceGraph': '.provenance',
+    'ProvenanceNode': '.provenance',
+    'MemoryHierarchy': '.memory',
+    'ValidationLayer': '.validation',
+}
+
+if TYPE_CHECKING:
+    from .cycle import EnhancedAutonomousLearningCycle
+    from .model_registry import ModelRegistry, ModelCapability
+    from .provenance import ProvenanceGraph, ProvenanceNode
+    from .memory import MemoryHierarchy
+    from .validation import ValidationLayer
 
 __all__ = [
     'EnhancedAutonomousLearningCycle', 'ModelRegistry', 'ModelCapability',
     'ProvenanceGraph', 'ProvenanceNode', 'MemoryHierarchy', 'ValidationLayer'
 ]
+
+
+# PEP 562: imported on first access, then cached on the package
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRS, __all__)
@@ -4,20 +4,45 @@ Pi-Phi-Prime Resonant Information Processor (PPRP)
 A mathematical information processing framework combining π, φ, and prime numbers.
 """
 
+from typing import TYPE_CHECKING
+
+from core.lazy import lazy_attributes
+
 __version__ = "0.1.0"
 __author__ = "Daniel Dragolich"
 
-# Import main classes
-from .core import EnhancedPiCore, EnhancedPhiCore, EnhancedOmegaCore, EnhancedBetaCore
-from .manifold import EnhancedSubstrateManifold
-from .nodule import EnhancedPrimeNodule
-from .operators import EnhancedTransputation, EnhancedRealitySelection, EnhancedAwareness
-from .system_api import EnhancedCGOSSyscall
-from .options import PPRIPOptions
+# Public name -> defining module, imported on first access
+_LAZY_ATTRS = {
+    'EnhancedPiCore': '.core',
+    'EnhancedPhiCore': '.core',
+    'EnhancedOmegaCore': '.core',
+    'EnhancedBetaCore': '.core',
+    'EnhancedSubstrateManifold': '.manifold',
+    'EnhancedPrimeNodule': '.nodule',
+    'EnhancedTransputation': '.operators',
+    'EnhancedRealitySelection': '.operators',
+    'EnhancedAwareness': '.operators',
+    'EnhancedCGOSSyscall': '.system_api',
+    'PPRIPOptions': '.options',
+    'EnsembleRunner': '.ensemble',
+}
+
+if TYPE_CHECKING:
+    from .core import EnhancedPiCore, EnhancedPhiCore, EnhancedOmegaCore, EnhancedBetaCore
+    from .manifold import EnhancedSubstrateManifold
+    from .nodule import EnhancedPrimeNodule
+    from .operators import EnhancedTransputation, EnhancedRealitySelection, EnhancedAwareness
+    from .system_api import EnhancedCGOSSyscall
+    from .options import PPRIPOptions
+    from .ensemble import EnsembleRunner
 
 __all__ = [
     'EnhancedPiCore', 'EnhancedPhiCore', 'EnhancedOmegaCore', 'EnhancedBetaCore',
     'EnhancedSubstrateManifold', 'EnhancedPrimeNodule',
     'EnhancedTransputation', 'EnhancedRealitySelection', 'EnhancedAwareness',
-    'EnhancedCGOSSyscall', 'PPRIPOptions'
+    'EnhancedCGOSSyscall', 'PPRIPOptions', 'EnsembleRunner'
 ]
+
+
+# PEP 562: imported on first access, then cached on the package
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRS, __all__)
@@ -0,0 +1,118 @@
+import networkx as nx
+import numpy as np
+import math
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Any, Tuple, Optional
+
+from .graph_backend import number_connected_components
+
+PI = math.pi
+PHI = (1 + math.sqrt(5)) / 2
+
+@dataclass
+class CoreMetric:
+    """
+    A core's reading: its value, the threshold it is judged against, and the
+    axiom it measures. Sampled estimates have ``exact`` False and, when
+    known, a ``confidence_interval`` of (low, high).
+    """
+    value: float
+    threshold: float
+    axiom_id: str
+    exact: bool = True
+    confidence_interval: Optional[tuple] = None
+
+class SubstrateManifold:
+    """
+    CGOS substrate: a small-world graph whose cycles, edge density and
+    Betti number feed the π, φ, Ω and β cores.
+    """
+    def __init__(self, n: int = 30, k: int = 4, seed: Optional[int] = None):
+        # Without a seed, drawn from the global ``random`` state, so seeding it reproduces the graph
+        if seed is None:
+            seed = random.randrange(2**32)
+        self.G = nx.watts_strogatz_graph(n, k, 0.1, seed=seed)
+
+    def cycle_basis(self) -> List[List[int]]:
+        """Fundamental cycle basis of G."""
+        return nx.cycle_basis(self.G)
+
+    def pi_resonant_cycles(self) -> List[Tuple[int, float]]:
+        """(length, harmonic ratio) of every basis cycle: its length over the nearest multiple of 2π."""
+        lengths = np.array([len(cycle) for cycle in self.cycle_basis()], dtype=np.float64)
+        ratios = lengths / (2 * PI * np.maximum(np.round(lengths / (2 * PI)), 1.0))
+        return list(zip(lengths.astype(int).tolist(), ratios.tolist()))
+
+    def golden_adjacency(self) -> float:
+        """Relative deviation of the edge-to-node ratio from φ."""
+        n = self.G.number_of_nodes()
+        if n == 0:
+            return 1.0
+        return abs(self.G.number_of_edges() / n - PHI) / PHI
+
+    def omega_complexity(self) -> float:
+        """Independent cycles per node."""
+        return self.betti1() / max(self.G.number_of_nodes(), 1)
+
+    def betti1(self) -> int:
+        """First Betti number, E − N + C."""
+        G = self.G
+        return G.number_of_edges() - G.number_of_nodes() + number_connected_components(G)
+
+class PiCore:
+    """π axiom: how close the best basis cycle comes to a harmonic of 2π."""
+    def __call__(self, manifold) -> CoreMetric:
+        cycles = manifold.pi_resonant_cycles()
+        best = min(abs(hr-1.0) for _, hr in cycles) if cycles else 1.0
+        return CoreMetric(best, 0.05, "π")
+
+class PhiCore:
+    """φ axiom: golden-ratio deviation of the edge density."""
+    def __call__(self, manifold) -> CoreMetric:
+        return CoreMetric(manifold.golden_adjacency(), 0.1, "φ")
+
+class OmegaCore:
+    """Ω axiom: topological complexity."""
+    def __call__(self, manifold) -> CoreMetric:
+        return CoreMetric(manifold.omega_complexity(), 1e6, "Ω")
+
+class BetaCore:
+    """β axiom: whether the substrate has a cycle at all."""
+    def __call__(self, manifold) -> CoreMetric:
+        return CoreMetric(float(manifold.betti1() > 0), 1.0, "β")
+
+class PrimeNodule:
+    """Processing unit for one prime, reading the π and φ cores."""
+    def __init__(self, p: int):
+        self.p = p
+        self.state: Dict[str, Any] = {}
+        self.pi = PiCore()
+        self.phi = PhiCore()
+
+    def step(self, manifold, global_c: dict):
+        self.state['pi_metric'] = self.pi(manifold).value
+        self.state['phi_metric'] = self.phi(manifold).value
+        self.state['active'] = global_c.get('prime_mask', 0) & (1 << self.p) != 0
+
+class Transputation:
+    """⟡: turns the Ω and β readings into an insight, or None."""
+    def __call__(self, omega_metric: CoreMetric, beta_metric: CoreMetric, *args) -> Optional[str]:
+        if omega_metric.value > omega_metric.threshold and beta_metric.value:
+            return "⟡ insight: π-φ-prime resonance achieved – self-loop resolved"
+        return None
+
+class RealitySelection:
+    """ℛ: picks one of ``choices``, weighting each by coherence plus uniform jitter."""
+    def __call__(self, coherence: float, choices: list, *args) -> Any:
+        weights = [coherence + (1-coherence) * random.random() for _ in choices]
+        return random.choices(choices, weights=weights, k=1)[0]
+
+class Awareness:
+    """Â: records the latest core readings in the global context."""
+    def __call__(self, global_c: dict, metrics: list, *args):
+        global_c['self_model'] = {m.axiom_id: m.value for m in metrics}
+        global_c['timestamp'] += 1
+
+class CGOSSyscall:
+    """Base of the syscall interface; subclasses own the manifold, cores and operators."""
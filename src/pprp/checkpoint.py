@@ -0,0 +1,55 @@
+import json
+import os
+import numpy as np
+from contextlib import contextmanager
+from typing import Dict, Any, Tuple
+
+CHECKPOINT_FORMAT = 1
+SIDECAR = 'checkpoint.json'
+
+def write_checkpoint(path: str, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]):
+    """
+    Write ``arrays`` as ``<name>.npy`` files plus a JSON sidecar into the
+    directory ``path``. Any existing sidecar is removed before the first
+    array is written and the new one is written last, so a directory with a
+    sidecar always holds a complete checkpoint, even one interrupted while
+    overwriting another. Every file is written to a temporary name and
+    renamed into place: saving over the checkpoint a system was restored
+    from never truncates files it still maps.
+    """
+    os.makedirs(path, exist_ok=True)
+    sidecar = os.path.join(path, SIDECAR)
+    if os.path.exists(sidecar):
+        os.remove(sidecar)
+    for name, array in arrays.items():
+        with _replacing(os.path.join(path, name + '.npy'), 'wb') as f:
+            np.save(f, np.ascontiguousarray(array))
+    meta = {'format': CHECKPOINT_FORMAT, 'arrays': sorted(arrays), **meta}
+    with _replacing(sidecar, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+
+@contextmanager
+def _replacing(target: str, mode: str, **kwargs):
+    """Open a temporary file next to ``target``; it replaces ``target`` once the block succeeds."""
+    tmp = target + '.tmp'
+    try:
+        with open(tmp, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp, target)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def read_checkpoint(path: str, mmap_mode: str = 'c') -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """
+    Read a checkpoint written by ``write_checkpoint``. Arrays are memory-mapped
+    copy-on-write by default: nothing is read until touched and in-place
+    writes never reach the files.
+    """
+    with open(os.path.join(path, SIDECAR), encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get('format') != CHECKPOINT_FORMAT:
+        raise ValueError(f"Unsupported checkpoint format {meta.get('format')!r}; expected {CHECKPOINT_FORMAT}")
+    arrays = {name: np.load(os.path.join(path, name + '.npy'), mmap_mode=mmap_mode, allow_pickle=False)
+              for name in meta['arrays']}
+    return arrays, meta
@@ -1,24 +1,31 @@
+import networkx as nx
+import numpy as np
+
+from .cgos import CoreMetric, PiCore, PhiCore, OmegaCore, BetaCore, PI, PHI
+from .resonance_engine import best_harmonic_deviation
+
 class EnhancedPiCore(PiCore):
     """
     Enhanced version of PiCore with PPRIP resonance analysis.
     """
     def __call__(self, manifold) -> CoreMetric:
-        # Original implementation
-        cycles = manifold.pi_resonant_cycles()
-        best = min((abs(hr-1.0), L) for L,hr in cycles)[0] if cycles else 1.0
-        
-        # PPRIP enhancement: analyze graph for π-resonance
-        min_dev_pi = float('inf')
-        for cycle in nx.cycle_basis(manifold.G):
-            L = len(cycle)
-            k_opt = round(L / (2 * PI))
-            dev = abs(L - 2 * PI * k_opt)
-            if dev < min_dev_pi:
-                min_dev_pi = dev
+        if manifold.options.approximate_metrics:
+            # Both scores from sampled cycles while the topology tracker is stale
+            best, min_dev_pi, exact = manifold.approximate_metrics().pi_scores(manifold)
+        else:
+            # Original implementation, scored over distinct cycle lengths: the best
+            # harmonic ratio is the same whichever cycles share a length
+            spectrum = manifold.pi_deviation_spectrum()
+            best = best_harmonic_deviation(spectrum['length'])
+            
+            # PPRIP enhancement: analyze graph for π-resonance over distinct cycle lengths
+            deviation = spectrum['deviation']
+            min_dev_pi = float(deviation.min()) if len(deviation) else float('inf')
+            exact = True
         
         # Combine both metrics
         combined_metric = (best + min_dev_pi) / 2
-        return CoreMetric(combined_metric, 0.05, "π")
+        return CoreMetric(combined_metric, 0.05, "π", exact)
 
 class EnhancedPhiCore(PhiCore):
     """
@@ -29,13 +36,16 @@ class EnhancedPhiCore(PhiCore):
         err = manifold.golden_adjacency()
         
         # PPRIP enhancement: analyze node states for φ-optimization
-        node_states = manifold.get_node_states()
-        if node_states:
-            # Analyze growth rate of cumulative sum of state magnitudes
-            state_mags = [np.linalg.norm(s) for s in node_states]
-            cumsum = np.cumsum(state_mags)
-            if len(cumsum) >= 2 and cumsum[-2] != 0:
-                growth_rate = cumsum[-1] / cumsum[-2]
+        num_states = len(manifold.state_array)
+        exact = True
+        if num_states:
+            # Analyze growth rate of cumulative sum of state magnitudes (running totals)
+            if manifold.options.approximate_metrics:
+                total, prev_total, exact = manifold.approximate_metrics().phi_totals(manifold)
+            else:
+                total, prev_total = manifold.cumulative_magnitudes()
+            if num_states >= 2 and prev_total != 0:
+                growth_rate = total / prev_total
                 dev_phi = abs(growth_rate - PHI)
                 # Combine both metrics
                 combined_metric = (err + dev_phi) / 2
@@ -44,7 +54,7 @@ class EnhancedPhiCore(PhiCore):
         else:
             combined_metric = err
         
-        return CoreMetric(combined_metric, 0.1, "φ")
+        return CoreMetric(combined_metric, 0.1, "φ", exact)
 
 class EnhancedOmegaCore(OmegaCore):
     """
@@ -55,15 +65,20 @@ class EnhancedOmegaCore(OmegaCore):
         omega = manifold.omega_complexity()
         
         # PPRIP enhancement: variance of node states
-        node_states = manifold.get_node_states()
-        if node_states:
-            omega_proxy = float(np.var(np.concatenate([s.flatten() for s in node_states])))
+        exact, interval = True, None
+        if manifold.state_array.size:
+            if manifold.options.approximate_metrics:
+                omega_proxy, interval, exact = manifold.approximate_metrics().omega(manifold)
+            else:
+                omega_proxy = manifold.state_variance()
             # Combine both metrics
             combined_metric = (omega + omega_proxy) / 2
+            if interval is not None:
+                interval = ((omega + interval[0]) / 2, (omega + interval[1]) / 2)
         else:
             combined_metric = omega
         
-        return CoreMetric(combined_metric, 1e6, "Ω")
+        return CoreMetric(combined_metric, 1e6, "Ω", exact, interval)
 
 class EnhancedBetaCore(BetaCore):
     """
@@ -73,8 +88,9 @@ class EnhancedBetaCore(BetaCore):
         # Original implementation
         b1 = manifold.betti1()
         
-        # PPRIP enhancement: cycle basis size
-        beta1_proxy = len(nx.cycle_basis(manifold.G))
+        # PPRIP enhancement: cycle basis size, tracked incrementally (counted
+        # from a spanning forest while approximating against a stale tracker)
+        beta1_proxy = manifold.betti1()
         
         # Combine both metrics
         combined_metric = float(b1 > 0 and beta1_proxy > 0)
@@ -0,0 +1,250 @@
+import os
+import numpy as np
+from typing import Dict, List, Any, Tuple, Optional, Sequence, Iterator
+
+DEFAULT_METRIC_IDS = ('π', 'φ', 'Ω', 'β')
+
+def _record_dtype(num_metrics: int) -> np.dtype:
+    """Layout of one spilled event."""
+    return np.dtype([('timestamp', '<i8'), ('insight', '<i4'), ('metrics', '<f8', (num_metrics,))])
+
+class EmergenceLog:
+    """
+    Columnar record of emergence events.
+
+    Timestamps, insight codes and one column per core metric live in
+    growable NumPy arrays; insight strings are interned once and stored as
+    small integer codes. With ``capacity`` set the log is a ring buffer that
+    keeps only the latest events; with ``spill_path`` every event is also
+    appended to a binary file (see ``read_spill``), so nothing is lost when
+    the ring wraps.
+
+    It still behaves like the list of dicts ``global_c['emergence_history']``
+    used to be: ``append``, ``len``, indexing and iteration work on
+    ``{'timestamp', 'insight', 'metrics'}`` dicts.
+    """
+    def __init__(self, metric_ids: Sequence[str] = DEFAULT_METRIC_IDS,
+                 capacity: Optional[int] = None, spill_path: Optional[str] = None,
+                 initial_size: int = 64):
+        if capacity is not None and capacity < 1:
+            raise ValueError(f"capacity must be at least 1 or None, not {capacity!r}")
+        self.metric_ids = list(metric_ids)
+        self._metric_col = {c_id: j for j, c_id in enumerate(self.metric_ids)}
+        self.capacity = capacity
+        size = capacity if capacity is not None else initial_size
+        self._timestamps = np.zeros(size, dtype=np.int64)
+        self._codes = np.zeros(size, dtype=np.int32)
+        self._metrics = np.full((size, len(self.metric_ids)), np.nan)
+        self._start = 0  # ring head: position of the oldest retained event
+        self._len = 0
+        self.total = 0  # events ever recorded, including evicted ones
+        self.insights: List[str] = []
+        self._insight_code: Dict[str, int] = {}
+        self.spill_path = spill_path
+        self._spill = None
+        if spill_path is not None:
+            self._spill = open(spill_path, 'ab')
+            self._spill_insights = open(spill_path + '.insights', 'a', encoding='utf-8')
+
+    # -- recording ------------------------------------------------------------
+
+    def intern(self, insight: str) -> int:
+        """Code for an insight string, assigning a new one on first sight."""
+        code = self._insight_code.get(insight)
+        if code is None:
+            code = self._insight_code[insight] = len(self.insights)
+            self.insights.append(insight)
+            if self._spill is not None:
+                self._spill_insights.write(insight.replace('\n', ' ') + '\n')
+                self._spill_insights.flush()
+        return code
+
+    def record(self, timestamp: int, insight: str, metrics: Dict[str, float]):
+        """Record one emergence event."""
+        code = self.intern(insight)
+        row = np.fromiter((metrics.get(c_id, np.nan) for c_id in self.metric_ids),
+                          dtype=float, count=len(self.metric_ids))
+        if self.capacity is not None and self._len == self.capacity:
+            pos = self._start
+            self._start = (self._start + 1) % self.capacity
+        else:
+            if self._len == len(self._timestamps):
+                self._grow()
+            pos = (self._start + self._len) % len(self._timestamps)
+            self._len += 1
+        self._timestamps[pos] = timestamp
+        self._codes[pos] = code
+        self._metrics[pos] = row
+        self.total += 1
+        if self._spill is not None:
+            record = np.zeros(1, dtype=_record_dtype(len(self.metric_ids)))
+            record['timestamp'], record['insight'], record['metrics'] = timestamp, code, row
+            self._spill.write(record.tobytes())
+
+    def append(self, event: Dict[str, Any]):
+        """List-style append of a ``{'timestamp', 'insight', 'metrics'}`` dict."""
+        self.record(event['timestamp'], event['insight'], event.get('metrics', {}))
+
+    def _grow(self):
+        order = self._order()
+        size = max(2 * len(self._timestamps), 1)
+        timestamps = np.zeros(size, dtype=np.int64)
+        codes = np.zeros(size, dtype=np.int32)
+        metrics = np.full((size, len(self.metric_ids)), np.nan)
+        timestamps[:self._len] = self._timestamps[order]
+        codes[:self._len] = self._codes[order]
+        metrics[:self._len] = self._metrics[order]
+        self._timestamps, self._codes, self._metrics = timestamps, codes, metrics
+        self._start = 0
+
+    def flush(self):
+        """Push spilled events to the OS."""
+        if self._spill is not None:
+            self._spill.flush()
+
+    def close(self):
+        """Flush and close the spill file; the in-memory log stays usable."""
+        if self._spill is not None:
+            self._spill.close()
+            self._spill_insights.close()
+            self._spill = None
+
+    # -- columns --------------------------------------------------------------
+
+    def _order(self) -> np.ndarray:
+        """Storage positions of the retained events, oldest first."""
+        return (self._start + np.arange(self._len)) % len(self._timestamps)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Timestamps of the retained events, oldest first."""
+        return self._timestamps[self._order()]
+
+    @property
+    def codes(self) -> np.ndarray:
+        """Insight codes of the retained events (index into ``insights``)."""
+        return self._codes[self._order()]
+
+    @property
+    def metrics(self) -> np.ndarray:
+        """(events, metrics) array of core metric values, columns in ``metric_ids`` order."""
+        return self._metrics[self._order()]
+
+    def metric(self, axiom_id: str) -> np.ndarray:
+        """One metric column, oldest event first."""
+        return self._metrics[self._order(), self._metric_col[axiom_id]]
+
+    # -- queries --------------------------------------------------------------
+
+    def count_by_insight(self) -> Dict[str, int]:
+        """Number of retained events per insight."""
+        counts = np.bincount(self.codes, minlength=len(self.insights))
+        return {insight: int(n) for insight, n in zip(self.insights, counts) if n}
+
+    def _window(self, start: Optional[int], end: Optional[int]) -> np.ndarray:
+        """Positions of retained events with start <= timestamp <= end."""
+        order = self._order()
+        timestamps = self._timestamps[order]
+        # Timestamps are recorded in non-decreasing order
+        lo = 0 if start is None else np.searchsorted(timestamps, start, side='left')
+        hi = len(order) if end is None else np.searchsorted(timestamps, end, side='right')
+        return order[lo:hi]
+
+    def between(self, start: Optional[int] = None, end: Optional[int] = None) -> Dict[str, Any]:
+        """Events with ``start <= timestamp <= end`` as columns (either bound may be None)."""
+        window = self._window(start, end)
+        return {
+            'timestamp': self._timestamps[window],
+            'insight': self._codes[window],
+            'metrics': {c_id: self._metrics[window, j] for c_id, j in self._metric_col.items()}
+        }
+
+    def aggregate(self, start: Optional[int] = None, end: Optional[int] = None) -> Dict[str, Any]:
+        """Event count and per-metric mean/min/max over a timestamp range."""
+        values = self._metrics[self._window(start, end)]
+        stats = {}
+        for c_id, j in self._metric_col.items():
+            column = values[:, j]
+            column = column[~np.isnan(column)]
+            stats[c_id] = {
+                'mean': float(column.mean()) if len(column) else float('nan'),
+                'min': float(column.min()) if len(column) else float('nan'),
+                'max': float(column.max()) if len(column) else float('nan')
+            }
+        return {'count': len(values), 'metrics': stats}
+
+    # -- list compatibility ---------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._len
+
+    def _event(self, pos: int) -> Dict[str, Any]:
+        return {
+            'timestamp': int(self._timestamps[pos]),
+            'insight': self.insights[self._codes[pos]],
+            'metrics': {c_id: float(self._metrics[pos, j]) for c_id, j in self._metric_col.items()}
+        }
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._event(pos) for pos in self._order()[index].tolist()]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("emergence log index out of range")
+        return self._event((self._start + index) % len(self._timestamps))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for pos in self._order().tolist():
+            yield self._event(pos)
+
+    # -- persistence ----------------------------------------------------------
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Retained events as arrays, oldest first."""
+        return {'timestamps': self.timestamps, 'codes': self.codes, 'metrics': self.metrics}
+
+    @classmethod
+    def from_arrays(cls, timestamps: np.ndarray, codes: np.ndarray, metrics: np.ndarray,
+                    insights: List[str], metric_ids: Sequence[str] = DEFAULT_METRIC_IDS,
+                    capacity: Optional[int] = None, spill_path: Optional[str] = None,
+                    total: Optional[int] = None) -> "EmergenceLog":
+        """
+        Rebuild a log from ``to_arrays`` output and its insight table. Pass the
+        saved log's ``total`` to keep counting the events it had evicted.
+        """
+        log = cls(metric_ids, capacity=capacity, spill_path=spill_path)
+        log.insights = list(insights)
+        log._insight_code = {insight: code for code, insight in enumerate(log.insights)}
+        if log._spill is not None and log._spill_insights.tell() == 0:
+            # Fresh spill file: its insight table must cover the restored codes
+            log._spill_insights.write(''.join(i.replace('\n', ' ') + '\n' for i in log.insights))
+            log._spill_insights.flush()
+        n = len(timestamps) if capacity is None else min(len(timestamps), capacity)
+        if n > len(log._timestamps):
+            log._timestamps = np.zeros(n, dtype=np.int64)
+            log._codes = np.zeros(n, dtype=np.int32)
+            log._metrics = np.full((n, len(log.metric_ids)), np.nan)
+        log._timestamps[:n] = timestamps[len(timestamps) - n:]
+        log._codes[:n] = codes[len(codes) - n:]
+        log._metrics[:n] = metrics[len(metrics) - n:]
+        log._len = n
+        log.total = n if total is None else max(total, n)
+        return log
+
+    @staticmethod
+    def read_spill(spill_path: str, metric_ids: Sequence[str] = DEFAULT_METRIC_IDS) -> Dict[str, Any]:
+        """Every event in a spill file as columns, plus the insight table."""
+        dtype = _record_dtype(len(metric_ids))
+        records = np.fromfile(spill_path, dtype=dtype) if os.path.exists(spill_path) else np.zeros(0, dtype)
+        insights_path = spill_path + '.insights'
+        insights = []
+        if os.path.exists(insights_path):
+            with open(insights_path, encoding='utf-8') as f:
+                insights = f.read().splitlines()
+        return {
+            'timestamp': records['timestamp'],
+            'insight': records['insight'],
+            'metrics': {c_id: records['metrics'][:, j] for j, c_id in enumerate(metric_ids)},
+            'insights': insights
+        }
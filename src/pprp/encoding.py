@@ -0,0 +1,77 @@
+import numpy as np
+from typing import Any, Iterator, List, Tuple
+
+# Byte b encodes as (b + 1) / 256: stable across processes and strictly
+# positive, so cumulative sums over a byte stream always grow
+BYTE_VALUES = (np.arange(256, dtype=float) + 1) / 256
+
+# memoryview formats carrying raw bytes rather than typed numbers
+_BYTE_FORMATS = ('B', 'b', 'c')
+
+class InputEncoder:
+    """
+    Turns an input into the numeric stream fed to φ-resonance analysis.
+
+    - numbers: a one-value stream, as before;
+    - ``str``: its UTF-8 bytes, encoded like any byte buffer;
+    - NumPy arrays and typed buffers (e.g. ``array.array('d')``): their
+      values, flattened, read in place;
+    - raw byte buffers (``bytes``, ``bytearray``, ``memoryview``,
+      ``mmap.mmap``, ...): read in place through the buffer protocol and
+      encoded bytewise via ``BYTE_VALUES``;
+    - anything else: ``[1.0]``.
+
+    ``chunks`` yields the stream in bounded pieces, so a multi-megabyte
+    payload is never materialized as floats all at once.
+    """
+    def __init__(self, chunk_size: int = 1 << 20):
+        self.chunk_size = chunk_size
+
+    def chunks(self, data: Any) -> Iterator[np.ndarray]:
+        """The encoded stream of ``data`` in pieces of at most ``chunk_size`` values."""
+        values, is_bytes = self._source(data)
+        for start in range(0, len(values), self.chunk_size):
+            chunk = values[start:start + self.chunk_size]
+            yield BYTE_VALUES[chunk] if is_bytes else chunk.astype(float, copy=False)
+
+    def encode(self, data: Any) -> np.ndarray:
+        """The whole encoded stream of ``data`` as one float array."""
+        values, is_bytes = self._source(data)
+        return BYTE_VALUES[values] if is_bytes else values.astype(float, copy=False)
+
+    def encode_batch(self, inputs: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Encode many inputs into packed stream values and per-input stream
+        lengths. A numeric array is one input per row (its first axis), each
+        row encoded like ``encode`` would, flattened.
+        """
+        if isinstance(inputs, np.ndarray) and inputs.dtype.kind in 'biuf' and inputs.ndim:
+            row_length = int(np.prod(inputs.shape[1:], dtype=np.int64))
+            values = inputs.astype(float).ravel()
+            return values, np.full(len(inputs), row_length, dtype=np.int64)
+        streams = [self.encode(x) for x in inputs]
+        lengths = np.fromiter((len(s) for s in streams), dtype=np.int64, count=len(streams))
+        values = np.concatenate(streams) if streams else np.zeros(0)
+        return values, lengths
+
+    @staticmethod
+    def _source(data: Any) -> Tuple[np.ndarray, bool]:
+        """A flat, uncopied view of the input's values and whether they are raw bytes."""
+        if isinstance(data, (int, float, np.number)) and not isinstance(data, np.complexfloating):
+            return np.array([float(data)]), False
+        if isinstance(data, str):
+            return np.frombuffer(data.encode('utf-8'), dtype=np.uint8), True
+        if isinstance(data, np.ndarray):
+            if data.dtype.kind in 'biuf':
+                return data.ravel(), False
+            return np.array([1.0]), False
+        try:
+            view = memoryview(data)
+        except TypeError:
+            return np.array([1.0]), False
+        values = np.asarray(view)
+        if view.format in _BYTE_FORMATS:
+            return values.view(np.uint8).ravel(), True
+        if values.dtype.kind in 'biuf':
+            return values.ravel(), False
+        return np.array([1.0]), False
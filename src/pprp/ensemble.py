@@ -0,0 +1,106 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Sequence
+
+from .options import PPRIPOptions
+from .system_api import EnhancedCGOSSyscall
+
+@dataclass
+class EnsembleJob:
+    """One independently seeded run: options, a seed and the inputs to feed it."""
+    index: int
+    options: PPRIPOptions
+    seed: np.random.SeedSequence
+    inputs: Sequence[Any]
+
+
+@dataclass
+class RunSummary:
+    """Compact result of one run, cheap to send back from a worker."""
+    index: int
+    num_steps: int
+    emergence_count: int
+    first_emergence: int  # step of the first emergence, -1 if none
+    emergence_steps: np.ndarray
+    final_metrics: Dict[str, float] = field(default_factory=dict)
+
+
+def make_jobs(options: PPRIPOptions, inputs: Sequence[Any], num_runs: int,
+              master_seed: int) -> List[EnsembleJob]:
+    """
+    ``num_runs`` jobs sharing ``options`` and ``inputs``, each seeded with a
+    child of ``SeedSequence(master_seed)``. The seeds depend only on the
+    master seed and the job index.
+    """
+    seeds = np.random.SeedSequence(master_seed).spawn(num_runs)
+    return [EnsembleJob(i, options, seed, inputs) for i, seed in enumerate(seeds)]
+
+
+def run_job(job: EnsembleJob) -> RunSummary:
+    """Run one job to completion (the worker entry point)."""
+    # The manifold draws its graph from this generator too, so the whole run is a function of its seed
+    rng = np.random.default_rng(job.seed)
+
+    syscall = EnhancedCGOSSyscall(job.options, rng=rng)
+    try:
+        results = syscall.process_batch(list(job.inputs))
+        emergence_steps = np.flatnonzero(results['emergence_detected'])
+        return RunSummary(
+            index=job.index,
+            num_steps=len(results['emergence_detected']),
+            emergence_count=len(emergence_steps),
+            first_emergence=int(emergence_steps[0]) if len(emergence_steps) else -1,
+            emergence_steps=emergence_steps,
+            final_metrics={m.axiom_id: float(m.value) for m in syscall._evaluate_cores()}
+        )
+    finally:
+        # Worker threads, shard processes, shared memory and spill files go with the run
+        syscall.close()
+
+
+class EnsembleRunner:
+    """
+    Runs many independently seeded PPRIP systems across a process pool.
+
+    Every job carries its own seed, so each run is reproducible on its own
+    and results come back in job order: for a given master seed the output
+    is identical whatever ``max_workers`` is. ``max_workers=1`` runs in
+    process without a pool.
+    """
+    def __init__(self, max_workers: Optional[int] = None, chunksize: int = 1):
+        self.max_workers = max_workers
+        self.chunksize = chunksize
+
+    def run(self, jobs: List[EnsembleJob]) -> List[RunSummary]:
+        """Run the jobs and return their summaries in job order."""
+        if self.max_workers == 1:
+            return [run_job(job) for job in jobs]
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(run_job, jobs, chunksize=self.chunksize))
+
+    def run_seeded(self, options: PPRIPOptions, inputs: Sequence[Any], num_runs: int,
+                   master_seed: int) -> Dict[str, Any]:
+        """Run ``num_runs`` seeded copies of one configuration and aggregate them."""
+        return aggregate(self.run(make_jobs(options, inputs, num_runs, master_seed)))
+
+
+def aggregate(summaries: List[RunSummary]) -> Dict[str, Any]:
+    """Emergence statistics over an ensemble of run summaries."""
+    counts = np.array([s.emergence_count for s in summaries], dtype=np.int64)
+    steps = np.array([s.num_steps for s in summaries], dtype=np.int64)
+    first = np.array([s.first_emergence for s in summaries], dtype=np.int64)
+    emerged = first >= 0
+    metric_ids = list(summaries[0].final_metrics) if summaries else []
+    final = {c_id: np.array([s.final_metrics[c_id] for s in summaries]) for c_id in metric_ids}
+    return {
+        'num_runs': len(summaries),
+        'emergence_rate': float(emerged.mean()) if len(summaries) else 0.0,
+        'emergence_count_mean': float(counts.mean()) if len(summaries) else 0.0,
+        'emergence_count_std': float(counts.std()) if len(summaries) else 0.0,
+        'emergence_per_step': float(counts.sum() / steps.sum()) if steps.sum() else 0.0,
+        'first_emergence_mean': float(first[emerged].mean()) if emerged.any() else float('nan'),
+        'final_metrics_mean': {c_id: float(v.mean()) for c_id, v in final.items()},
+        'final_metrics_std': {c_id: float(v.std()) for c_id, v in final.items()},
+        'summaries': summaries
+    }
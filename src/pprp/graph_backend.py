@@ -0,0 +1,260 @@
+import networkx as nx
+import numpy as np
+from typing import Dict, List, Any, Tuple, Optional, Iterable, Iterator, Protocol, Hashable, Sequence, Callable
+
+class GraphBackend(Protocol):
+    """
+    The graph operations the manifold, cores, integrator and awareness
+    operator rely on. ``networkx.Graph`` satisfies it as-is.
+    """
+    def number_of_nodes(self) -> int: ...
+    def number_of_edges(self) -> int: ...
+    def nodes(self) -> Iterable[Hashable]: ...
+    def edges(self) -> Iterable[Tuple[Hashable, Hashable]]: ...
+    def has_edge(self, u: Hashable, v: Hashable) -> bool: ...
+    def add_edge(self, u: Hashable, v: Hashable): ...
+    def add_node(self, node: Hashable): ...
+    def remove_node(self, node: Hashable): ...
+    def neighbors(self, node: Hashable) -> Iterable[Hashable]: ...
+    def __contains__(self, node: Hashable) -> bool: ...
+
+
+class CSRGraph:
+    """
+    Undirected graph on nodes 0..n-1 stored as compact CSR arrays.
+
+    Each edge appears in both endpoint rows (a self-loop once), with
+    column indices sorted per row. New edges go to an append buffer that is
+    merged into the CSR arrays once it grows past a fraction of the edge
+    count, so ``add_edge`` is O(1) amortized and reads stay array-backed.
+    """
+    def __init__(self, num_nodes: int = 0, compact_fraction: float = 0.125):
+        self.compact_fraction = compact_fraction
+        self._index_dtype = np.int32 if num_nodes < 2**31 else np.int64
+        self.indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=self._index_dtype)
+        self._num_edges = 0
+        # Append buffer: pending edges as (min, max) pairs plus adjacency for neighbor queries
+        self._pending: set = set()
+        self._pending_adj: Dict[int, set] = {}
+
+    @classmethod
+    def from_edges(cls, num_nodes: int, u: np.ndarray, v: np.ndarray) -> "CSRGraph":
+        """Build from endpoint arrays; duplicate edges are dropped."""
+        G = cls(num_nodes)
+        if num_nodes == 0:
+            return G
+        u = np.asarray(u, dtype=np.int64)
+        v = np.asarray(v, dtype=np.int64)
+        # Sort/dedupe on a single int64 key: much faster than np.unique or lexsort
+        pairs = np.sort(np.minimum(u, v) * num_nodes + np.maximum(u, v))
+        pairs = pairs[np.r_[True, pairs[1:] != pairs[:-1]]] if len(pairs) else pairs
+        lo, hi = pairs // num_nodes, pairs % num_nodes
+        G._num_edges = len(pairs)
+        loop = lo == hi
+        keys = np.sort(np.concatenate([pairs, hi[~loop] * num_nodes + lo[~loop]]))
+        G.indices = (keys % num_nodes).astype(G._index_dtype)
+        G.indptr[1:] = np.cumsum(np.bincount(keys // num_nodes, minlength=num_nodes))
+        return G
+
+    @classmethod
+    def from_csr(cls, indptr: np.ndarray, indices: np.ndarray, num_edges: int) -> "CSRGraph":
+        """Adopt existing CSR arrays (e.g. memory-mapped from a checkpoint) without copying."""
+        G = cls(0)
+        G.indptr, G.indices, G._num_edges = indptr, indices, int(num_edges)
+        G._index_dtype = indices.dtype
+        return G
+
+    @classmethod
+    def from_networkx(cls, G: nx.Graph) -> "CSRGraph":
+        """Convert a networkx graph whose nodes are exactly 0..n-1."""
+        n = G.number_of_nodes()
+        if list(G.nodes()) != list(range(n)):
+            raise ValueError("CSRGraph requires nodes labelled 0..n-1 in order")
+        edges = np.array(list(G.edges()), dtype=np.int64).reshape(-1, 2)
+        return cls.from_edges(n, edges[:, 0], edges[:, 1])
+
+    def to_networkx(self) -> nx.Graph:
+        G = nx.Graph()
+        G.add_nodes_from(range(self.number_of_nodes()))
+        G.add_edges_from(map(tuple, self.edge_array().tolist()))
+        return G
+
+    # -- graph protocol -------------------------------------------------------
+
+    def number_of_nodes(self) -> int:
+        return len(self.indptr) - 1
+
+    def number_of_edges(self) -> int:
+        return self._num_edges
+
+    def nodes(self) -> range:
+        return range(self.number_of_nodes())
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.nodes())
+
+    def __len__(self) -> int:
+        return self.number_of_nodes()
+
+    def __contains__(self, node) -> bool:
+        return isinstance(node, (int, np.integer)) and 0 <= node < self.number_of_nodes()
+
+    def edges(self) -> Iterator[Tuple[int, int]]:
+        return map(tuple, self.edge_array().tolist())
+
+    def edge_array(self) -> np.ndarray:
+        """All edges as an (E, 2) array with u <= v."""
+        return _edge_array(self.indptr, self.indices, self._pending)
+
+    def edge_snapshot(self) -> Callable[[], np.ndarray]:
+        """
+        ``edge_array`` as of now, built when called. Holds the CSR arrays by
+        reference, which is safe since they are replaced, never written, as
+        the graph grows; only the append buffer is copied.
+        """
+        indptr, indices, pending = self.indptr, self.indices, tuple(self._pending)
+        return lambda: _edge_array(indptr, indices, pending)
+
+    def has_edge(self, u, v) -> bool:
+        if u not in self or v not in self:
+            return False
+        lo, hi = (u, v) if u <= v else (v, u)
+        if (lo, hi) in self._pending:
+            return True
+        row = self.indices[self.indptr[u]:self.indptr[u + 1]]
+        i = np.searchsorted(row, v)
+        return bool(i < len(row) and row[i] == v)
+
+    def add_node(self, node: int):
+        """Grow the node range so that ``node`` exists."""
+        n = self.number_of_nodes()
+        if node >= n:
+            self.indptr = np.concatenate([self.indptr, np.full(node + 1 - n, self.indptr[-1])])
+
+    def add_edge(self, u: int, v: int):
+        if self.has_edge(u, v):
+            return
+        self.add_node(max(u, v))
+        lo, hi = (u, v) if u <= v else (v, u)
+        self._pending.add((int(lo), int(hi)))
+        self._pending_adj.setdefault(int(lo), set()).add(int(hi))
+        self._pending_adj.setdefault(int(hi), set()).add(int(lo))
+        self._num_edges += 1
+        if len(self._pending) > max(1024, self.compact_fraction * self._num_edges):
+            self.compact()
+
+    def remove_node(self, node: int):
+        raise NotImplementedError("CSRGraph node ids are dense rows; nodes cannot be removed")
+
+    def neighbors(self, node: int) -> np.ndarray:
+        row = self.indices[self.indptr[node]:self.indptr[node + 1]]
+        extra = self._pending_adj.get(int(node))
+        if not extra:
+            return row
+        return np.concatenate([row, np.fromiter(extra, dtype=row.dtype, count=len(extra))])
+
+    def degree(self, node: int) -> int:
+        return len(self.neighbors(node))
+
+    def number_connected_components(self) -> int:
+        """Connected components via vectorized min-label propagation."""
+        self.compact()
+        n = self.number_of_nodes()
+        labels = np.arange(n, dtype=np.int64)
+        rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(self.indptr))
+        cols = self.indices.astype(np.int64)
+        while True:
+            new = labels.copy()
+            np.minimum.at(new, rows, labels[cols])
+            new = new[new]  # pointer jumping
+            if np.array_equal(new, labels):
+                return int(np.count_nonzero(labels == np.arange(n)))
+            labels = new
+
+    # -- maintenance ----------------------------------------------------------
+
+    def compact(self):
+        """Merge the append buffer into the CSR arrays."""
+        if not self._pending:
+            return
+        n = self.number_of_nodes()
+        pending = np.array(list(self._pending), dtype=np.int64).reshape(-1, 2)
+        lo, hi = pending[:, 0], pending[:, 1]
+        loop = lo == hi
+        # Merge old and new entries with one sort, then rebuild the row offsets
+        rows = np.concatenate([np.repeat(np.arange(n, dtype=np.int64), np.diff(self.indptr)), lo, hi[~loop]])
+        cols = np.concatenate([self.indices.astype(np.int64), hi, lo[~loop]])
+        order = np.lexsort((cols, rows))
+        self.indices = cols[order].astype(self._index_dtype)
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=self.indptr[1:])
+        self._pending.clear()
+        self._pending_adj.clear()
+
+    def nbytes(self) -> int:
+        """Memory held by the CSR arrays."""
+        return self.indptr.nbytes + self.indices.nbytes
+
+
+def _edge_array(indptr: np.ndarray, indices: np.ndarray, pending) -> np.ndarray:
+    """(E, 2) edges with u <= v: the upper triangle of the CSR rows, then the pending pairs."""
+    rows = np.repeat(np.arange(len(indptr) - 1, dtype=indices.dtype), np.diff(indptr))
+    upper = rows <= indices
+    csr_edges = np.stack([rows[upper], indices[upper]], axis=1)
+    if not pending:
+        return csr_edges
+    pending = np.array(sorted(pending), dtype=csr_edges.dtype).reshape(-1, 2)
+    return np.concatenate([csr_edges, pending])
+
+
+class LazyListView(Sequence):
+    """
+    Read-only list built by ``factory`` on first access and cached. Lets
+    callers that need full node/edge lists pay for them only when used.
+    When the source may change before that, ``is_current`` reports whether
+    it still matches; building from a changed source raises RuntimeError
+    rather than returning a later graph's list.
+    """
+    def __init__(self, factory: Callable[[], list], is_current: Optional[Callable[[], bool]] = None):
+        self._factory = factory
+        self._is_current = is_current
+        self._items: Optional[list] = None
+
+    def _materialize(self) -> list:
+        if self._items is None:
+            if self._is_current is not None and not self._is_current():
+                raise RuntimeError("The graph changed since this view was taken; "
+                                   "read it before the next step or use awareness_mode='full'")
+            self._items = self._factory()
+            self._factory = self._is_current = None
+        return self._items
+
+    def __getitem__(self, index):
+        return self._materialize()[index]
+
+    def __len__(self) -> int:
+        return len(self._materialize())
+
+    def __iter__(self):
+        return iter(self._materialize())
+
+    def __repr__(self) -> str:
+        return f"LazyListView({'unmaterialized' if self._items is None else self._items!r})"
+
+
+GRAPH_BACKENDS = ('networkx', 'csr')
+
+def make_graph_backend(G: nx.Graph, backend: str):
+    """Return G in the representation named by ``PPRIPOptions.graph_backend``."""
+    if backend == 'networkx':
+        return G
+    if backend == 'csr':
+        return G if isinstance(G, CSRGraph) else CSRGraph.from_networkx(G)
+    raise ValueError(f"Unknown graph_backend {backend!r}; expected one of {GRAPH_BACKENDS}")
+
+def number_connected_components(G) -> int:
+    """Connected component count for any graph backend."""
+    if isinstance(G, nx.Graph):
+        return nx.number_connected_components(G)
+    return G.number_connected_components()
@@ -0,0 +1,79 @@
+import numpy as np
+from typing import Dict, List, Any, Hashable, Sequence, Mapping, Iterator
+
+class _DenseIndex(Mapping):
+    """node id -> row map for graphs whose nodes are exactly 0..n-1."""
+    def __init__(self, n: int):
+        self._n = n
+
+    def __getitem__(self, node) -> int:
+        if node in self:
+            return int(node)
+        raise KeyError(node)
+
+    def __contains__(self, node) -> bool:
+        return isinstance(node, (int, np.integer)) and 0 <= node < self._n
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(self._n))
+
+    def __len__(self) -> int:
+        return self._n
+
+class PrimeIncidence:
+    """
+    CSR-style prime → node incidence.
+
+    Prime p owns the nodes whose row index i satisfies i mod p == 0, i.e. the
+    rows 0, p, 2p, ... Row ranges for every prime are laid out back to back
+    in ``indices``; ``indptr[j]:indptr[j+1]`` delimits the rows of
+    ``primes[j]``. Rows follow ``G.nodes()`` order at build time and
+    ``node_index`` maps node ids back to rows.
+    """
+    def __init__(self, primes: Sequence[int], node_ids: Sequence[Hashable]):
+        self.primes = np.asarray(primes, dtype=np.int64)
+        if isinstance(node_ids, range) and node_ids.start == 0 and node_ids.step == 1:
+            # Dense integer ids (e.g. the CSR backend): rows are the ids themselves
+            self.node_ids = node_ids
+            self.node_index: Mapping[Hashable, int] = _DenseIndex(len(node_ids))
+        else:
+            self.node_ids = list(node_ids)
+            self.node_index = {nid: i for i, nid in enumerate(self.node_ids)}
+        self._ordinal = {int(p): j for j, p in enumerate(self.primes)}
+
+        n = len(self.node_ids)
+        counts = (n - 1) // self.primes + 1 if n else np.zeros(len(self.primes), dtype=np.int64)
+        self.indptr = np.zeros(len(self.primes) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.indptr[1:])
+        # Position within each prime's segment times the prime gives the row
+        offsets = np.arange(self.indptr[-1], dtype=np.int64) - np.repeat(self.indptr[:-1], counts)
+        self.indices = (offsets * np.repeat(self.primes, counts)).astype(np.intp)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_ids)
+
+    def __contains__(self, p: int) -> bool:
+        return p in self._ordinal
+
+    def ordinal(self, p: int) -> int:
+        """Position of prime ``p`` in ``primes``."""
+        return self._ordinal[p]
+
+    def rows(self, p: int) -> np.ndarray:
+        """Rows owned by prime ``p`` (a view, do not modify)."""
+        j = self._ordinal[p]
+        return self.indices[self.indptr[j]:self.indptr[j + 1]]
+
+    def nodes(self, p: int) -> List[Hashable]:
+        """Node ids owned by prime ``p``."""
+        return [self.node_ids[r] for r in self.rows(p).tolist()]
+
+    def rows_of(self, node_ids) -> np.ndarray:
+        """Rows of the given node ids; unknown ids are skipped."""
+        index = self.node_index
+        return np.fromiter((index[nid] for nid in node_ids if nid in index), dtype=np.intp)
+
+    def to_dict(self) -> Dict[int, List[Hashable]]:
+        """Dict form, as returned by ``assign_nodes_to_primes``."""
+        return {int(p): self.nodes(int(p)) for p in self.primes}
@@ -2,46 +2,64 @@ import networkx as nx
 import numpy as np
 from typing import Dict, List, Any, Tuple, Optional
 
+from .graph_backend import number_connected_components
+from .repair import EdgeRepairIndex
+
 class OmegaBetaIntegrator:
     """Monitors and adjusts Ω and β₁."""
-    def __init__(self, options):
+    def __init__(self, options, rng: Optional[np.random.Generator] = None):
         self.options = options
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self._repair: Optional[EdgeRepairIndex] = None
 
-    def monitor(self, node_states: List[np.ndarray], G: nx.Graph) -> Tuple[float, int]:
-        """Monitor Ω_proxy and β₁_proxy."""
-        omega_proxy = float(np.var(np.concatenate([s.flatten() for s in node_states]))) if node_states else 0.0
-        beta1_proxy = nx.number_of_cycles(G) # Simplified proxy using cycle basis size
-        # A more robust way is to use nx.cycle_basis(G) and count independent cycles
-        # but for simplicity, we use the size of the cycle basis.
-        # nx.number_of_cycles is not a standard function, so we define it.
-        try:
-            beta1_proxy = len(nx.cycle_basis(G))
-        except:
-            beta1_proxy = 0 # Fallback
+    def monitor(self, node_states: List[np.ndarray], G: nx.Graph,
+                topology=None, moments=None) -> Tuple[float, int]:
+        """
+        Monitor Ω_proxy and β₁_proxy. Pass the manifold's TopologyTracker as
+        ``topology`` to read β₁ in O(1), and its ``moments()`` as ``moments``
+        to read Ω in O(1).
+        """
+        if moments is not None:
+            omega_proxy = moments.variance()
+        else:
+            states = np.asarray(node_states)  # no copy when handed the manifold's state array
+            omega_proxy = float(np.var(states)) if states.size else 0.0
+        if topology is not None:
+            beta1_proxy = topology.beta1
+        else:
+            # β₁ = E - V + C, the size of any cycle basis
+            beta1_proxy = (G.number_of_edges() - G.number_of_nodes()
+                           + number_connected_components(G))
         return omega_proxy, beta1_proxy
 
+    def edge_repair(self, G) -> EdgeRepairIndex:
+        """Repair candidate index for G, kept across calls while G is the same graph."""
+        if self._repair is None or self._repair.G is not G:
+            self._repair = EdgeRepairIndex(G, self.options.repair_policy, rng=self.rng)
+        return self._repair
+    
     def adjust(self, G: nx.Graph, node_states: List[np.ndarray], 
               resonance_metrics: Dict[str, float], 
-              system_metrics: Dict[str, float]) -> Tuple[nx.Graph, List[np.ndarray]]:
-        """Adjust G and node_states based on metrics."""
+              system_metrics: Dict[str, float],
+              topology=None) -> Tuple[nx.Graph, List[np.ndarray]]:
+        """Adjust G and node_states based on metrics; edges added are reported to ``topology``."""
         # Simplified adjustment logic
         # 1. If Ω is low, inject noise
         if system_metrics['omega_proxy'] < self.options.thresh_omega:
-            for i in range(len(node_states)):
-                node_states[i] += np.random.normal(0, 0.01, size=node_states[i].shape)
+            if isinstance(node_states, np.ndarray):
+                node_states += 0.01 * self.rng.standard_normal(node_states.shape, dtype=node_states.dtype)
+            else:
+                for i in range(len(node_states)):
+                    node_states[i] += 0.01 * self.rng.standard_normal(node_states[i].shape,
+                                                                      dtype=node_states[i].dtype)
         
         # 2. If β₁ is 0, add a simple edge to create a cycle
         if system_metrics['beta1_proxy'] < self.options.thresh_beta1 and len(G.nodes()) > 1:
-            nodes = list(G.nodes())
-            # Find two nodes not connected
-            for i in range(len(nodes)):
-                for j in range(i+1, len(nodes)):
-                    if not G.has_edge(nodes[i], nodes[j]):
-                        G.add_edge(nodes[i], nodes[j])
-                        break
-                else:
-                    continue
-                break
+            edge = self.edge_repair(G).propose(topology)
+            if edge is not None:
+                G.add_edge(*edge)
+                if topology is not None:
+                    topology.add_edge(*edge)
         
         # 3. If input resonance is good but system resonance is bad, adjust states
         # This is a very simplified coupling.
@@ -1,62 +1,436 @@
 import networkx as nx
 import numpy as np
 import math
-from typing import Dict, List, Any, Tuple, Optional, Callable
-from dataclasses import dataclass
+from contextlib import contextmanager
+from typing import Dict, List, Any, Tuple, Optional, Callable, Sequence
+
+from .cgos import SubstrateManifold
+from .options import PPRIPOptions
+from .topology import TopologyTracker, make_topology_tracker
+from .incidence import PrimeIncidence
+from .resonance_engine import pi_deviation_spectrum, harmonic_ratios
+from .graph_backend import make_graph_backend, LazyListView, CSRGraph
+from .primes import primes_up_to
+from .repair import EdgeRepairIndex
+from .moments import StateMoments
+from .sampling import ApproximateMetrics
 
 PI = math.pi
 PHI = (1 + math.sqrt(5)) / 2
 
-@dataclass
-class PPRIPOptions:
-    """Options for configuring the PPRIP model."""
-    initial_num_nodes: int = 30 # Product of first 3 primes: 2*3*5
-    thresh_omega: float = 1.0 # Threshold for Ω_proxy
-    thresh_beta1: int = 1     # Threshold for β₁_proxy
-    coupling_strength: float = 1.0 # Strength of input-system coupling
+STATE_DTYPES = ('float64', 'float32')
+
+class NodeStateView(Sequence):
+    """
+    Per-node states of a manifold, backed by its ``state_array``. Items are
+    row views; assigning one writes the row into the array and marks the
+    manifold modified. Writing into a row view in place does not, so call
+    ``mark_modified`` after that.
+    """
+    def __init__(self, manifold: "EnhancedSubstrateManifold"):
+        self._manifold = manifold
+
+    def __len__(self) -> int:
+        return len(self._manifold.state_array)
+
+    def __getitem__(self, index):
+        states = self._manifold.state_array
+        if isinstance(index, slice):
+            return [states[i] for i in range(*index.indices(len(states)))]
+        return states[index]
+
+    def __setitem__(self, index: int, state):
+        self._manifold.state_array[index] = state
+        self._manifold.mark_modified()
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        return np.asarray(self._manifold.state_array, dtype=dtype)
 
 class EnhancedSubstrateManifold(SubstrateManifold):
     """
     Enhanced version of SubstrateManifold with PPRIP capabilities.
     """
-    def __init__(self, n: int = 30, k: int = 4, options: Optional[PPRIPOptions] = None):
-        super().__init__(n, k)
-        self.options = options or PPRIPOptions()
-        self.node_states = [np.random.rand(4) for _ in self.G.nodes()] # 4D state vector per node
-        self.primes = self._generate_primes_up_to(n)
+    def __init__(self, n: int = 30, k: int = 4, options: Optional[PPRIPOptions] = None,
+                 rng: Optional[np.random.Generator] = None):
+        options = options or PPRIPOptions()
+        # All randomness (the base graph, initial states, noise, repair sampling) draws from this stream
+        rng = rng if rng is not None else np.random.default_rng()
+        super().__init__(n, k, seed=int(rng.integers(2**32)))
+        # state_dim-D state vector per node, one row per node in G.nodes() order
+        G = make_graph_backend(self.G, options.graph_backend)
+        states = rng.random((G.number_of_nodes(), options.state_dim), dtype=self._state_dtype(options))
+        self._init_state(G, states, options, rng, n)
         self._initialize_with_cycles()
+        # Edges added during construction are not deltas
+        self.drain_topology_delta()
+    
+    @classmethod
+    def from_arrays(cls, node_states: np.ndarray, edges: np.ndarray,
+                    options: Optional[PPRIPOptions] = None, nodes: Optional[np.ndarray] = None,
+                    prime_limit: Optional[int] = None, rng: Optional[np.random.Generator] = None,
+                    csr: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> "EnhancedSubstrateManifold":
+        """
+        Rebuild a manifold from saved arrays (see ``checkpoint_arrays``) without
+        regenerating it. ``node_states`` is adopted as-is, so a memory-mapped
+        array stays mapped. ``csr`` (indptr, indices) lets the CSR backend adopt
+        its arrays directly. The topology tracker is rebuilt on first use.
+        """
+        options = options or PPRIPOptions()
+        n = len(node_states)
+        if options.graph_backend == 'csr':
+            if csr is not None:
+                G = CSRGraph.from_csr(csr[0], csr[1], len(edges))
+            else:
+                G = CSRGraph.from_edges(n, edges[:, 0], edges[:, 1])
+        else:
+            G = make_graph_backend(nx.Graph(), options.graph_backend)
+            G.add_nodes_from(range(n) if nodes is None else nodes.tolist())
+            G.add_edges_from(edges.tolist())
+        # The base initializer would generate a fresh random graph
+        M = cls.__new__(cls)
+        M._init_state(G, node_states, options, rng, n if prime_limit is None else prime_limit)
+        return M
+    
+    def _init_state(self, G, state_array: np.ndarray, options: PPRIPOptions,
+                    rng: Optional[np.random.Generator], prime_limit: int):
+        """Field setup shared by ``__init__`` and ``from_arrays``, around a built graph and state array."""
+        self.options = options
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.G = G
+        self.state_array = state_array
+        self._incidence = None
+        self._repair = None
+        # Running Ω / φ moments; rebuilt from scratch when marked dirty
+        self._moments = StateMoments()
+        self._moments_dirty = True
+        self._approximate = None
+        # Bumped on every state or topology write; keys the per-step metric cache
+        self.version = 0
+        # Bumped on every topology write; lazy node/edge views check it
+        self.graph_version = 0
+        self.primes = self._generate_primes_up_to(prime_limit)
+        # Empty until rebuilt from G on first use
+        self.topology = TopologyTracker()
+        # Manifold version at which the tracker was last checked against G
+        self._topology_checked = None
+        # Topology changes since the last drain_topology_delta()
+        self._topology_delta = self._empty_delta()
+    
+    def checkpoint_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Arrays that capture the manifold: ``node_states``, ``edges`` as a packed
+        (E, 2) int array, ``nodes`` when ids are not simply 0..n-1, and the CSR
+        arrays under the CSR backend.
+        """
+        n = self.G.number_of_nodes()
+        if isinstance(self.G, CSRGraph):
+            self.G.compact()
+            arrays = {'node_states': self.state_array, 'edges': self.G.edge_array(),
+                      'csr_indptr': self.G.indptr, 'csr_indices': self.G.indices}
+            return arrays
+        nodes = np.fromiter(self.G.nodes(), dtype=np.int64, count=n)  # ids must be integers
+        index_dtype = np.int32 if n == 0 or (nodes.min() >= -2**31 and nodes.max() < 2**31) else np.int64
+        arrays = {'node_states': self.state_array,
+                  'edges': np.array(list(self.G.edges()), dtype=index_dtype).reshape(-1, 2)}
+        if not np.array_equal(nodes, np.arange(n)):
+            arrays['nodes'] = nodes
+        return arrays
+    
+    @staticmethod
+    def _state_dtype(options: PPRIPOptions) -> np.dtype:
+        """Node state dtype named by ``options.dtype``."""
+        if options.dtype not in STATE_DTYPES:
+            raise ValueError(f"Unknown dtype {options.dtype!r}; expected one of {STATE_DTYPES}")
+        return np.dtype(options.dtype)
     
     def _generate_primes_up_to(self, n: int) -> List[int]:
-        """Sieve of Eratosthenes."""
-        sieve = [True] * (n + 1)
-        sieve[0:2] = [False, False]
-        for i in range(2, int(n**0.5) + 1):
-            if sieve[i]:
-                sieve[i*i::i] = [False] * len(sieve[i*i::i)]
-        return [i for i, is_prime in enumerate(sieve) if is_prime]
+        """Primes <= n, sliced from the shared process-wide prime table."""
+        return primes_up_to(n).tolist()
     
     def _initialize_with_cycles(self):
         """Ensure the graph has cycles for β₁ > 0."""
-        if len(nx.cycle_basis(self.G)) == 0:
+        self.topology = make_topology_tracker(self.G)
+        if self.topology.beta1 == 0:
             # Create a cycle if none exists
             nodes = list(self.G.nodes())
             for i in range(len(nodes)):
-                self.G.add_edge(nodes[i], nodes[(i+1) % len(nodes)])
+                self.add_edge(nodes[i], nodes[(i+1) % len(nodes)])
+    
+    def add_edge(self, u, v) -> bool:
+        """Add an edge to G and the topology tracker. Returns False if it already existed."""
+        if self.G.has_edge(u, v):
+            return False
+        # As in add_node: a stale tracker is rebuilt before the edge goes in, not after
+        topology = self.get_topology()
+        self.G.add_edge(u, v)
+        topology.add_edge(u, v)
+        self._record_delta('added_edges', (u, v))
+        self.graph_version += 1
+        self.mark_modified(states=False)
+        return True
+    
+    def edge_repair(self) -> EdgeRepairIndex:
+        """Cached candidate index for β₁ repair edges, per ``options.repair_policy``."""
+        if self._repair is None or self._repair.G is not self.G:
+            self._repair = EdgeRepairIndex(self.G, self.options.repair_policy, rng=self.rng)
+        return self._repair
+    
+    def repair_edge(self) -> Optional[Tuple[Any, Any]]:
+        """Add one cycle-creating edge chosen by the repair policy; returns it, or None if G is complete."""
+        edge = self.edge_repair().propose(self.get_topology())
+        if edge is not None:
+            self.add_edge(*edge)
+        return edge
+    
+    def get_topology(self) -> TopologyTracker:
+        """
+        Topology tracker for G, rebuilt if nodes or edges were added behind
+        its back. Checked once per manifold version (counting networkx edges
+        is O(V)), so call ``mark_modified`` after mutating G directly.
+        """
+        if not self.topology_current():
+            self.resync_topology()
+            self._topology_checked = self.version
+        return self.topology
+    
+    def topology_current(self) -> bool:
+        """Whether the tracker still matches G, checked once per manifold version without rebuilding it."""
+        if self._topology_checked != self.version:
+            if not self.topology.matches(self.G):
+                return False
+            self._topology_checked = self.version
+        return True
+    
+    def topology_deferred(self) -> bool:
+        """True while approximating against a stale tracker: readers sample instead of rebuilding it."""
+        return self.options.approximate_metrics and not self.topology_current()
+    
+    def resync_topology(self):
+        """Rebuild the topology tracker after G was mutated directly."""
+        self.topology = make_topology_tracker(self.G)
+        self.graph_version += 1
+        self.mark_modified(states=False)
+    
+    def mark_modified(self, states: bool = True):
+        """
+        Record a state or topology write. Call after mutating G or state_array
+        directly; ``states=False`` says node states were left untouched.
+        """
+        self.version += 1
+        if states:
+            self._moments_dirty = True
+    
+    def cycle_basis(self) -> List[List[int]]:
+        """Fundamental cycle basis of G, maintained incrementally."""
+        return self.get_topology().cycles
+    
+    def betti1(self) -> int:
+        """
+        First Betti number from the topology tracker, without recounting
+        components; counted from a spanning forest while the tracker is deferred.
+        """
+        if self.topology_deferred():
+            return self.approximate_metrics().beta1(self)
+        return self.get_topology().beta1
+    
+    def omega_complexity(self) -> float:
+        """Independent cycles per node, from the tracked β₁."""
+        return self.betti1() / max(self.G.number_of_nodes(), 1)
+    
+    def pi_resonant_cycles(self) -> List[Tuple[int, float]]:
+        """
+        (length, harmonic ratio) of every basis cycle, shortest first, expanded
+        from the tracked histogram; of sampled cycles while the tracker is deferred.
+        """
+        if self.topology_deferred():
+            lengths, counts = np.unique(self.approximate_metrics().cycle_lengths(self), return_counts=True)
+        else:
+            lengths, counts = self.get_topology().cycle_length_histogram()
+        ratios = harmonic_ratios(lengths)
+        return list(zip(np.repeat(lengths, counts).tolist(), np.repeat(ratios, counts).tolist()))
+    
+    def pi_deviation_spectrum(self) -> Dict[str, np.ndarray]:
+        """π-deviation per distinct basis cycle length, from the tracked histogram."""
+        return pi_deviation_spectrum(*self.get_topology().cycle_length_histogram())
+    
+    def prime_incidence(self) -> PrimeIncidence:
+        """Cached prime → row incidence; rebuilt only when nodes are added or removed."""
+        if self._incidence is None or self._incidence.num_nodes != self.G.number_of_nodes():
+            self._incidence = PrimeIncidence(self.primes, self.G.nodes())
+        return self._incidence
     
     def assign_nodes_to_primes(self) -> Dict[int, List[int]]:
         """Assign nodes to primes based on index modulo p."""
-        assignment = {p: [] for p in self.primes}
-        for i, node in enumerate(self.G.nodes()):
-            for p in self.primes:
-                if i % p == 0:
-                    assignment[p].append(node)
-        return assignment
+        return self.prime_incidence().to_dict()
+    
+    def add_node(self, node, state: Optional[np.ndarray] = None):
+        """Add a node with its state row appended to ``state_array``."""
+        if node in self.G:
+            return
+        if isinstance(self.G, CSRGraph) and node != self.G.number_of_nodes():
+            # Checked before anything is recorded or changed
+            raise ValueError(f"The 'csr' graph_backend numbers nodes densely: the next node must be "
+                             f"{self.G.number_of_nodes()}, not {node!r}")
+        row = self.rng.random(self.state_array.shape[1], dtype=self.state_array.dtype) if state is None else state
+        # Fetched before G changes, so the node is added to the tracker rather than rebuilding it
+        topology = self.get_topology()
+        self.G.add_node(node)
+        self.state_array = np.vstack([self.state_array, np.asarray(row, dtype=self.state_array.dtype)])
+        topology.add_node(node)
+        self._incidence = None
+        self._record_delta('added_nodes', node)
+        self.graph_version += 1
+        self.mark_modified()
+    
+    def remove_node(self, node):
+        """Remove a node, its edges and its state row."""
+        if isinstance(self.G, CSRGraph):
+            # Checked before anything is recorded or changed
+            raise NotImplementedError("remove_node is not supported by the 'csr' graph_backend: "
+                                      "its node ids are dense rows")
+        if node not in self.G:
+            return
+        row = self.prime_incidence().node_index[node]
+        for neighbor in list(self.G.neighbors(node)):
+            self._record_delta('removed_edges', (node, neighbor))
+        self._record_delta('removed_nodes', node)
+        self.G.remove_node(node)
+        self.state_array = np.delete(self.state_array, row, axis=0)
+        self._incidence = None
+        if self._repair is not None:
+            self._repair.reset()
+        self.resync_topology()
+    
+    @staticmethod
+    def _empty_delta() -> Dict[str, list]:
+        return {'added_nodes': [], 'removed_nodes': [], 'added_edges': [], 'removed_edges': []}
+    
+    def _record_delta(self, kind: str, item):
+        self._topology_delta[kind].append(item)
+    
+    def drain_topology_delta(self) -> Dict[str, list]:
+        """Nodes and edges added or removed since the previous drain."""
+        delta, self._topology_delta = self._topology_delta, self._empty_delta()
+        return delta
+    
+    def node_list_view(self) -> "LazyListView":
+        """
+        Read-only node list as of this call, materialized on first access.
+        Under networkx, materializing after a topology change raises.
+        """
+        if isinstance(self.G, CSRGraph):
+            n = self.G.number_of_nodes()
+            return LazyListView(lambda: list(range(n)))
+        return LazyListView(lambda: list(self.G.nodes()), self._graph_unchanged())
+    
+    def edge_list_view(self) -> "LazyListView":
+        """
+        Read-only edge list as of this call, materialized on first access.
+        Under networkx, materializing after a topology change raises.
+        """
+        if isinstance(self.G, CSRGraph):
+            edges = self.G.edge_snapshot()
+            return LazyListView(lambda: list(map(tuple, edges().tolist())))
+        return LazyListView(lambda: list(self.G.edges()), self._graph_unchanged())
+    
+    def _graph_unchanged(self) -> Callable[[], bool]:
+        """Whether G still has the topology it has now."""
+        G, graph_version = self.G, self.graph_version
+        return lambda: self.G is G and self.graph_version == graph_version
+    
+    @property
+    def node_states(self) -> NodeStateView:
+        """Per-node row views into ``state_array``; assigning a row writes it through."""
+        return NodeStateView(self)
+    
+    @node_states.setter
+    def node_states(self, new_states):
+        self.state_array[...] = np.asarray(new_states, dtype=self.state_array.dtype)
+        self.mark_modified()
     
     def update_node_states(self, new_states: List[np.ndarray]):
         """Update the states of all nodes."""
-        if len(new_states) == len(self.node_states):
+        if len(new_states) == len(self.state_array):
             self.node_states = new_states
     
-    def get_node_states(self) -> List[np.ndarray]:
+    def get_node_states(self) -> NodeStateView:
         """Get the current states of all nodes."""
         return self.node_states
+    
+    def get_state_array(self) -> np.ndarray:
+        """Get the (N, D) node state array; writes go straight to the manifold."""
+        return self.state_array
+    
+    def moments_stale(self) -> bool:
+        """Whether the next ``moments()`` read needs an exact O(N·D) pass."""
+        return self._moments_dirty or self._moments.num_rows != len(self.state_array)
+    
+    def approximate_metrics(self) -> ApproximateMetrics:
+        """Sampled Ω/π estimator configured by the options' approximation knobs."""
+        if self._approximate is None:
+            self._approximate = ApproximateMetrics(self.options.sample_size, self.options.recalibrate_every,
+                                                   self.options.confidence, rng=self.rng)
+        return self._approximate
+    
+    def prepare_read(self):
+        """Bring lazily built caches up to date so concurrent readers never rebuild them."""
+        if self.options.approximate_metrics:
+            # Only the exact passes the next approximate evaluations will need
+            self.approximate_metrics().prepare(self)
+        else:
+            self.get_topology()
+            self.moments()
+        self.prime_incidence()
+    
+    @contextmanager
+    def read_only(self):
+        """Flag ``state_array`` read-only for the duration of the block."""
+        states = self.state_array
+        writeable = states.flags.writeable
+        states.flags.writeable = False
+        try:
+            yield self
+        finally:
+            if writeable:
+                states.flags.writeable = True
+    
+    def write_rows(self, rows: np.ndarray, values: np.ndarray):
+        """Overwrite the given (unique) rows of ``state_array``, updating the running moments."""
+        if self.moments_stale():
+            self.state_array[rows] = values
+            self.mark_modified()
+            return
+        old = self.state_array[rows]
+        self.state_array[rows] = values
+        self._moments.update_rows(self.state_array, rows, old, self.state_array[rows])
+        self.mark_modified(states=False)
+    
+    def moments(self) -> StateMoments:
+        """Running moments of ``state_array``, resynced exactly if marked dirty."""
+        if self.moments_stale():
+            self._moments.resync(self.state_array)
+            self._moments_dirty = False
+        return self._moments
+    
+    def node_rows(self, node_ids) -> np.ndarray:
+        """Map node ids to their rows in ``state_array``."""
+        return self.prime_incidence().rows_of(node_ids)
+    
+    def state_magnitudes(self) -> np.ndarray:
+        """L2 norm of every node state (maintained array, do not modify)."""
+        return self.moments().magnitudes
+    
+    def cumulative_magnitudes(self) -> Tuple[float, float]:
+        """Last two entries of the cumulative sum of state magnitudes, in O(1)."""
+        return self.moments().cumulative_magnitudes()
+    
+    def state_variance(self) -> float:
+        """Variance over all node state components (Ω proxy), in O(1)."""
+        return self.moments().variance()
+    
+    def inject_noise(self, scale: float = 0.01):
+        """Add Gaussian noise to every node state in place, drawn in the state dtype."""
+        noise = self.rng.standard_normal(self.state_array.shape, dtype=self.state_array.dtype)
+        noise *= scale
+        self.state_array += noise
+        self.mark_modified()
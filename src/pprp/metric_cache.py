@@ -0,0 +1,56 @@
+from typing import Dict, List, Any, Tuple
+
+class MetricCache:
+    """
+    Memoizes core evaluations per manifold version.
+
+    Each core keeps only the metric for the most recent (manifold, version)
+    it was evaluated on, so the cache stays bounded by the number of cores.
+    """
+    def __init__(self):
+        self._entries: Dict[Any, Tuple[Any, int, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, core, manifold):
+        """Return ``core(manifold)``, computing it at most once per manifold version."""
+        if self._valid(core, manifold):
+            self.hits += 1
+            return self._entries[core][2]
+        self.misses += 1
+        metric = core(manifold)
+        self._entries[core] = (manifold, manifold.version, metric)
+        return metric
+
+    def evaluate(self, cores: List[Any], manifold, executor=None) -> List[Any]:
+        """
+        Evaluate every core in order through the cache. With a CoreExecutor,
+        the cores that miss are evaluated concurrently.
+        """
+        if executor is None:
+            return [self.get(core, manifold) for core in cores]
+        missing = [core for core in cores if not self._valid(core, manifold)]
+        fresh = {}
+        if len(missing) > 1:
+            fresh = dict(zip(missing, executor.evaluate(missing, manifold)))
+            self.misses += len(fresh)
+            for core, metric in fresh.items():
+                self._entries[core] = (manifold, manifold.version, metric)
+        return [fresh[core] if core in fresh else self.get(core, manifold) for core in cores]
+
+    def _valid(self, core, manifold) -> bool:
+        entry = self._entries.get(core)
+        return entry is not None and entry[0] is manifold and entry[1] == manifold.version
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and hit rate."""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+    def clear(self):
+        """Drop all cached metrics (counters are kept)."""
+        self._entries.clear()
@@ -0,0 +1,99 @@
+import numpy as np
+from typing import Tuple
+
+class StateMoments:
+    """
+    Running moments of a manifold's (N, D) state array.
+
+    Keeps Σ(x − K) and Σ(x − K)² over every component, shifted by K (the
+    mean at the last exact pass) to avoid cancellation, plus each row's L2
+    magnitude and their total. Row writes update them with the old and new
+    rows only, so Ω (the variance) and the φ cumulative-magnitude totals
+    are O(1) reads. Every ``resync_every`` updates the moments are
+    recomputed exactly to bound floating-point drift.
+    """
+    def __init__(self, resync_every: int = 1024):
+        self.resync_every = resync_every
+        self.num_rows = 0
+        self.count = 0
+        self.shift = 0.0
+        self.sum = 0.0
+        self.sumsq = 0.0
+        self.magnitudes = np.zeros(0)
+        self.magnitude_total = 0.0
+        self.updates = 0
+
+    def resync(self, states: np.ndarray):
+        """Recompute everything exactly from ``states``."""
+        self.num_rows = len(states)
+        self.count = states.size
+        # Accumulate in float64 whatever the state dtype
+        self.shift = float(states.mean(dtype=np.float64)) if states.size else 0.0
+        centered = states - self.shift
+        self.sum = float(centered.sum(dtype=np.float64))
+        self.sumsq = float(np.einsum('ij,ij->', centered, centered, dtype=np.float64))
+        norms = self.norms(states)
+        if len(self.magnitudes) == len(norms):
+            self.magnitudes[:] = norms  # in place: the buffer may be shared (see pprp.sharding)
+        else:
+            self.magnitudes = norms
+        self.magnitude_total = float(self.magnitudes.sum())
+        self.updates = 0
+
+    def update_rows(self, states: np.ndarray, rows: np.ndarray, old: np.ndarray, new: np.ndarray):
+        """
+        Account for ``states[rows]`` going from ``old`` to ``new`` (rows
+        unique). ``states`` is the array after the write, used when a
+        periodic resync is due.
+        """
+        self.updates += 1
+        if self.updates >= self.resync_every:
+            self.resync(states)
+            return
+        d_sum, d_sumsq = self.row_deltas(self.shift, old, new)
+        self.sum += d_sum
+        self.sumsq += d_sumsq
+        new_mags = self.norms(new)
+        self.magnitude_total += float(new_mags.sum() - self.magnitudes[rows].sum())
+        self.magnitudes[rows] = new_mags
+
+    def add_deltas(self, states: np.ndarray, d_sum: float, d_sumsq: float, d_magnitude: float):
+        """
+        Like ``update_rows``, for a write whose deltas (``row_deltas`` and the
+        magnitude total change) were computed elsewhere, e.g. by shard
+        workers that also updated ``magnitudes`` in place.
+        """
+        self.updates += 1
+        if self.updates >= self.resync_every:
+            self.resync(states)
+            return
+        self.sum += d_sum
+        self.sumsq += d_sumsq
+        self.magnitude_total += d_magnitude
+
+    @staticmethod
+    def row_deltas(shift: float, old: np.ndarray, new: np.ndarray) -> Tuple[float, float]:
+        """Change in Σ(x − shift) and Σ(x − shift)² when rows go from ``old`` to ``new``."""
+        old_c = old - shift
+        new_c = new - shift
+        d_sum = float(new_c.sum(dtype=np.float64) - old_c.sum(dtype=np.float64))
+        d_sumsq = float(np.einsum('ij,ij->', new_c, new_c, dtype=np.float64)
+                        - np.einsum('ij,ij->', old_c, old_c, dtype=np.float64))
+        return d_sum, d_sumsq
+
+    @staticmethod
+    def norms(states: np.ndarray) -> np.ndarray:
+        """Row L2 norms, computed in float64."""
+        return np.sqrt(np.einsum('ij,ij->i', states, states, dtype=np.float64))
+    
+    def variance(self) -> float:
+        """Variance over all state components."""
+        if not self.count:
+            return 0.0
+        mean = self.sum / self.count
+        return max(self.sumsq / self.count - mean * mean, 0.0)
+
+    def cumulative_magnitudes(self) -> Tuple[float, float]:
+        """The last two entries of the cumulative sum of row magnitudes."""
+        last = float(self.magnitudes[-1]) if self.num_rows else 0.0
+        return self.magnitude_total, self.magnitude_total - last
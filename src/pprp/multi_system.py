@@ -0,0 +1,238 @@
+import math
+import numpy as np
+from typing import Dict, List, Any, Tuple, Optional, Sequence
+
+from .nodule_executor import phi_scale, blend_plan
+from .options import PPRIPOptions
+from .prime_mask import prime_flags
+from .resonance_engine import best_harmonic_deviation
+from .sampling import csr_arrays
+
+PHI = (1 + math.sqrt(5)) / 2
+
+# EnhancedTransputation's insights by code; 0 means no emergence
+INSIGHTS = (
+    None,
+    "⟡ insight: π-φ-prime resonance achieved – self-loop resolved",
+    "⟡ insight: PPRIP emergence detected – system in resonant state"
+)
+
+CORE_IDS = ('π', 'φ', 'Ω', 'β')
+OMEGA_CORE_THRESHOLD = 1e6  # EnhancedOmegaCore's CoreMetric threshold
+
+class MultiSystemEngine:
+    """
+    Steps many small PPRIP systems at once as one block-diagonal system.
+
+    Node states of every manifold are stacked into one (R, D) array and
+    each manifold's ``state_array`` becomes a view of its block. The prime
+    incidences are concatenated with row offsets into one fused nodule
+    plan, so a step runs the ψₚ layer of every system as one segmented
+    reduction. Core metrics, the emergence check, noise injection and
+    their thresholds are evaluated with segmented array operations; only
+    the β₁ repair of the (few) systems that need it loops in Python.
+
+    Metrics follow the exact (non-approximate) enhanced cores. The base
+    ``SubstrateManifold`` terms (π-resonant cycles, golden adjacency, Ω
+    complexity, Betti-1) are treated as graph-derived: they are evaluated
+    per system at construction and again only when that system's edges
+    change. Noise is drawn from the engine's own generator, so runs differ
+    from stepping each system separately. Node sets are fixed; call
+    ``sync`` before reading the manifolds directly.
+    """
+    def __init__(self, manifolds: Sequence[Any], options: Optional[PPRIPOptions] = None,
+                 rng: Optional[np.random.Generator] = None):
+        if not manifolds:
+            raise ValueError("MultiSystemEngine needs at least one manifold")
+        self.manifolds = list(manifolds)
+        self.options = options or self.manifolds[0].options
+        self.rng = rng if rng is not None else np.random.default_rng()
+        first = self.manifolds[0].state_array
+        for M in self.manifolds:
+            if len(M.state_array) == 0:
+                raise ValueError("Every manifold needs at least one node")
+            if M.state_array.shape[1] != first.shape[1] or M.state_array.dtype != first.dtype:
+                raise ValueError("All manifolds must share state_dim and dtype")
+
+        # Stacked states; every manifold works on its own block in place
+        self.sizes = np.array([len(M.state_array) for M in self.manifolds], dtype=np.int64)
+        self.offsets = np.zeros(len(self.manifolds) + 1, dtype=np.int64)
+        np.cumsum(self.sizes, out=self.offsets[1:])
+        self.states = np.concatenate([M.state_array for M in self.manifolds])
+        for M, lo, hi in zip(self.manifolds, self.offsets[:-1], self.offsets[1:]):
+            M.state_array = self.states[lo:hi]
+        self.row_system = np.repeat(np.arange(len(self.manifolds)), self.sizes)
+
+        self._build_plan()
+
+        # Graph-derived terms per system, refreshed when that system's edges change
+        num_systems = len(self.manifolds)
+        self.pi_best = np.empty(num_systems)
+        self.min_dev_pi = np.empty(num_systems)
+        self.golden = np.empty(num_systems)
+        self.omega_base = np.empty(num_systems)
+        self.betti1 = np.empty(num_systems)
+        self.beta1 = np.empty(num_systems, dtype=np.int64)
+        self._csr = None
+        self._refresh_topology(range(num_systems))
+        self.timestamp = 0
+
+    @classmethod
+    def from_systems(cls, systems: Sequence[Any], rng: Optional[np.random.Generator] = None) -> "MultiSystemEngine":
+        """
+        Pack the manifolds of ``EnhancedCGOSSyscall`` instances, keeping their
+        nodules' ``active`` flags (and, with ``mask_nodules``, their prime masks).
+        """
+        engine = cls([s.M for s in systems], systems[0].options, rng=rng)
+        for i, s in enumerate(systems):
+            for psi_unit in s.nodules:
+                if not psi_unit.active:
+                    engine.set_active(i, psi_unit.p, False)
+            if s.options.mask_nodules:
+                segments = engine._seg_system == i
+                engine._active[segments] &= prime_flags(s.global_c['prime_mask'], engine._seg_prime[segments])
+        return engine
+
+    @property
+    def num_systems(self) -> int:
+        return len(self.manifolds)
+
+    # -- layout ---------------------------------------------------------------
+
+    def _build_plan(self):
+        """One fused blend plan over the concatenated, row-offset prime incidences."""
+        rows, counts, primes = [], [], []
+        for M, offset in zip(self.manifolds, self.offsets[:-1]):
+            incidence = M.prime_incidence()
+            rows.append(incidence.indices + offset)
+            counts.append(np.diff(incidence.indptr))
+            primes.append(incidence.primes)
+        counts = np.concatenate(counts)
+        nonempty = counts > 0
+        self._seg_system = np.repeat(np.arange(len(self.manifolds)), [len(p) for p in primes])[nonempty]
+        self._seg_prime = np.concatenate(primes)[nonempty]
+        self._plan = blend_plan(np.concatenate(rows).astype(np.intp), counts[nonempty], self.states.dtype)
+        self._seg = np.repeat(np.arange(len(self._seg_prime)), counts[nonempty])
+        self._active = np.ones(len(self._seg_prime), dtype=bool)
+
+    def set_active(self, system: int, p: int, active: bool):
+        """Switch prime ``p``'s nodule of one system on or off (as ``EnhancedPrimeNodule.active``)."""
+        self._active[(self._seg_system == system) & (self._seg_prime == p)] = active
+
+    def csr(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Block-diagonal (indptr, indices) adjacency of every system, over stacked rows."""
+        if self._csr is None:
+            parts = [csr_arrays(M.G) for M in self.manifolds]
+            indptr = np.zeros(len(self.states) + 1, dtype=np.int64)
+            np.cumsum(np.concatenate([np.diff(ip) for ip, _ in parts]), out=indptr[1:])
+            indices = np.concatenate([ix.astype(np.int64) + offset
+                                      for (_, ix), offset in zip(parts, self.offsets[:-1])])
+            self._csr = (indptr, indices)
+        return self._csr
+
+    def _refresh_topology(self, systems):
+        """Re-evaluate the graph-derived terms of the given systems."""
+        for i in systems:
+            M = self.manifolds[i]
+            spectrum = M.pi_deviation_spectrum()
+            self.pi_best[i] = best_harmonic_deviation(spectrum['length'])
+            deviation = spectrum['deviation']
+            self.min_dev_pi[i] = float(deviation.min()) if len(deviation) else float('inf')
+            self.golden[i] = M.golden_adjacency()
+            self.omega_base[i] = M.omega_complexity()
+            self.betti1[i] = M.betti1()
+            self.beta1[i] = M.get_topology().beta1
+        self._csr = None
+
+    # -- stepping -------------------------------------------------------------
+
+    def _run_nodules(self):
+        """The fused ψₚ layer of every system in one segmented reduction."""
+        seg_starts, counts, rows, order, row_starts, touched, keep, weights = self._plan
+        states = self.states
+        sums = np.add.reduceat(states[rows], seg_starts, axis=0)
+        processed = phi_scale(sums / counts[:, None].astype(states.dtype))
+        processed[~self._active] = 0.0
+        contrib = (weights[:, None] * processed[self._seg])[order]
+        states[touched] = keep[:, None] * states[touched] + np.add.reduceat(contrib, row_starts, axis=0)
+
+    def metrics(self) -> Dict[str, np.ndarray]:
+        """Core metric values of every system, one array per axiom id."""
+        states = self.states
+        starts = self.offsets[:-1]
+        count = (self.sizes * states.shape[1]).astype(float)
+        mean = np.add.reduceat(states.sum(axis=1, dtype=np.float64), starts) / count
+        centered = states - mean[self.row_system, None]
+        variance = np.add.reduceat(np.einsum('ij,ij->i', centered, centered, dtype=np.float64), starts) / count
+        magnitudes = np.sqrt(np.einsum('ij,ij->i', states, states, dtype=np.float64))
+        total = np.add.reduceat(magnitudes, starts)
+        prev_total = total - magnitudes[self.offsets[1:] - 1]
+
+        growing = (self.sizes >= 2) & (prev_total != 0)
+        growth_rate = np.divide(total, prev_total, out=np.zeros_like(total), where=growing)
+        phi = np.where(growing, (self.golden + np.abs(growth_rate - PHI)) / 2, self.golden)
+        return {
+            'π': (self.pi_best + self.min_dev_pi) / 2,
+            'φ': phi,
+            'Ω': (self.omega_base + variance) / 2,
+            'β': ((self.betti1 > 0) & (self.beta1 > 0)).astype(float)
+        }
+
+    def insight_codes(self, metrics: Dict[str, np.ndarray]) -> np.ndarray:
+        """EnhancedTransputation for every system: index into ``INSIGHTS``."""
+        omega, beta = metrics['Ω'], metrics['β']
+        resolved = (omega > OMEGA_CORE_THRESHOLD) & (beta != 0)
+        emergent = (omega > self.options.thresh_omega) & (beta >= self.options.thresh_beta1)
+        return np.where(resolved, 1, np.where(emergent, 2, 0)).astype(np.int8)
+
+    def _adjust(self, metrics: Dict[str, np.ndarray]) -> bool:
+        """Noise for low-Ω systems, a repair edge for acyclic ones; whether anything changed."""
+        low_omega = metrics['Ω'] < self.options.thresh_omega
+        if low_omega.any():
+            rows = low_omega[self.row_system]
+            noise = self.rng.standard_normal((int(rows.sum()), self.states.shape[1]), dtype=self.states.dtype)
+            noise *= 0.01
+            self.states[rows] += noise
+        repair = np.flatnonzero((metrics['β'] < self.options.thresh_beta1) & (self.sizes > 1))
+        for i in repair:
+            self.manifolds[i].repair_edge()
+        if len(repair):
+            self._refresh_topology(repair)
+        return bool(low_omega.any() or len(repair))
+
+    def step(self) -> Dict[str, Any]:
+        """
+        Advance every system by one step (nodules, emergence check,
+        adjustment), as ``EnhancedCGOSSyscall`` does per input. Returns the
+        per-system metrics after the step, emergence mask and insight codes.
+        """
+        self._run_nodules()
+        metrics = self.metrics()
+        codes = self.insight_codes(metrics)
+        if self._adjust(metrics):
+            metrics = self.metrics()
+        self.timestamp += 1
+        return {
+            'system_metrics': metrics,
+            'emergence_detected': codes > 0,
+            'insight': codes,
+            'timestamp': self.timestamp
+        }
+
+    def run(self, num_steps: int) -> Dict[str, Any]:
+        """``num_steps`` steps, results stacked into (steps, systems) arrays."""
+        results = [self.step() for _ in range(num_steps)]
+        return {
+            'system_metrics': {c_id: np.stack([r['system_metrics'][c_id] for r in results]) if results
+                               else np.zeros((0, self.num_systems)) for c_id in CORE_IDS},
+            'emergence_detected': np.stack([r['emergence_detected'] for r in results]) if results
+                                  else np.zeros((0, self.num_systems), dtype=bool),
+            'insight': np.stack([r['insight'] for r in results]) if results
+                       else np.zeros((0, self.num_systems), dtype=np.int8),
+            'timestamp': np.array([r['timestamp'] for r in results], dtype=np.int64)
+        }
+
+    def sync(self):
+        """Mark every manifold modified so their own caches see the engine's writes."""
+        for M in self.manifolds:
+            M.mark_modified()
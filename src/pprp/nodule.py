@@ -1,3 +1,9 @@
+import numpy as np
+from typing import List
+
+from .cgos import PrimeNodule, PHI
+from .prime_mask import prime_active
+
 class EnhancedPrimeNodule(PrimeNodule):
     """
     Enhanced version of PrimeNodule with PPRIP processing capabilities.
@@ -6,10 +12,10 @@ class EnhancedPrimeNodule(PrimeNodule):
         super().__init__(p)
         self.active = True
     
-    def process(self, node_states: List[np.ndarray]) -> np.ndarray:
-        """Process a list of node states associated with this prime."""
-        if not self.active or not node_states:
-            return np.zeros_like(node_states[0]) if node_states else np.array([0.0])
+    def process(self, node_states: np.ndarray) -> np.ndarray:
+        """Process the (k, D) node states associated with this prime."""
+        if not self.active or len(node_states) == 0:
+            return np.zeros_like(node_states[0]) if len(node_states) else np.array([0.0])
         
         # φ-optimized average
         avg_state = np.mean(node_states, axis=0)
@@ -25,21 +31,15 @@ class EnhancedPrimeNodule(PrimeNodule):
         # Original implementation
         self.state['pi_metric'] = self.pi(manifold).value
         self.state['phi_metric'] = self.phi(manifold).value
-        self.state['active'] = global_c.get('prime_mask', 0) & (1 << self.p) != 0
+        self.state['active'] = prime_active(global_c.get('prime_mask', 0), self.p)
         
         # PPRIP enhancement: process assigned node states
-        node_assignment = manifold.assign_nodes_to_primes()
-        if self.p in node_assignment:
-            node_ids = node_assignment[self.p]
-            node_states = [manifold.get_node_states()[manifold.G.nodes().index(nid)] 
-                          for nid in node_ids if nid in manifold.G.nodes()]
+        incidence = manifold.prime_incidence()
+        if self.p in incidence:
+            rows = incidence.rows(self.p)
+            node_states = manifold.state_array[rows]
             processed_state = self.process(node_states)
             self.state['processed_state'] = processed_state
             
             # Update node states (simplified: average processed state with current state)
-            for nid in node_ids:
-                if nid in manifold.G.nodes():
-                    idx = manifold.G.nodes().index(nid)
-                    current_state = manifold.get_node_states()[idx]
-                    new_state = 0.5 * (current_state + processed_state)
-                    manifold.get_node_states()[idx] = new_state
+            manifold.write_rows(rows, 0.5 * (node_states + processed_state))
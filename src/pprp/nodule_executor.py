@@ -0,0 +1,135 @@
+import numpy as np
+import math
+from typing import Dict, List, Any, Tuple, Optional
+
+from .prime_mask import prime_flags
+
+PHI = (1 + math.sqrt(5)) / 2
+
+def phi_scale(means: np.ndarray) -> np.ndarray:
+    """Scale each row's magnitude by φ (below 1) or 1/φ (otherwise), as ``EnhancedPrimeNodule.process``."""
+    mags = np.linalg.norm(means, axis=1)
+    scaled = np.where(mags < 1.0, mags * PHI, mags / PHI)
+    factor = np.divide(scaled, mags, out=np.ones_like(mags), where=mags > 1e-10)
+    return means * factor[:, None]
+
+def blend_plan(rows: np.ndarray, counts: np.ndarray, dtype) -> Tuple[np.ndarray, ...]:
+    """
+    Gather/scatter layout of a fused blend over segments of ``rows`` (one
+    segment per prime, ``counts`` rows each, in prime order): (seg_starts,
+    counts, rows, order, row_starts, touched, keep, weights).
+    """
+    seg_starts = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64)
+
+    # Within each row, entries are in prime order; a blend applied r steps
+    # before the end of that row's chain is halved r more times.
+    order = np.argsort(rows, kind='stable')
+    sorted_rows = rows[order]
+    row_starts = np.flatnonzero(np.r_[True, sorted_rows[1:] != sorted_rows[:-1]])
+    sizes = np.diff(np.r_[row_starts, len(rows)])
+    position = np.arange(len(rows)) - np.repeat(row_starts, sizes)
+    rank_from_end = np.repeat(sizes, sizes) - 1 - position
+    # Blend weights in the state dtype so float32 states are never upcast
+    weights = np.empty(len(rows), dtype=dtype)
+    weights[order] = 0.5 ** (rank_from_end + 1)
+    touched = sorted_rows[row_starts]
+    keep = (0.5 ** sizes).astype(dtype)
+    return seg_starts, counts, rows, order, row_starts, touched, keep, weights
+
+
+class SequentialNoduleExecutor:
+    """Steps each ψₚ nodule in turn; every prime sees the blends of the primes before it."""
+    def run(self, nodules: List[Any], manifold, global_c: dict):
+        for psi_unit in nodules:
+            psi_unit.step(manifold, global_c)
+
+
+class FusedNoduleExecutor:
+    """
+    Runs the whole prime layer as one segmented reduction.
+
+    Segment means are taken over the prime incidence from the state at the
+    start of the step, φ-scaled together, and scatter-blended back. The 0.5
+    blends still compose in prime order, so a node shared by primes
+    p₁ < … < pₖ ends at 2⁻ᵏ·s + Σⱼ 2⁻⁽ᵏ⁻ʲ⁺¹⁾·aⱼ, exactly as the sequential
+    loop would if every mean aⱼ were read before any write. π/φ nodule
+    metrics are evaluated once per step and shared.
+    """
+    def __init__(self):
+        self._plan_key = None
+        self._plan = None
+
+    def run(self, nodules: List[Any], manifold, global_c: dict):
+        units = self._prepare(nodules, manifold, global_c)
+        if not units:
+            return
+
+        states = manifold.state_array
+        seg_starts, counts, rows, order, row_starts, touched, keep, weights = self._get_plan(
+            manifold.prime_incidence(), units, states.dtype)
+
+        # Segment means, then φ-scaling of every mean's magnitude at once
+        sums = np.add.reduceat(states[rows], seg_starts, axis=0)
+        processed = self._process(units, sums, counts, manifold.options.mask_nodules)
+
+        # Scatter-blend: contributions grouped by row, summed, added to the decayed state
+        seg = np.repeat(np.arange(len(units)), counts)
+        contrib = (weights[:, None] * processed[seg])[order]
+        blended = keep[:, None] * states[touched] + np.add.reduceat(contrib, row_starts, axis=0)
+        manifold.write_rows(touched, blended)
+
+    @staticmethod
+    def _prepare(nodules: List[Any], manifold, global_c: dict) -> List[Any]:
+        """Share the π/φ nodule metrics, set activity flags; returns the nodules owning rows."""
+        if not nodules:
+            return []
+        incidence = manifold.prime_incidence()
+        pi_metric = nodules[0].pi(manifold).value
+        phi_metric = nodules[0].phi(manifold).value
+        # One vectorized lookup for the whole prime layer
+        flags = prime_flags(global_c.get('prime_mask', 0), [u.p for u in nodules])
+        for psi_unit, flag in zip(nodules, flags.tolist()):
+            psi_unit.state['pi_metric'] = pi_metric
+            psi_unit.state['phi_metric'] = phi_metric
+            psi_unit.state['active'] = flag
+        return [u for u in nodules if u.p in incidence]
+
+    @staticmethod
+    def _process(units: List[Any], sums: np.ndarray, counts: np.ndarray, mask_nodules: bool = False) -> np.ndarray:
+        """
+        φ-scaled segment means (zero for inactive nodules, and with
+        ``mask_nodules`` for primes inactive in the prime mask), recorded on each nodule.
+        """
+        processed = phi_scale(sums / counts[:, None].astype(sums.dtype))
+        active = np.fromiter((u.active for u in units), dtype=bool, count=len(units))
+        if mask_nodules:
+            active &= np.fromiter((u.state['active'] for u in units), dtype=bool, count=len(units))
+        processed[~active] = 0.0
+        for psi_unit, processed_state in zip(units, processed):
+            psi_unit.state['processed_state'] = processed_state
+        return processed
+
+    def _get_plan(self, incidence, units, dtype):
+        """Gather/scatter layout for the given primes; cached while the incidence is unchanged."""
+        key = (incidence, tuple(u.p for u in units), dtype)
+        if self._plan_key is not None and self._plan_key[0] is key[0] and self._plan_key[1:] == key[1:]:
+            return self._plan
+        segments = [incidence.rows(u.p) for u in units]
+        counts = np.array([len(s) for s in segments], dtype=np.int64)
+        plan = blend_plan(np.concatenate(segments), counts, dtype)
+        self._plan_key = key
+        self._plan = plan
+        return self._plan
+
+
+NODULE_EXECUTORS = {
+    'sequential': SequentialNoduleExecutor,
+    'fused': FusedNoduleExecutor,
+}
+
+def make_nodule_executor(mode: str):
+    """Build the nodule executor named by ``PPRIPOptions.nodule_mode``."""
+    try:
+        return NODULE_EXECUTORS[mode]()
+    except KeyError:
+        raise ValueError(f"Unknown nodule_mode {mode!r}; expected one of {sorted(NODULE_EXECUTORS)}")
@@ -1,3 +1,11 @@
+import numpy as np
+import random
+from typing import Optional
+
+from .cgos import Transputation, RealitySelection, Awareness
+from .options import PPRIPOptions
+from .selection import BatchSelector
+
 class EnhancedTransputation(Transputation):
     """
     Enhanced version of Transputation with PPRIP emergence detection.
@@ -17,11 +25,30 @@ class EnhancedRealitySelection(RealitySelection):
     """
     Enhanced version of RealitySelection with PPRIP coupling.
     """
-    def __call__(self, coherence: float, choices: list, options: PPRIPOptions) -> str:
+    def __init__(self):
+        super().__init__()
+        self._selector = BatchSelector()
+    
+    def __call__(self, coherence: float, choices: list, options: PPRIPOptions,
+                 rng: Optional[np.random.Generator] = None) -> str:
+        if rng is not None:
+            # Same weighting, drawn from the caller's generator instead of the global state
+            weights = coherence + options.coupling_strength * (1-coherence) * rng.random(len(choices))
+            return choices[int(rng.choice(len(choices), p=weights / weights.sum()))]
         # Original implementation with PPRIP coupling strength
         weights = [coherence + options.coupling_strength * (1-coherence) * random.random() 
                   for _ in choices]
         return random.choices(choices, weights=weights, k=1)[0]
+    
+    def select_batch(self, choices, coherence, k: int, options: PPRIPOptions,
+                     rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        ``k`` draws from ``choices`` with the same weighting, vectorized:
+        ``coherence`` may be a scalar or one value per choice. Weights and
+        draws take one Generator call (``rng``, or this thread's own), so
+        concurrent callers never touch the global ``random`` state.
+        """
+        return self._selector.select(choices, coherence, k, options.coupling_strength, rng)
 
 class EnhancedAwareness(Awareness):
     """
@@ -34,6 +61,23 @@ class EnhancedAwareness(Awareness):
         
         # PPRIP enhancement: track node states and graph properties
         global_c['node_states'] = manifold.get_node_states()
+        delta = manifold.drain_topology_delta()
+        if manifold.options.awareness_mode == "delta":
+            # O(changes) per step; full lists only built if a caller reads them
+            if manifold.topology_deferred():
+                # Counted from G rather than rebuilding a stale tracker (see ApproximateMetrics)
+                num_nodes, num_edges = manifold.G.number_of_nodes(), manifold.G.number_of_edges()
+            else:
+                topology = manifold.get_topology()
+                num_nodes, num_edges = topology.num_nodes, topology.num_edges
+            global_c['graph_info'] = {
+                **delta,
+                'nodes': manifold.node_list_view(),
+                'edges': manifold.edge_list_view(),
+                'num_nodes': num_nodes,
+                'num_edges': num_edges
+            }
+            return
         global_c['graph_info'] = {
             'nodes': list(manifold.G.nodes()),
             'edges': list(manifold.G.edges()),
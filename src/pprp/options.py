@@ -8,3 +8,24 @@ class PPRIPOptions:
     thresh_omega: float = 1.0 # Threshold for Ω_proxy
     thresh_beta1: int = 1     # Threshold for β₁_proxy
     coupling_strength: float = 1.0 # Strength of input-system coupling
+    nodule_mode: str = "sequential" # ψₚ layer executor: "sequential" or "fused"
+    graph_backend: str = "networkx" # Manifold graph storage: "networkx" or "csr"
+    awareness_mode: str = "full" # graph_info per step: "full" lists or "delta" changes
+    repair_policy: str = "lowest" # β₁ repair edge: "lowest", "random" or "shortest_cycle"
+    emergence_capacity: Optional[int] = None # Keep only the latest N emergence events (None: all)
+    emergence_spill_path: Optional[str] = None # Append every emergence event to this file
+    state_dim: int = 4 # Components per node state vector
+    dtype: str = "float64" # Node state precision: "float64" or "float32"
+    core_workers: int = 0 # Threads evaluating cores concurrently (0: in the calling thread)
+    approximate_metrics: bool = False # Sample Ω/φ after direct state_array writes, π (and count β₁) after direct G edits; exact otherwise
+    sample_size: int = 4096 # Rows / cycles sampled per approximate metric
+    recalibrate_every: int = 100 # Exact Ω/φ/π (and π bias update) every K evaluations
+    confidence: float = 0.95 # Confidence level of approximate Ω intervals
+    mask_nodules: bool = False # Fused ψₚ layer also skips primes inactive in prime_mask
+    shards: int = 0 # Worker processes running the fused ψₚ layer over shared memory (0: in process; needs nodule_mode="fused")
+
+    def __post_init__(self):
+        if self.emergence_capacity is not None and self.emergence_capacity < 1:
+            raise ValueError(f"emergence_capacity must be at least 1 or None, not {self.emergence_capacity!r}")
+        if self.shards > 0 and self.nodule_mode != "fused":
+            raise ValueError(f"shards run the fused ψₚ layer; set nodule_mode=\"fused\", not {self.nodule_mode!r}")
@@ -0,0 +1,204 @@
+import numpy as np
+from typing import Any, Callable, Optional, Sequence
+
+def _int_to_bits(mask: int) -> np.ndarray:
+    """Bits of a non-negative int, least significant first."""
+    if mask < 0:
+        raise ValueError(f"prime_mask must be non-negative, got {mask}")
+    raw = mask.to_bytes(max((mask.bit_length() + 7) // 8, 1), 'little')
+    return np.unpackbits(np.frombuffer(raw, dtype=np.uint8), bitorder='little')
+
+def _bits_to_int(positions: np.ndarray) -> int:
+    """The int with exactly the given bit positions set."""
+    if not len(positions):
+        return 0
+    bits = np.zeros(int(positions.max()) + 1, dtype=np.uint8)
+    bits[positions] = 1
+    return int.from_bytes(np.packbits(bits, bitorder='little').tobytes(), 'little')
+
+
+class PrimeActivation:
+    """
+    Activation flag of every prime, one boolean per prime ordinal.
+
+    Replaces the arbitrary-precision ``prime_mask`` int: ``is_active(p)``
+    is a dict lookup and an array read, and ``enable``/``disable`` switch
+    whole ranges, predicate matches or random fractions of the primes with
+    one array assignment. It still behaves like the int it replaces
+    (bit p set: prime p active) for ``&``, ``|``, ``^``, ``==``, ``int()``
+    and ``bin()``/``hex()``; ``|``/``^`` return activations and their
+    in-place forms update this one. Bits that are not tracked primes are
+    carried along unchanged.
+    """
+    def __init__(self, primes: Sequence[int], active: Optional[np.ndarray] = None, extra_bits: int = 0):
+        self.primes = np.asarray(primes, dtype=np.int64)
+        self._ordinal = {int(p): j for j, p in enumerate(self.primes)}
+        self.flags = np.ones(len(self.primes), dtype=bool) if active is None else np.asarray(active, dtype=bool).copy()
+        self.extra_bits = extra_bits
+
+    @classmethod
+    def from_int(cls, primes: Sequence[int], mask: int) -> "PrimeActivation":
+        """Activation equivalent to a ``prime_mask`` int."""
+        primes = np.asarray(primes, dtype=np.int64)
+        bits = _int_to_bits(int(mask))
+        flags = np.zeros(len(primes), dtype=bool)
+        in_range = primes < len(bits)
+        flags[in_range] = bits[primes[in_range]].astype(bool)
+        return cls(primes, flags, int(mask) & ~_bits_to_int(primes))
+
+    # -- queries --------------------------------------------------------------
+
+    def is_active(self, p: int) -> bool:
+        """Whether prime ``p`` is active, in O(1)."""
+        j = self._ordinal.get(p)
+        if j is None:
+            return (self.extra_bits >> p) & 1 == 1
+        return bool(self.flags[j])
+
+    def active(self, primes: Sequence[int]) -> np.ndarray:
+        """Activation of many primes at once."""
+        primes = np.asarray(primes, dtype=np.int64)
+        if not len(self.primes):
+            return np.array([self.is_active(int(p)) for p in primes], dtype=bool)
+        j = np.minimum(np.searchsorted(self.primes, primes), len(self.primes) - 1)
+        tracked = self.primes[j] == primes
+        result = np.where(tracked, self.flags[j], False)
+        for k in np.flatnonzero(~tracked):
+            result[k] = self.is_active(int(primes[k]))
+        return result
+
+    def active_primes(self) -> np.ndarray:
+        """The active tracked primes, ascending."""
+        return self.primes[self.flags]
+
+    # -- bulk updates ---------------------------------------------------------
+
+    def _select(self, primes: Optional[Sequence[int]], lo: Optional[int], hi: Optional[int],
+                where: Optional[Callable[[np.ndarray], np.ndarray]], fraction: Optional[float],
+                rng: Optional[np.random.Generator]) -> np.ndarray:
+        """Ordinals matching every given criterion (all primes when none is given)."""
+        selected = np.ones(len(self.primes), dtype=bool)
+        if primes is not None:
+            selected &= np.isin(self.primes, np.asarray(primes, dtype=np.int64))
+        if lo is not None:
+            selected &= self.primes >= lo
+        if hi is not None:
+            selected &= self.primes < hi
+        if where is not None:
+            selected &= np.asarray(where(self.primes), dtype=bool)
+        ordinals = np.flatnonzero(selected)
+        if fraction is not None:
+            rng = rng if rng is not None else np.random.default_rng()
+            ordinals = rng.choice(ordinals, size=int(round(fraction * len(ordinals))), replace=False)
+        return ordinals
+
+    def enable(self, primes: Optional[Sequence[int]] = None, *, lo: Optional[int] = None,
+               hi: Optional[int] = None, where: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+               fraction: Optional[float] = None, rng: Optional[np.random.Generator] = None) -> "PrimeActivation":
+        """
+        Activate the tracked primes that are in ``primes``, in ``[lo, hi)`` and
+        match ``where`` (a vectorized predicate over the prime array), or a
+        random ``fraction`` of those. Returns self.
+        """
+        self.flags[self._select(primes, lo, hi, where, fraction, rng)] = True
+        return self
+
+    def disable(self, primes: Optional[Sequence[int]] = None, *, lo: Optional[int] = None,
+                hi: Optional[int] = None, where: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+                fraction: Optional[float] = None, rng: Optional[np.random.Generator] = None) -> "PrimeActivation":
+        """Deactivate primes selected as in ``enable``. Returns self."""
+        self.flags[self._select(primes, lo, hi, where, fraction, rng)] = False
+        return self
+
+    # -- int compatibility ----------------------------------------------------
+
+    def __int__(self) -> int:
+        return _bits_to_int(self.primes[self.flags]) | self.extra_bits
+
+    __index__ = __int__
+
+    def __and__(self, other: Any) -> int:
+        if not isinstance(other, int):
+            return NotImplemented
+        # Single-bit test (mask & (1 << p)): answered without building the int
+        if other > 0 and other & (other - 1) == 0:
+            return other if self.is_active(other.bit_length() - 1) else 0
+        return int(self) & other
+
+    __rand__ = __and__
+
+    def __ior__(self, other: Any) -> "PrimeActivation":
+        if not isinstance(other, (int, PrimeActivation)):
+            return NotImplemented
+        # Single-bit set (mask |= 1 << p) on a tracked prime: one flag write
+        j = self._single_bit_ordinal(other)
+        if j is not None:
+            self.flags[j] = True
+            return self
+        bits = PrimeActivation.from_int(self.primes, int(other))
+        self.flags |= bits.flags
+        self.extra_bits |= bits.extra_bits
+        return self
+
+    def __ixor__(self, other: Any) -> "PrimeActivation":
+        if not isinstance(other, (int, PrimeActivation)):
+            return NotImplemented
+        j = self._single_bit_ordinal(other)
+        if j is not None:
+            self.flags[j] = not self.flags[j]
+            return self
+        bits = PrimeActivation.from_int(self.primes, int(other))
+        self.flags ^= bits.flags
+        self.extra_bits ^= bits.extra_bits
+        return self
+
+    def __or__(self, other: Any) -> "PrimeActivation":
+        if not isinstance(other, (int, PrimeActivation)):
+            return NotImplemented
+        return self.copy().__ior__(other)
+
+    def __xor__(self, other: Any) -> "PrimeActivation":
+        if not isinstance(other, (int, PrimeActivation)):
+            return NotImplemented
+        return self.copy().__ixor__(other)
+
+    __ror__ = __or__
+    __rxor__ = __xor__
+
+    def __invert__(self) -> "PrimeActivation":
+        """Every tracked prime flipped. Untracked bits are dropped: an int's ``~`` would set infinitely many."""
+        return PrimeActivation(self.primes, ~self.flags)
+
+    def _single_bit_ordinal(self, other: Any) -> Optional[int]:
+        """Ordinal of the tracked prime ``other`` is the single bit of, if it is one."""
+        if isinstance(other, int) and other > 0 and other & (other - 1) == 0:
+            return self._ordinal.get(other.bit_length() - 1)
+        return None
+
+    def copy(self) -> "PrimeActivation":
+        """An independent activation with the same flags and extra bits."""
+        return PrimeActivation(self.primes, self.flags, self.extra_bits)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, PrimeActivation):
+            return int(self) == int(other)
+        if isinstance(other, int):
+            return int(self) == other
+        return NotImplemented
+
+    __hash__ = None  # mutable
+
+    def __repr__(self) -> str:
+        return f"PrimeActivation({int(self.flags.sum())}/{len(self.primes)} primes active, mask={hex(self)})"
+
+def prime_flags(prime_mask: Any, primes: Sequence[int]) -> np.ndarray:
+    """Activation of ``primes`` under a ``PrimeActivation`` or a plain ``prime_mask`` int."""
+    if isinstance(prime_mask, PrimeActivation):
+        return prime_mask.active(primes)
+    return PrimeActivation.from_int(primes, int(prime_mask)).flags
+
+def prime_active(prime_mask: Any, p: int) -> bool:
+    """Whether prime ``p`` is active under a ``PrimeActivation`` or a plain ``prime_mask`` int."""
+    if isinstance(prime_mask, PrimeActivation):
+        return prime_mask.is_active(p)
+    return prime_mask & (1 << p) != 0
@@ -0,0 +1,82 @@
+import math
+import threading
+import numpy as np
+
+class PrimeTable:
+    """
+    Monotonically growing table of primes.
+
+    ``primes_up_to(n)`` answers by slicing; when n exceeds the sieved
+    limit the table is extended with a segmented NumPy sieve, so the work
+    and memory for any range are paid once per process.
+    """
+    def __init__(self, segment_size: int = 1 << 20):
+        self.segment_size = segment_size
+        self.limit = 1  # every prime <= limit is in the table
+        self._primes = np.zeros(0, dtype=np.int64)
+        self._lock = threading.Lock()
+
+    def primes_up_to(self, n: int) -> np.ndarray:
+        """All primes <= n, ascending (a read-only view)."""
+        if n > self.limit:
+            with self._lock:
+                if n > self.limit:
+                    self._extend(n)
+        view = self._primes[:np.searchsorted(self._primes, n, side='right')]
+        view.flags.writeable = False
+        return view
+
+    def _extend(self, n: int):
+        # Sieving up to n needs every prime up to sqrt(n): extend to that first.
+        # The recursion bottoms out at n <= 3, where the range has no composites.
+        root = math.isqrt(n)
+        if root > self.limit:
+            self._extend(root)
+        base = self._primes[:np.searchsorted(self._primes, root, side='right')]
+        new = []
+        lo = self.limit + 1
+        while lo <= n:
+            hi = min(lo + self.segment_size, n + 1)
+            new.append(self._sieve_segment(lo, hi, base))
+            lo = hi
+        self._primes = np.concatenate([self._primes] + new)
+        self.limit = n
+
+    @staticmethod
+    def _sieve_segment(lo: int, hi: int, base: np.ndarray) -> np.ndarray:
+        """Primes in [lo, hi) given every prime up to sqrt(hi - 1)."""
+        is_prime = np.ones(hi - lo, dtype=bool)
+        if lo < 2:
+            is_prime[:2 - lo] = False
+        for p in base.tolist():
+            start = max(p * p, (lo + p - 1) // p * p)
+            is_prime[start - lo::p] = False
+        return np.flatnonzero(is_prime).astype(np.int64) + lo
+
+    def save(self, path: str):
+        """Persist the table to a ``.npy`` file (limit stored as the last element)."""
+        np.save(path, np.append(self._primes, self.limit))
+
+    def load(self, path: str):
+        """Adopt a table saved by ``save`` if it reaches further than this one."""
+        data = np.load(path)
+        if len(data) and data[-1] > self.limit:
+            with self._lock:
+                self._primes = data[:-1].astype(np.int64)
+                self.limit = int(data[-1])
+
+
+# Process-wide table shared by every manifold
+_TABLE = PrimeTable()
+
+def primes_up_to(n: int) -> np.ndarray:
+    """All primes <= n from the shared process-wide table."""
+    return _TABLE.primes_up_to(n)
+
+def get_prime_table() -> PrimeTable:
+    """The shared process-wide prime table."""
+    return _TABLE
+
+def load_prime_table(path: str):
+    """Warm the shared table from a ``.npy`` file written by ``PrimeTable.save``."""
+    _TABLE.load(path)
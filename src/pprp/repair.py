@@ -0,0 +1,93 @@
+import numpy as np
+from typing import Dict, List, Any, Tuple, Optional, Hashable
+
+class EdgeRepairIndex:
+    """
+    Candidate source for the cycle-creating edge β₁ repair adds.
+
+    Policies:
+
+    - ``"lowest"``: the first non-adjacent pair (i, j), i < j, in node order,
+      i.e. what the old nested ``has_edge`` scan returned. Edges are only
+      ever added, so that pair never moves backwards; a cursor resumes where
+      the last scan stopped and every edge is stepped over at most once.
+    - ``"random"``: a uniformly sampled non-adjacent pair inside one
+      connected component, by rejection sampling.
+    - ``"shortest_cycle"``: two non-adjacent neighbours of a sampled node,
+      so the new edge closes a triangle, the shortest cycle possible.
+
+    Sampling policies fall back to the cursor after ``max_tries`` misses
+    (e.g. when the graph is close to complete). The index notices added
+    nodes itself; call ``reset()`` after removing nodes or edges.
+    """
+    POLICIES = ('lowest', 'random', 'shortest_cycle')
+
+    def __init__(self, G, policy: str = 'lowest', rng: Optional[np.random.Generator] = None,
+                 max_tries: int = 64):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown repair_policy {policy!r}; expected one of {self.POLICIES}")
+        self.G = G
+        self.policy = policy
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.max_tries = max_tries
+        self.reset()
+
+    def reset(self):
+        """Forget the cursor and node order; the next proposal rescans from the start."""
+        nodes = self.G.nodes()
+        self._nodes = nodes if isinstance(nodes, range) else list(nodes)
+        self._cursor = (0, 1)
+
+    def propose(self, topology=None) -> Optional[Tuple[Hashable, Hashable]]:
+        """
+        A missing edge (u, v) per the policy, or None if the graph is complete.
+        ``topology`` (a TopologyTracker) restricts random pairs to one component.
+        """
+        if len(self._nodes) != self.G.number_of_nodes():
+            self.reset()
+        if len(self._nodes) < 2:
+            return None
+        pair = None
+        if self.policy == 'shortest_cycle':
+            pair = self._sample_triangle()
+        if pair is None and self.policy in ('random', 'shortest_cycle'):
+            pair = self._sample_pair(topology)
+        return pair if pair is not None else self._scan()
+
+    def _scan(self) -> Optional[Tuple[Hashable, Hashable]]:
+        """First non-adjacent pair at or after the cursor, in node order."""
+        nodes, n = self._nodes, len(self._nodes)
+        i, j = self._cursor
+        while i < n - 1:
+            if j >= n:
+                i, j = i + 1, i + 2
+                continue
+            if not self.G.has_edge(nodes[i], nodes[j]):
+                self._cursor = (i, j)
+                return nodes[i], nodes[j]
+            j += 1
+        self._cursor = (i, j)
+        return None
+
+    def _sample_pair(self, topology) -> Optional[Tuple[Hashable, Hashable]]:
+        nodes, n = self._nodes, len(self._nodes)
+        for _ in range(self.max_tries):
+            i, j = self.rng.integers(n, size=2).tolist()
+            u, v = nodes[i], nodes[j]
+            if i == j or self.G.has_edge(u, v):
+                continue
+            if topology is not None and not topology.connected(u, v):
+                continue
+            return (u, v) if i < j else (v, u)
+        return None
+
+    def _sample_triangle(self) -> Optional[Tuple[Hashable, Hashable]]:
+        nodes, n = self._nodes, len(self._nodes)
+        for _ in range(self.max_tries):
+            neighbors = np.asarray(list(self.G.neighbors(nodes[int(self.rng.integers(n))])))
+            if len(neighbors) < 2:
+                continue
+            u, v = neighbors[self.rng.choice(len(neighbors), size=2, replace=False)].tolist()
+            if u != v and not self.G.has_edge(u, v):
+                return u, v
+        return None
@@ -6,23 +6,73 @@ from typing import Dict, List, Any, Tuple, Optional, Callable
 PI = math.pi
 PHI = (1 + math.sqrt(5)) / 2
 
+def pi_deviations(lengths) -> np.ndarray:
+    """|L − 2πk| for the integer k nearest L / 2π, elementwise over cycle lengths."""
+    L = np.asarray(lengths, dtype=float)
+    return np.abs(L - 2 * PI * np.round(L / (2 * PI)))
+
+def harmonic_ratios(lengths) -> np.ndarray:
+    """L / 2πk for the integer k ≥ 1 nearest L / 2π, elementwise over cycle lengths."""
+    L = np.asarray(lengths, dtype=float)
+    return L / (2 * PI * np.maximum(np.round(L / (2 * PI)), 1.0))
+
+def best_harmonic_deviation(lengths) -> float:
+    """Smallest |ratio − 1| over the cycle lengths, as PiCore scores a basis; 1.0 with no cycles."""
+    return float(np.abs(harmonic_ratios(lengths) - 1.0).min()) if len(lengths) else 1.0
+
+def pi_deviation_spectrum(lengths, counts) -> Dict[str, np.ndarray]:
+    """π-deviation of every distinct cycle length, with its multiplicity."""
+    return {"length": np.asarray(lengths), "count": np.asarray(counts), "deviation": pi_deviations(lengths)}
+
 class PiPhiResonanceEngine:
     """Analyzes π-geometry and φ-optimization in graph and data."""
     def __init__(self):
         pass
 
-    def analyze_graph(self, G: nx.Graph) -> Dict[str, float]:
-        """Analyze the graph G for π-resonance."""
-        cycles = nx.cycle_basis(G)
-        min_dev_pi = float('inf')
-        for cycle in cycles:
-            L = len(cycle) # Simple proxy for cycle length
-            # Find k that minimizes |L - 2*pi*k|
-            k_opt = round(L / (2 * PI))
-            dev = abs(L - 2 * PI * k_opt)
-            if dev < min_dev_pi:
-                min_dev_pi = dev
-        return {"dev_pi_graph": min_dev_pi if cycles else float('inf')}
+    def analyze_graph(self, G: nx.Graph, topology=None, sample_size: Optional[int] = None,
+                      rng: Optional[np.random.Generator] = None) -> Dict[str, float]:
+        """
+        Analyze the graph G for π-resonance. Pass the manifold's
+        TopologyTracker as ``topology`` to reuse its cycle-length histogram,
+        or ``sample_size`` to estimate from that many sampled cycles.
+        """
+        spectrum = self.pi_spectrum(G, topology, sample_size, rng)
+        deviation = spectrum["deviation"]
+        return {"dev_pi_graph": float(deviation.min()) if len(deviation) else float('inf'),
+                "exact": bool(spectrum.get("exact", True))}
+
+    def pi_spectrum(self, G: nx.Graph, topology=None, sample_size: Optional[int] = None,
+                    rng: Optional[np.random.Generator] = None) -> Dict[str, np.ndarray]:
+        """
+        π-deviation spectrum over the distinct cycle lengths of G. With
+        ``sample_size`` (and no ``topology``) it is estimated from that many
+        fundamental cycles of a BFS spanning forest: counts are scaled up to
+        β₁ and ``exact`` is False unless every cycle was sampled.
+        """
+        if topology is None and sample_size is not None:
+            from .sampling import sample_cycle_lengths
+            sampled, total = sample_cycle_lengths(G, sample_size, rng if rng is not None else np.random.default_rng())
+            counts = np.bincount(sampled) if len(sampled) else np.zeros(0, dtype=np.int64)
+            lengths = np.flatnonzero(counts)
+            spectrum = pi_deviation_spectrum(lengths, counts[lengths] * (total / max(len(sampled), 1)))
+            spectrum["exact"] = len(sampled) == total
+            return spectrum
+        if topology is None and not isinstance(G, nx.Graph):
+            # Other graph backends: build a tracker for their cycle basis
+            from .topology import make_topology_tracker
+            topology = make_topology_tracker(G)
+        if topology is not None:
+            lengths, counts = topology.cycle_length_histogram()
+        else:
+            # Simple proxy for cycle length: number of nodes in each basis cycle
+            counts = np.bincount([len(cycle) for cycle in nx.cycle_basis(G)])
+            lengths = np.flatnonzero(counts)
+            counts = counts[lengths]
+        return pi_deviation_spectrum(lengths, counts)
+
+    def stream(self, window: int = 256) -> "StreamingPhiAnalyzer":
+        """Stateful φ-analyzer for unbounded streams fed in chunks."""
+        return StreamingPhiAnalyzer(window)
 
     def analyze_data_stream(self, data_stream: List[float]) -> Dict[str, float]:
         """Analyze data stream for φ-optimization."""
@@ -35,3 +85,136 @@ class PiPhiResonanceEngine:
         growth_rate = cumsum[-1] / cumsum[-2]
         dev_phi = abs(growth_rate - PHI)
         return {"dev_phi_data": dev_phi}
+
+    def analyze_data_streams(self, values: np.ndarray, lengths: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Vectorized ``analyze_data_stream`` over many streams packed back to
+        back in ``values``, with ``lengths[i]`` elements in stream i.
+        """
+        values = np.asarray(values, dtype=float)
+        lengths = np.asarray(lengths, dtype=np.int64)
+        dev_phi = np.full(len(lengths), np.inf)
+        ends = np.cumsum(lengths)
+        nonempty = lengths > 0
+        long_enough = lengths >= 2
+        if long_enough.any():
+            # Last two cumulative sums of each stream: the total, and the total before the last element
+            totals = np.add.reduceat(values, (ends - lengths)[nonempty])[long_enough[nonempty]]
+            prev = totals - values[ends[long_enough] - 1]
+            growth_rate = np.divide(totals, prev, out=np.full(len(prev), np.inf), where=prev != 0)
+            dev_phi[long_enough] = np.abs(growth_rate - PHI)
+        return {"dev_phi_data": dev_phi}
+
+
+class StreamingPhiAnalyzer:
+    """
+    Running φ-analysis of an unbounded data stream.
+
+    Holds only the last two cumulative sums, a ring buffer of the latest
+    ``window`` growth rates and running moments over all growth rates, so
+    each chunk costs O(len(chunk)) and memory stays constant.
+    """
+    def __init__(self, window: int = 256):
+        self.window = window
+        self.count = 0
+        self.total = 0.0       # cumsum[-1]
+        self.prev_total = 0.0  # cumsum[-2]
+        self._rates = np.empty(window)
+        self._rate_pos = 0
+        self._rate_fill = 0
+        # Running moments of every finite growth rate seen
+        self._n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, chunk) -> "StreamingPhiAnalyzer":
+        """Feed a chunk (NumPy array or any iterable of numbers)."""
+        self._ingest(self._as_array(chunk))
+        return self
+
+    def update_segments(self, values, lengths) -> np.ndarray:
+        """
+        Feed several inputs packed back to back (``lengths[i]`` values each)
+        and return the φ deviation as it stood after each input.
+        """
+        values = self._as_array(values)
+        lengths = np.asarray(lengths, dtype=np.int64)
+        count_before, prev_before = self.count, self.prev_total
+        cum = self._ingest(values)
+        # cum[0] is cumsum[-2] before this call, cum[j + 1] the cumulative sum after j new values
+        cum = np.concatenate([[prev_before], cum])
+        ends = np.cumsum(lengths)
+        cur, prev = cum[ends + 1], cum[ends]
+        valid = (count_before + ends >= 2) & (prev != 0)
+        dev = np.full(len(lengths), np.inf)
+        dev[valid] = np.abs(cur[valid] / prev[valid] - PHI)
+        return dev
+
+    def dev_phi(self) -> float:
+        """|cumsum[-1] / cumsum[-2] − φ| over everything seen, as in ``analyze_data_stream``."""
+        if self.count < 2 or self.prev_total == 0:
+            return float('inf')
+        return abs(self.total / self.prev_total - PHI)
+
+    def result(self) -> Dict[str, float]:
+        """φ deviation plus growth-rate statistics, overall and over the window."""
+        recent = self._rates[:self._rate_fill]
+        return {
+            "dev_phi_data": self.dev_phi(),
+            "count": self.count,
+            "growth_rate_mean": self._mean if self._n else float('nan'),
+            "growth_rate_std": math.sqrt(self._m2 / self._n) if self._n else float('nan'),
+            "window_growth_rate_mean": float(recent.mean()) if len(recent) else float('nan'),
+            "window_growth_rate_std": float(recent.std()) if len(recent) else float('nan'),
+            "window_growth_rate_min": float(recent.min()) if len(recent) else float('nan'),
+            "window_growth_rate_max": float(recent.max()) if len(recent) else float('nan'),
+        }
+
+    @staticmethod
+    def _as_array(chunk) -> np.ndarray:
+        if isinstance(chunk, np.ndarray):
+            return chunk.ravel()
+        if hasattr(chunk, '__len__'):
+            return np.asarray(chunk, dtype=float).ravel()
+        return np.fromiter(chunk, dtype=float)
+
+    def _ingest(self, arr: np.ndarray) -> np.ndarray:
+        """Advance the cumulative state; returns cumsum values from the previous total onwards."""
+        if len(arr) == 0:
+            return np.array([self.total])
+        # Sequential cumsum seeded with the running total, so results match a
+        # single np.cumsum over the whole stream
+        cum = np.cumsum(np.concatenate([[self.total], arr.astype(float, copy=False)]))
+        prev, cur = cum[:-1], cum[1:]
+        has_prev = prev != 0
+        if self.count == 0:
+            has_prev[0] = False  # the stream's first value has no predecessor
+        # Skip the boolean gathers in the common case where every rate is defined
+        rates = cur / prev if has_prev.all() else cur[has_prev] / prev[has_prev]
+        finite = np.isfinite(rates)
+        self._push_rates(rates if finite.all() else rates[finite])
+
+        self.count += len(arr)
+        self.total = float(cum[-1])
+        self.prev_total = float(cum[-2])
+        return cum
+
+    def _push_rates(self, rates: np.ndarray):
+        if len(rates) == 0:
+            return
+        # Chan et al. merge of the chunk's moments into the running ones
+        n_b = len(rates)
+        mean_b = float(rates.mean())
+        m2_b = float(((rates - mean_b) ** 2).sum())
+        n = self._n + n_b
+        delta = mean_b - self._mean
+        self._mean += delta * n_b / n
+        self._m2 += m2_b + delta * delta * self._n * n_b / n
+        self._n = n
+
+        rates = rates[-self.window:]
+        k = len(rates)
+        idx = (self._rate_pos + np.arange(k)) % self.window
+        self._rates[idx] = rates
+        self._rate_pos = (self._rate_pos + k) % self.window
+        self._rate_fill = min(self._rate_fill + k, self.window)
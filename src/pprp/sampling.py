@@ -0,0 +1,250 @@
+import networkx as nx
+import numpy as np
+from statistics import NormalDist
+from typing import Dict, List, Any, Tuple, Optional
+
+from .graph_backend import CSRGraph
+from .resonance_engine import pi_deviations, best_harmonic_deviation
+
+def csr_arrays(G) -> Tuple[np.ndarray, np.ndarray]:
+    """(indptr, indices) adjacency of G, over node positions in ``G.nodes()`` order."""
+    if isinstance(G, CSRGraph):
+        G.compact()
+        return G.indptr, G.indices
+    nodes = list(G.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = np.array([(index[u], index[v]) for u, v in G.edges()], dtype=np.int64).reshape(-1, 2)
+    csr = CSRGraph.from_edges(len(nodes), edges[:, 0], edges[:, 1])
+    return csr.indptr, csr.indices
+
+def component_roots(indptr: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """
+    One node per connected component (its smallest position), by
+    hook-and-compress label propagation: every round, each component root
+    with an edge to a smaller-labelled component hooks onto it, then
+    pointer jumping flattens the labels back to roots.
+    """
+    n = len(indptr) - 1
+    labels = np.arange(n, dtype=np.int64)
+    rows = np.repeat(labels, np.diff(indptr))
+    cols = indices.astype(np.int64)
+    upper = rows < cols
+    u, v = rows[upper], cols[upper]
+    while True:
+        lu, lv = labels[u], labels[v]
+        differ = lu != lv
+        if not differ.any():
+            return np.flatnonzero(labels == np.arange(n))
+        # Labels are roots here, so this only ever links root to smaller root
+        np.minimum.at(labels, np.maximum(lu[differ], lv[differ]), np.minimum(lu[differ], lv[differ]))
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+        u, v = u[differ], v[differ]
+
+def bfs_forest(indptr: np.ndarray, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parent and depth of every node in a BFS spanning forest (roots have
+    parent -1). Every component's BFS starts together from its root, and
+    the forest is expanded one level at a time with array operations.
+    """
+    n = len(indptr) - 1
+    parent = np.full(n, -1, dtype=np.int64)
+    depth = np.full(n, -1, dtype=np.int64)
+    degree = np.diff(indptr)
+    frontier = component_roots(indptr, indices)
+    depth[frontier] = 0
+    level = 0
+    while len(frontier):
+        counts = degree[frontier]
+        src = np.repeat(frontier, counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        dst = indices[np.repeat(indptr[frontier], counts) + offsets].astype(np.int64)
+        new = depth[dst] < 0
+        # Any frontier node may adopt a new node; the last write wins
+        parent[dst[new]] = src[new]
+        level += 1
+        frontier = np.unique(dst[new])
+        depth[frontier] = level
+    return parent, depth
+
+def fundamental_basis(G) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    BFS spanning forest of G (parent, depth) and the endpoints (u, v) of its
+    non-tree edges, each of which closes one fundamental cycle.
+    """
+    indptr, indices = csr_arrays(G)
+    parent, depth = bfs_forest(indptr, indices)
+    rows = np.repeat(np.arange(len(indptr) - 1, dtype=np.int64), np.diff(indptr))
+    cols = indices.astype(np.int64)
+    upper = rows <= cols
+    u, v = rows[upper], cols[upper]
+    non_tree = (parent[v] != u) & (parent[u] != v)
+    return parent, depth, u[non_tree], v[non_tree]
+
+def sample_cycle_lengths(G, sample_size: int, rng: np.random.Generator,
+                         basis: Optional[Tuple[np.ndarray, ...]] = None) -> Tuple[np.ndarray, int]:
+    """
+    Lengths (node counts) of up to ``sample_size`` fundamental cycles of G,
+    drawn uniformly from the basis of a BFS spanning forest, and the size of
+    that basis (β₁). Each non-tree edge (u, v) closes the cycle
+    u → lca(u, v) → v, of depth(u) + depth(v) − 2·depth(lca) + 1 nodes.
+    ``basis`` reuses a ``fundamental_basis`` result for the same graph.
+    """
+    parent, depth, u, v = basis if basis is not None else fundamental_basis(G)
+    total = len(u)
+    if total > sample_size:
+        picked = rng.choice(total, size=sample_size, replace=False)
+        a, b = u[picked], v[picked]
+    else:
+        a, b = u, v
+    length = np.ones(len(a), dtype=np.int64)
+    # Climb the deeper endpoint, then both, until the endpoints meet at the LCA
+    while True:
+        deeper_a = depth[a] > depth[b]
+        deeper_b = depth[b] > depth[a]
+        same = ~deeper_a & ~deeper_b & (a != b)
+        if not (deeper_a.any() or deeper_b.any() or same.any()):
+            return length, total
+        climb_a = deeper_a | same
+        climb_b = deeper_b | same
+        a = np.where(climb_a, parent[a], a)
+        b = np.where(climb_b, parent[b], b)
+        length += climb_a.astype(np.int64) + climb_b
+
+
+class ApproximateMetrics:
+    """
+    Sampled Ω, φ and π estimates for manifolds too large for exact metrics.
+
+    The exact values are used whenever they are already cheap: Ω and φ
+    while the running moments are current, π while the topology tracker is.
+    A stale tracker is not rebuilt until π recalibrates; β₁ is counted from
+    a BFS spanning forest of G meanwhile.
+    Otherwise Ω is the variance of ``sample_size`` node rows, drawn afresh
+    at each evaluation, with a normal-approximation confidence interval; the
+    φ magnitude total is extrapolated from a fresh draw in the same way, and
+    π is the minimum deviation over ``sample_size`` sampled fundamental
+    cycles. Every ``recalibrate_every`` evaluations the exact value is
+    computed instead. The minimum over a sample overshoots the true one, so
+    the π sample's offset from the exact value is kept as a bias correction.
+    """
+    def __init__(self, sample_size: int = 4096, recalibrate_every: int = 100,
+                 confidence: float = 0.95, rng: Optional[np.random.Generator] = None):
+        self.sample_size = sample_size
+        self.recalibrate_every = recalibrate_every
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.evaluations: Dict[str, int] = {}
+        self.bias: Dict[str, float] = {}
+        self._basis_key = None
+        self._basis = None
+
+    def _due(self, axiom_id: str) -> bool:
+        """Count an evaluation; True when it must be exact."""
+        due = self.due_next(axiom_id)
+        self.evaluations[axiom_id] = self.evaluations.get(axiom_id, 0) + 1
+        return due
+
+    def due_next(self, axiom_id: str) -> bool:
+        """Whether the next evaluation of ``axiom_id`` will be exact."""
+        return self.evaluations.get(axiom_id, 0) % self.recalibrate_every == 0
+
+    def prepare(self, manifold):
+        """Run the exact rebuilds the next evaluations need up front (see ``prepare_read``)."""
+        if self.due_next('Ω') or self.due_next('φ'):
+            manifold.moments()
+        if self.due_next('π'):
+            manifold.get_topology()
+        elif not manifold.topology_current():
+            self._fundamental_basis(manifold.G)
+
+    def omega(self, manifold) -> Tuple[float, Optional[Tuple[float, float]], bool]:
+        """Ω proxy (state variance), its confidence interval and whether it is exact."""
+        due = self._due('Ω')
+        if not manifold.moments_stale() and not due:
+            return manifold.state_variance(), None, True
+        estimate, half_width = self._sampled_variance(manifold.state_array)
+        if due:
+            return manifold.state_variance(), None, True
+        return estimate, (estimate - half_width, estimate + half_width), False
+
+    def phi_totals(self, manifold) -> Tuple[float, float, bool]:
+        """Last two cumulative magnitude totals (as ``cumulative_magnitudes``) and whether they are exact."""
+        due = self._due('φ')
+        if not manifold.moments_stale() and not due:
+            return (*manifold.cumulative_magnitudes(), True)
+        if due:
+            return (*manifold.cumulative_magnitudes(), True)
+        states = manifold.state_array
+        rows = self._sample_rows(len(states))
+        sampled = states[rows].astype(np.float64)
+        estimate = float(np.sqrt(np.einsum('ij,ij->i', sampled, sampled)).mean()) * len(states) if len(rows) else 0.0
+        last = float(np.linalg.norm(states[-1].astype(np.float64))) if len(states) else 0.0
+        return estimate, estimate - last, False
+
+    def beta1(self, manifold) -> int:
+        """β₁ of G as the number of non-tree edges of a spanning forest (exact, without the tracker)."""
+        return len(self._fundamental_basis(manifold.G)[2])
+
+    def pi_scores(self, manifold) -> Tuple[float, float, bool]:
+        """
+        Best harmonic deviation and minimum π deviation over the cycle basis,
+        as EnhancedPiCore combines them, and whether they are exact. A
+        current topology tracker answers exactly; only evaluations against a
+        stale one sample, and only those count towards recalibration, which
+        rebuilds the tracker.
+        """
+        if manifold.topology_current():
+            return (*self._exact_pi_scores(manifold), True)
+        due = self._due('π')
+        lengths = self.cycle_lengths(manifold)
+        estimate = float(pi_deviations(lengths).min()) if len(lengths) else float('inf')
+        if due:
+            best, exact = self._exact_pi_scores(manifold)
+            if np.isfinite(exact) and np.isfinite(estimate):
+                self.bias['π'] = estimate - exact
+            return best, exact, True
+        return best_harmonic_deviation(lengths), max(estimate - self.bias.get('π', 0.0), 0.0), False
+
+    def cycle_lengths(self, manifold) -> np.ndarray:
+        """Lengths of up to ``sample_size`` fundamental cycles of G, drawn afresh."""
+        return sample_cycle_lengths(manifold.G, self.sample_size, self.rng, self._fundamental_basis(manifold.G))[0]
+
+    @staticmethod
+    def _exact_pi_scores(manifold) -> Tuple[float, float]:
+        spectrum = manifold.pi_deviation_spectrum()
+        deviation = spectrum['deviation']
+        return (best_harmonic_deviation(spectrum['length']),
+                float(deviation.min()) if len(deviation) else float('inf'))
+
+    def _fundamental_basis(self, G) -> Tuple[np.ndarray, ...]:
+        """Spanning forest and non-tree edges of G, reused until nodes or edges change."""
+        key = (G.number_of_nodes(), G.number_of_edges())
+        if self._basis is None or self._basis_key[0] is not G or self._basis_key[1] != key:
+            self._basis = fundamental_basis(G)
+            self._basis_key = (G, key)
+        return self._basis
+
+    def _sample_rows(self, n: int) -> np.ndarray:
+        """
+        ``sample_size`` row indices drawn uniformly with replacement, fresh on
+        every call, so successive estimates are independent (every row when
+        there are no more than ``sample_size``).
+        """
+        if n <= self.sample_size:
+            return np.arange(n)
+        return np.sort(self.rng.integers(n, size=self.sample_size))
+
+    def _sampled_variance(self, states: np.ndarray) -> Tuple[float, float]:
+        """Variance of the sampled rows and the half-width of its confidence interval."""
+        values = states[self._sample_rows(len(states))].astype(np.float64).ravel()
+        if len(values) < 2:
+            return 0.0, 0.0
+        centered = values - values.mean()
+        var = float(np.sum(centered ** 2)) / (len(values) - 1)
+        m4 = float(np.mean(centered ** 4))
+        return var, self.z * float(np.sqrt(max(m4 - var * var, 0.0) / len(values)))
+
@@ -0,0 +1,136 @@
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Optional, Sequence
+
+class AliasTable:
+    """
+    Vose alias table: O(1) draws from a fixed discrete distribution.
+
+    Built with array operations: each round, every under-full column takes
+    as alias the over-full column whose surplus covers the start of its
+    deficit (by cumulative sums), so a round settles all current under-full
+    columns at once. Pathological weight sets that keep cascading fall back
+    to the sequential construction after ``max_rounds``.
+    """
+    def __init__(self, weights: Sequence[float], max_rounds: int = 64):
+        w = np.asarray(weights, dtype=np.float64)
+        total = w.sum() if w.ndim == 1 else 0.0
+        if w.ndim != 1 or not len(w) or (w < 0).any() or not np.isfinite(total) or total <= 0:
+            raise ValueError("weights must be a non-empty 1-D array, non-negative with a positive sum")
+        n = len(w)
+        prob = w * (n / total)
+        alias = np.arange(n, dtype=np.int64)
+        small = np.flatnonzero(prob < 1.0)
+        large = np.flatnonzero(prob >= 1.0)
+        for _ in range(max_rounds):
+            if not (len(small) and len(large)):
+                break
+            deficit = 1.0 - prob[small]
+            start = np.cumsum(deficit) - deficit
+            j = np.searchsorted(np.cumsum(prob[large] - 1.0), start, side='right')
+            assigned = j < len(large)  # the rest only miss by rounding
+            if not assigned.any():
+                break
+            alias[small[assigned]] = large[j[assigned]]
+            received = np.bincount(j[assigned], weights=deficit[assigned], minlength=len(large))
+            prob[large] -= received
+            now_small = prob[large] < 1.0
+            small = np.concatenate([small[~assigned], large[now_small]])
+            large = large[~now_small]
+        small, large = small.tolist(), large.tolist()
+        while small and large:
+            s, l = small.pop(), large.pop()
+            alias[s] = l
+            prob[l] -= 1.0 - prob[s]
+            (small if prob[l] < 1.0 else large).append(l)
+        # Whatever is left is full up to rounding
+        prob[small + large] = 1.0
+        self.prob = prob
+        self.alias = alias
+
+    def __len__(self) -> int:
+        return len(self.prob)
+
+    def draw(self, u: np.ndarray) -> np.ndarray:
+        """Indices for uniform [0, 1) variates ``u``: the column from ``u·n``, the coin from its fraction."""
+        x = u * len(self.prob)
+        column = np.minimum(x.astype(np.int64), len(self.prob) - 1)
+        return np.where(x - column < self.prob[column], column, self.alias[column])
+
+
+class BatchSelector:
+    """
+    Weighted batch draws for ``EnhancedRealitySelection.select_batch``.
+
+    Weights and draws come from a single Generator call. Without a caller
+    generator each thread uses its own, so concurrent callers never share
+    (or lock) random state. Jittered weights are drawn from by inverse CDF;
+    weights that repeat, i.e. when the coupling jitter vanishes, get an
+    alias table, cached behind a lock and keyed by a digest of the weights.
+    """
+    def __init__(self, cache_size: int = 32):
+        self.cache_size = cache_size
+        self._tables: "OrderedDict[Any, AliasTable]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+
+    def generator(self) -> np.random.Generator:
+        """This thread's generator."""
+        rng = getattr(self._local, 'rng', None)
+        if rng is None:
+            rng = self._local.rng = np.random.default_rng()
+        return rng
+
+    def table(self, weights: np.ndarray) -> AliasTable:
+        """The alias table for ``weights``, built once while it stays cached."""
+        weights = np.ascontiguousarray(weights, dtype=np.float64)
+        key = (len(weights), hashlib.blake2b(weights.data, digest_size=16).digest())
+        with self._lock:
+            table = self._tables.get(key)
+            if table is not None:
+                self._tables.move_to_end(key)
+                self.hits += 1
+                return table
+            self.misses += 1
+        # Build outside the lock; a concurrent duplicate build is harmless
+        table = AliasTable(weights)
+        with self._lock:
+            self._tables[key] = table
+            while len(self._tables) > self.cache_size:
+                self._tables.popitem(last=False)
+        return table
+
+    def select(self, choices: Any, coherence: Any, k: int, coupling_strength: float,
+               rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        ``k`` independent draws from ``choices``, choice i weighted
+        ``coherence_i + coupling_strength·(1 − coherence_i)·U_i`` with one
+        jitter vector U per call, as ``EnhancedRealitySelection.__call__``.
+        """
+        if not isinstance(choices, np.ndarray):
+            choices = np.fromiter(choices, dtype=object, count=len(choices))
+        n = len(choices)
+        if not n:
+            raise ValueError("select_batch needs at least one choice")
+        coherence = np.asarray(coherence, dtype=np.float64)
+        if coherence.ndim and coherence.shape != (n,):
+            raise ValueError(f"coherence must be a scalar or have one value per choice, got shape {coherence.shape}")
+        rng = rng if rng is not None else self.generator()
+        jitter = coupling_strength * (1.0 - coherence)
+        if not np.any(jitter):
+            # Deterministic weights: uniform, or a table reused while they repeat
+            u = rng.random(k)
+            if coherence.ndim == 0 and coherence > 0:
+                return choices[np.minimum((u * n).astype(np.int64), n - 1)]
+            return choices[self.table(np.broadcast_to(coherence, (n,))).draw(u)]
+        # Weight jitter and draw variates in one Generator call. The weights
+        # are single-use, so an inverse-CDF search beats building a table.
+        u = rng.random(n + k)
+        cdf = np.cumsum(coherence + jitter * u[:n])
+        if not cdf[-1] > 0 or (np.diff(cdf, prepend=0.0) < 0).any():
+            raise ValueError("selection weights must be non-negative with a positive sum")
+        return choices[np.minimum(np.searchsorted(cdf, u[n:] * cdf[-1], side='right'), n - 1)]
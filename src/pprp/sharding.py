@@ -0,0 +1,277 @@
+import weakref
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Any, Tuple, Optional
+
+from .moments import StateMoments
+from .nodule_executor import FusedNoduleExecutor
+from .sampling import csr_arrays
+
+# (block name, shape, dtype string): all a worker needs to map a shared array
+Spec = Tuple[str, Tuple[int, ...], str]
+
+def component_labels(manifold) -> np.ndarray:
+    """Connected component of every row, labelled by the row of its union-find root."""
+    topology = manifold.get_topology()
+    return manifold.node_rows([topology.find(node) for node in manifold.G.nodes()])
+
+def partition_rows(labels: np.ndarray, num_shards: int) -> np.ndarray:
+    """
+    Shard of every row: rows grouped by component, then cut into
+    ``num_shards`` runs of equal size, so only components larger than a
+    shard (or straddling a cut) are split.
+    """
+    n = len(labels)
+    order = np.argsort(labels, kind='stable')
+    owner = np.empty(n, dtype=np.int64)
+    owner[order] = np.arange(n, dtype=np.int64) * num_shards // max(n, 1)
+    return owner
+
+
+class SharedArray:
+    """A NumPy array in a named shared-memory block; workers map it from ``spec``."""
+    def __init__(self, shape: Tuple[int, ...], dtype):
+        dtype = np.dtype(dtype)
+        shape = tuple(int(d) for d in shape)
+        size = max(int(np.prod(shape, dtype=np.int64)) * dtype.itemsize, 1)
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf)
+        self.spec: Spec = (self.shm.name, shape, dtype.str)
+
+    @classmethod
+    def copy_of(cls, values: np.ndarray) -> "SharedArray":
+        shared = cls(values.shape, values.dtype)
+        shared.array[...] = values
+        return shared
+
+    def release(self):
+        """Unlink the block; the mapping goes once no array views it any more."""
+        self.array = None
+        self.shm.unlink()
+        try:
+            self.shm.close()
+        except BufferError:
+            _pinned.append(self.shm)  # still viewed: never close under live arrays
+
+# Blocks released while the caller still held views into them
+_pinned: List[shared_memory.SharedMemory] = []
+
+def _release_all(blocks: List[SharedArray], pool: ProcessPoolExecutor):
+    pool.shutdown(wait=True)
+    for block in blocks:
+        block.release()
+    blocks.clear()
+
+
+# -- worker side ---------------------------------------------------------------
+
+# Blocks mapped by this worker process, dropped when the parent re-shares
+_attached: Dict[str, Tuple[shared_memory.SharedMemory, np.ndarray]] = {}
+_attached_generation = None
+
+def _attach(spec: Spec, generation: int) -> np.ndarray:
+    global _attached_generation
+    if generation != _attached_generation:
+        for shm, _ in _attached.values():
+            shm.close()
+        _attached.clear()
+        _attached_generation = generation
+    name, shape, dtype = spec
+    entry = _attached.get(name)
+    if entry is None:
+        shm = shared_memory.SharedMemory(name=name)
+        entry = _attached[name] = (shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+    return entry[1]
+
+def _shard_sums(generation: int, states_spec: Spec, plan: Dict[str, Spec]) -> np.ndarray:
+    """Partial segment sums over one shard's rows (one row per segment present in the shard)."""
+    states = _attach(states_spec, generation)
+    rows = _attach(plan['rows'], generation)
+    starts = _attach(plan['seg_starts'], generation)
+    return np.add.reduceat(states[rows], starts, axis=0)
+
+def _shard_blend(generation: int, states_spec: Spec, magnitudes_spec: Spec, plan: Dict[str, Spec],
+                 processed: np.ndarray, shift: Optional[float]) -> Tuple[float, float, float]:
+    """
+    Blend one shard's rows in place. With ``shift`` (moments are current)
+    also update their magnitudes and return the moment deltas.
+    """
+    states = _attach(states_spec, generation)
+    touched = _attach(plan['touched'], generation)
+    seg = _attach(plan['seg'], generation)
+    weights = _attach(plan['weights'], generation)
+    row_starts = _attach(plan['row_starts'], generation)
+    keep = _attach(plan['keep'], generation)
+    old = states[touched]
+    contrib = weights[:, None] * processed[seg]
+    states[touched] = keep[:, None] * old + np.add.reduceat(contrib, row_starts, axis=0)
+    if shift is None:
+        return 0.0, 0.0, 0.0
+    new = states[touched]
+    d_sum, d_sumsq = StateMoments.row_deltas(shift, old, new)
+    magnitudes = _attach(magnitudes_spec, generation)
+    new_mags = StateMoments.norms(new)
+    d_magnitude = float(new_mags.sum() - magnitudes[touched].sum())
+    magnitudes[touched] = new_mags
+    return d_sum, d_sumsq, d_magnitude
+
+
+# -- parent side ---------------------------------------------------------------
+
+class ShardedNoduleExecutor(FusedNoduleExecutor):
+    """
+    The fused ψₚ layer, run by worker processes over a shared-memory manifold.
+
+    On first use the manifold's ``state_array`` (and the running magnitudes)
+    move into ``multiprocessing.shared_memory``; the manifold keeps working
+    on them in place. Rows are partitioned by connected component into
+    ``num_shards`` shards and each shard's share of the fused gather/scatter
+    plan is placed in shared memory too, so a step ships only the φ-scaled
+    means. A step is two parallel phases: partial segment sums per shard,
+    reduced and φ-scaled in the parent, then each shard blends its own rows
+    and reports variance and magnitude deltas, which the parent folds into
+    the running moments. Results match ``FusedNoduleExecutor`` up to
+    floating-point summation order.
+
+    Adding or removing nodes replaces ``state_array``; it is re-shared and
+    re-planned on the next step. ``close`` stops the workers and gives the
+    manifold a private copy of its states.
+
+    Workers are started with ``start_method`` ("spawn" by default) rather
+    than the platform default, so they never inherit a forked copy of the
+    parent's threads or locks and behave the same on every platform.
+    """
+    def __init__(self, num_shards: int, start_method: str = "spawn"):
+        super().__init__()
+        self.num_shards = num_shards
+        self._pool = ProcessPoolExecutor(max_workers=num_shards,
+                                         mp_context=multiprocessing.get_context(start_method))
+        self._blocks: List[SharedArray] = []
+        self._plan_blocks: List[SharedArray] = []
+        self._finalizer = weakref.finalize(self, _release_all, self._blocks, self._pool)
+        self._generation = 0
+        self._manifold = None
+        self._states = None
+        self._magnitudes = None
+        self._shard_plans = None
+        self._shard_source = None
+        self.shard_sizes = np.zeros(0, dtype=np.int64)
+        self.boundary_edges = 0
+
+    def run(self, nodules: List[Any], manifold, global_c: dict):
+        units = self._prepare(nodules, manifold, global_c)
+        if not units:
+            return
+        self._share(manifold)
+        states = manifold.state_array
+        plan = self._get_plan(manifold.prime_incidence(), units, states.dtype)
+        shard_plans = self._get_shard_plans(manifold, plan, len(units))
+        seg_starts, counts = plan[0], plan[1]
+
+        # Phase 1: partial segment sums per shard, reduced here
+        sums = np.zeros((len(units), states.shape[1]), dtype=states.dtype)
+        futures = [(segments, self._pool.submit(_shard_sums, self._generation, self._states.spec, specs))
+                   for segments, specs in shard_plans if len(segments)]
+        for segments, future in futures:
+            sums[segments] += future.result()
+        processed = self._process(units, sums, counts, manifold.options.mask_nodules)
+
+        # Phase 2: every shard blends its own rows and reports its moment deltas
+        moments = None if manifold.moments_stale() else manifold.moments()
+        shift = moments.shift if moments is not None else None
+        futures = [self._pool.submit(_shard_blend, self._generation, self._states.spec,
+                                     self._magnitudes.spec, specs, processed, shift)
+                   for segments, specs in shard_plans if len(segments)]
+        deltas = np.array([f.result() for f in futures]).reshape(-1, 3).sum(axis=0)
+        if moments is None:
+            manifold.mark_modified()
+            return
+        moments.add_deltas(states, *(float(d) for d in deltas))
+        manifold.mark_modified(states=False)
+
+    def _share(self, manifold):
+        """Move the manifold's states and magnitudes into shared memory, once per state array."""
+        if manifold is self._manifold and manifold.state_array is self._states.array:
+            return
+        self._unshare()
+        self._release(list(self._blocks))
+        self._plan_blocks.clear()
+        self._states = SharedArray.copy_of(manifold.state_array)
+        manifold.state_array = self._states.array
+        moments = manifold.moments()
+        self._magnitudes = SharedArray.copy_of(moments.magnitudes)
+        moments.magnitudes = self._magnitudes.array
+        self._blocks.extend([self._states, self._magnitudes])
+        self._manifold = manifold
+        self._generation += 1
+        self._shard_source = None
+
+    def _unshare(self):
+        """Give the current manifold private copies of its shared arrays."""
+        manifold = self._manifold
+        if manifold is None:
+            return
+        if manifold.state_array is self._states.array:
+            manifold.state_array = manifold.state_array.copy()
+        moments = manifold.moments()
+        if moments.magnitudes is self._magnitudes.array:
+            moments.magnitudes = moments.magnitudes.copy()
+        self._manifold = None
+
+    def _get_shard_plans(self, manifold, plan, num_units: int) -> List[Tuple[np.ndarray, Dict[str, Spec]]]:
+        """Each shard's slice of the fused plan, in shared memory; rebuilt with the plan."""
+        if self._shard_source is plan:
+            return self._shard_plans
+        seg_starts, counts, rows, order, row_starts, touched, keep, weights = plan
+        owner = partition_rows(component_labels(manifold), self.num_shards)
+        seg = np.repeat(np.arange(num_units), counts)
+        sorted_rows = rows[order]
+        self._release(self._plan_blocks)
+        self._generation += 1
+
+        shard_plans = []
+        for s in range(self.num_shards):
+            # Phase 1: the shard's entries in segment order
+            mine = owner[rows] == s
+            shard_seg = seg[mine]
+            starts = np.flatnonzero(np.r_[True, shard_seg[1:] != shard_seg[:-1]]) if len(shard_seg) else shard_seg
+            # Phase 2: the shard's entries in row order
+            entries = order[owner[sorted_rows] == s]
+            entry_rows = rows[entries]
+            local_starts = np.flatnonzero(np.r_[True, entry_rows[1:] != entry_rows[:-1]]) if len(entries) else entries
+            arrays = {
+                'rows': rows[mine], 'seg_starts': starts,
+                'touched': entry_rows[local_starts], 'seg': seg[entries], 'weights': weights[entries],
+                'row_starts': local_starts, 'keep': keep[owner[touched] == s]
+            }
+            blocks = {name: SharedArray.copy_of(values) for name, values in arrays.items()}
+            self._plan_blocks.extend(blocks.values())
+            shard_plans.append((shard_seg[starts], {name: block.spec for name, block in blocks.items()}))
+        self._blocks.extend(self._plan_blocks)
+
+        indptr, indices = csr_arrays(manifold.G)
+        edge_rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        self.boundary_edges = int(np.count_nonzero(owner[edge_rows] != owner[indices])) // 2
+        self.shard_sizes = np.bincount(owner, minlength=self.num_shards)
+        self._shard_source = plan
+        self._shard_plans = shard_plans
+        return shard_plans
+
+    def _release(self, blocks: List[SharedArray]):
+        for block in blocks:
+            self._blocks.remove(block)
+            block.release()
+        if blocks is not self._blocks:
+            blocks.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Rows per shard and the edges crossing shards under the current partition."""
+        return {'shard_sizes': self.shard_sizes.tolist(), 'boundary_edges': self.boundary_edges}
+
+    def close(self):
+        """Stop the workers, hand the manifold private arrays and unlink shared memory."""
+        self._unshare()
+        self._plan_blocks.clear()
+        self._finalizer()
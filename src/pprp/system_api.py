@@ -1,13 +1,49 @@
+import networkx as nx
+import numpy as np
+from dataclasses import asdict
+from typing import Dict, List, Any, Optional
+
+from .cgos import CGOSSyscall, CoreMetric
+from .options import PPRIPOptions
+from .manifold import EnhancedSubstrateManifold
+from .core import EnhancedPiCore, EnhancedPhiCore, EnhancedOmegaCore, EnhancedBetaCore
+from .nodule import EnhancedPrimeNodule
+from .operators import EnhancedTransputation, EnhancedRealitySelection, EnhancedAwareness
+from .resonance_engine import PiPhiResonanceEngine
+from .metric_cache import MetricCache
+from .emergence_log import EmergenceLog
+from .encoding import InputEncoder
+from .nodule_executor import make_nodule_executor
+from .prime_mask import PrimeActivation
+
 class EnhancedCGOSSyscall(CGOSSyscall):
     """
     Enhanced version of CGOSSyscall with PPRIP capabilities.
     """
-    def __init__(self, options: Optional[PPRIPOptions] = None):
+    def __init__(self, options: Optional[PPRIPOptions] = None,
+                 rng: Optional[np.random.Generator] = None,
+                 manifold: Optional[EnhancedSubstrateManifold] = None):
         self.options = options or PPRIPOptions()
-        # Use enhanced manifold
-        self.M = EnhancedSubstrateManifold(self.options.initial_num_nodes, 4, self.options)
+        # Independent random stream for this system (see pprp.ensemble)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        # Use enhanced manifold (an existing one when restoring a checkpoint)
+        if manifold is None:
+            manifold = EnhancedSubstrateManifold(self.options.initial_num_nodes, 4, self.options, rng=self.rng)
+        self.M = manifold
         # Use enhanced nodules
         self.nodules = [EnhancedPrimeNodule(p) for p in self.M.primes]
+        if self.options.shards > 0:
+            # Shared memory and a process pool are only needed for sharded runs
+            from .sharding import ShardedNoduleExecutor
+            self.nodule_executor = ShardedNoduleExecutor(self.options.shards)
+        else:
+            self.nodule_executor = make_nodule_executor(self.options.nodule_mode)
+        # One resonance engine for all inputs; the input graph proxy never changes
+        self.resonance_engine = PiPhiResonanceEngine()
+        self._input_graph_metrics = None
+        # Successive inputs form one stream for φ-analysis
+        self.input_encoder = InputEncoder()
+        self.input_stream = self.resonance_engine.stream()
         # Use enhanced cores
         self.cores = [
             EnhancedPiCore(), 
@@ -15,88 +51,197 @@ class EnhancedCGOSSyscall(CGOSSyscall):
             EnhancedOmegaCore(), 
             EnhancedBetaCore()
         ]
+        # Each core is evaluated at most once per manifold version
+        self.metric_cache = MetricCache()
+        self.core_executor = None
+        if self.options.core_workers > 0:
+            from .core_executor import CoreExecutor
+            self.core_executor = CoreExecutor(self.options.core_workers)
         # Use enhanced operators
-        self.⟡ = EnhancedTransputation()
+        self.transputation = EnhancedTransputation()
         self.ℛ = EnhancedRealitySelection()
         self.Â = EnhancedAwareness()
         self.global_c = {
             'timestamp': 0, 
-            'prime_mask': 0b101010,  # 2,3,5 active
-            'emergence_history': []
+            'prime_mask': PrimeActivation.from_int(self.M.primes, 0b101010),  # 2,3,5 active
+            'emergence_history': EmergenceLog(capacity=self.options.emergence_capacity,
+                                              spill_path=self.options.emergence_spill_path)
         }
     
+    # Derived from the manifold on every step; not worth persisting
+    _TRANSIENT_CONTEXT = ('node_states', 'graph_info')
+    # Saved as arrays rather than in the JSON sidecar
+    _ARRAY_CONTEXT = ('emergence_history',)
+    
+    def save_checkpoint(self, path: str):
+        """
+        Save the system to the directory ``path``: node states and edges as
+        ``.npy`` arrays, options, ``global_c`` (prime mask, emergence history,
+        ...) and the random generator state in a JSON sidecar.
+        """
+        history = self.global_c['emergence_history']
+        arrays = self.M.checkpoint_arrays()
+        arrays.update({'emergence_' + k: v for k, v in history.to_arrays().items()})
+        meta = {
+            'options': asdict(self.options),
+            'emergence_insights': history.insights,
+            'emergence_total': history.total,
+            'prime_limit': self.M.primes[-1] if self.M.primes else 1,
+            'version': self.M.version,
+            'global_c': {k: (int(v) if k == 'prime_mask' else v) for k, v in self.global_c.items()
+                         if k not in self._TRANSIENT_CONTEXT + self._ARRAY_CONTEXT},
+            'rng_state': self.rng.bit_generator.state
+        }
+        from .checkpoint import write_checkpoint
+        write_checkpoint(path, arrays, meta)
+    
+    @classmethod
+    def load_checkpoint(cls, path: str, mmap: bool = True) -> "EnhancedCGOSSyscall":
+        """
+        Restore a system saved by ``save_checkpoint`` without regenerating the
+        manifold. With ``mmap`` the node states stay memory-mapped
+        copy-on-write, so loading is zero-copy and the files are never written.
+        The input φ stream starts afresh.
+        """
+        from .checkpoint import read_checkpoint
+        arrays, meta = read_checkpoint(path, mmap_mode='c' if mmap else None)
+        options = PPRIPOptions(**meta['options'])
+        rng_state = meta['rng_state']
+        rng = np.random.Generator(getattr(np.random, rng_state['bit_generator'])())
+        rng.bit_generator.state = rng_state
+        csr = (arrays['csr_indptr'], arrays['csr_indices']) if 'csr_indptr' in arrays else None
+        M = EnhancedSubstrateManifold.from_arrays(
+            arrays['node_states'], arrays['edges'], options, nodes=arrays.get('nodes'),
+            prime_limit=meta['prime_limit'], rng=rng, csr=csr)
+        M.version = meta['version']
+        syscall = cls(options, rng=rng, manifold=M)
+        syscall.global_c.update(meta['global_c'])
+        syscall.global_c['prime_mask'] = PrimeActivation.from_int(M.primes, meta['global_c']['prime_mask'])
+        syscall.global_c['emergence_history'].close()
+        syscall.global_c['emergence_history'] = EmergenceLog.from_arrays(
+            arrays['emergence_timestamps'], arrays['emergence_codes'], arrays['emergence_metrics'],
+            meta['emergence_insights'], capacity=options.emergence_capacity,
+            spill_path=options.emergence_spill_path, total=meta.get('emergence_total'))
+        return syscall
+    
     def process_input(self, input_data: Any) -> Dict[str, Any]:
         """Process input data using PPRIP methodology."""
-        # Convert input to a numerical stream
-        if isinstance(input_data, (int, float)):
-            data_stream = [float(input_data)]
-        elif isinstance(input_data, str):
-            # Simple hash-based conversion
-            data_stream = [float(hash(input_data)) / (2**63)]  # Normalize hash
-        else:
-            data_stream = [1.0]  # Default
+        # Convert input to a numerical stream and analyze it for resonance, chunk by chunk
+        for chunk in self.input_encoder.chunks(input_data):
+            self.input_stream.update(chunk)
+        input_resonance_metrics = {'dev_phi_data': self.input_stream.dev_phi()}
+        input_resonance_metrics['input_dev_pi'] = self._input_graph_resonance()
         
-        # Analyze input for resonance
-        resonance_engine = PiPhiResonanceEngine()
-        input_resonance_metrics = resonance_engine.analyze_data_stream(data_stream)
+        insight = self._step(input_resonance_metrics)
         
-        # For graph analysis, we need a proxy
-        input_graph_proxy = nx.path_graph(5)  # Dummy graph for input analysis
-        input_resonance_metrics.update(resonance_engine.analyze_graph(input_graph_proxy))
-        input_resonance_metrics['input_dev_pi'] = input_resonance_metrics.pop('dev_pi_graph', float('inf'))
+        # Package output
+        return {
+            'input_data': input_data,
+            'input_resonance_metrics': input_resonance_metrics,
+            'system_metrics': {m.axiom_id: m.value for m in self._evaluate_cores()},
+            'graph_info': self.global_c['graph_info'],
+            'emergence_detected': insight is not None,
+            'insight': insight
+        }
+    
+    def process_batch(self, inputs: List[Any]) -> Dict[str, Any]:
+        """
+        Process many inputs in order, returning columnar results: one array
+        per metric instead of one dict per input. Input encoding and input
+        resonance analysis are done for the whole batch up front; the
+        manifold is still stepped once per input.
+        """
+        n = len(inputs)
+        values, lengths = self.input_encoder.encode_batch(inputs)
+        dev_phi = self.input_stream.update_segments(values, lengths)
+        input_dev_pi = self._input_graph_resonance()
         
+        system_metrics = {c_id: np.empty(n) for c_id in self._core_ids()}
+        emergence = np.zeros(n, dtype=bool)
+        insights = np.full(n, None, dtype=object)
+        timestamps = np.empty(n, dtype=np.int64)
+        for i in range(n):
+            insight = self._step({'dev_phi_data': dev_phi[i], 'input_dev_pi': input_dev_pi})
+            for m in self._evaluate_cores():
+                system_metrics[m.axiom_id][i] = m.value
+            emergence[i] = insight is not None
+            insights[i] = insight
+            timestamps[i] = self.global_c['timestamp']
+        
+        return {
+            'input_resonance_metrics': {
+                'dev_phi_data': dev_phi,
+                'input_dev_pi': np.full(n, input_dev_pi)
+            },
+            'system_metrics': system_metrics,
+            'emergence_detected': emergence,
+            'insight': insights,
+            'timestamp': timestamps
+        }
+    
+    def _input_graph_resonance(self) -> float:
+        """π-deviation of the (constant) input graph proxy, computed once."""
+        if self._input_graph_metrics is None:
+            input_graph_proxy = nx.path_graph(5)  # Dummy graph for input analysis
+            self._input_graph_metrics = self.resonance_engine.analyze_graph(input_graph_proxy)
+        return self._input_graph_metrics.get('dev_pi_graph', float('inf'))
+    
+    def _step(self, input_resonance_metrics: Dict[str, float]) -> Optional[str]:
+        """Advance the manifold by one input; returns the emergence insight, if any."""
         # Run ψₚ processing
-        for p, psi_unit in self.nodules.items():
-            psi_unit.step(self.M, self.global_c)
+        self.nodule_executor.run(self.nodules, self.M, self.global_c)
         
         # Monitor system state
-        omega_metric = self.cores[2](self.M)  # OmegaCore
-        beta_metric = self.cores[3](self.M)   # BetaCore
+        omega_metric = self.metric_cache.get(self.cores[2], self.M)  # OmegaCore
+        beta_metric = self.metric_cache.get(self.cores[3], self.M)   # BetaCore
         
         # Check for emergence
-        insight = self.⟡(omega_metric, beta_metric, self.options)
+        insight = self.transputation(omega_metric, beta_metric, self.options)
         if insight:
-            self.global_c['emergence_history'].append({
-                'timestamp': self.global_c['timestamp'],
-                'insight': insight,
-                'metrics': {m.axiom_id: m.value for m in [c(self.M) for c in self.cores]}
-            })
+            self.global_c['emergence_history'].record(
+                self.global_c['timestamp'], insight,
+                {m.axiom_id: m.value for m in self._evaluate_cores()})
         
         # Adjust system based on metrics
         self._adjust_system(input_resonance_metrics)
         
         # Update awareness
-        self.Â(self.global_c, [c(self.M) for c in self.cores], self.M)
-        
-        # Package output
-        return {
-            'input_data': input_data,
-            'input_resonance_metrics': input_resonance_metrics,
-            'system_metrics': {m.axiom_id: m.value for m in [c(self.M) for c in self.cores]},
-            'graph_info': self.global_c['graph_info'],
-            'emergence_detected': insight is not None,
-            'insight': insight
-        }
+        self.Â(self.global_c, self._evaluate_cores(), self.M)
+        return insight
+    
+    def _core_ids(self) -> List[str]:
+        """Axiom ids of the cores, in core order."""
+        return [m.axiom_id for m in self._evaluate_cores()]
+    
+    def _evaluate_cores(self) -> List[CoreMetric]:
+        """Evaluate all cores on the current manifold version."""
+        return self.metric_cache.evaluate(self.cores, self.M, self.core_executor)
+    
+    def get_metric_cache_stats(self) -> Dict[str, float]:
+        """Hit/miss counters for the per-version core metric cache."""
+        return self.metric_cache.stats()
+    
+    def get_core_latencies(self) -> Dict[str, float]:
+        """Wall time of each core's last concurrent evaluation (empty without ``core_workers``)."""
+        return dict(self.core_executor.latencies) if self.core_executor is not None else {}
+    
+    def close(self):
+        """Release worker threads and processes, shared memory and the emergence spill file."""
+        if self.core_executor is not None:
+            self.core_executor.close()
+        if self.options.shards > 0:
+            self.nodule_executor.close()
+        self.global_c['emergence_history'].close()
     
     def _adjust_system(self, input_resonance_metrics: Dict[str, float]):
         """Adjust system based on input and system resonance metrics."""
         # Get current system metrics
-        system_metrics = {m.axiom_id: m.value for m in [c(self.M) for c in self.cores]}
+        system_metrics = {m.axiom_id: m.value for m in self._evaluate_cores()}
         
         # If Ω is low, inject noise
         if system_metrics['Ω'] < self.options.thresh_omega:
-            for i in range(len(self.M.node_states)):
-                self.M.node_states[i] += np.random.normal(0, 0.01, size=self.M.node_states[i].shape)
+            self.M.inject_noise(0.01)
         
         # If β₁ is 0, add a simple edge to create a cycle
         if system_metrics['β'] < self.options.thresh_beta1 and len(self.M.G.nodes()) > 1:
-            nodes = list(self.M.G.nodes())
-            # Find two nodes not connected
-            for i in range(len(nodes)):
-                for j in range(i+1, len(nodes)):
-                    if not self.M.G.has_edge(nodes[i], nodes[j]):
-                        self.M.G.add_edge(nodes[i], nodes[j])
-                        break
-                else:
-                    continue
-                break
+            self.M.repair_edge()
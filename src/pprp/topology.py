@@ -0,0 +1,400 @@
+import numpy as np
+from typing import Dict, List, Any, Tuple, Optional, Hashable, Sequence
+
+from .graph_backend import CSRGraph
+from .sampling import csr_arrays, bfs_forest
+
+class TopologyTracker:
+    """
+    Incrementally maintained β₁ and fundamental cycle basis.
+
+    Keeps a union-find over the nodes plus a rooted spanning forest. An edge
+    joining two trees becomes a forest edge; an edge inside a tree closes
+    exactly one new fundamental cycle (the tree path between its endpoints
+    plus the edge itself), so β₁ = E − V + C is updated in O(1) and the
+    basis grows by one cycle per added edge.
+    """
+    def __init__(self):
+        self.num_nodes = 0
+        self.num_edges = 0
+        self.num_components = 0
+        self.cycles: List[List[Hashable]] = []
+        # Multiset of basis cycle lengths: length -> number of cycles
+        self.length_counts: Dict[int, int] = {}
+        self._uf_parent: Dict[Hashable, Hashable] = {}
+        self._uf_size: Dict[Hashable, int] = {}
+        self._tree_parent: Dict[Hashable, Optional[Hashable]] = {}
+        self._tree_adj: Dict[Hashable, set] = {}
+        self._depth: Dict[Hashable, int] = {}
+
+    @classmethod
+    def from_graph(cls, G) -> "TopologyTracker":
+        """Build a tracker from any graph exposing ``nodes()`` and ``edges()``."""
+        tracker = cls()
+        for node in G.nodes():
+            tracker.add_node(node)
+        for u, v in G.edges():
+            tracker.add_edge(u, v)
+        return tracker
+
+    @property
+    def beta1(self) -> int:
+        """First Betti number: number of independent cycles."""
+        return self.num_edges - self.num_nodes + self.num_components
+
+    def matches(self, G) -> bool:
+        """Staleness check against the graph's node and edge counts."""
+        return G.number_of_nodes() == self.num_nodes and G.number_of_edges() == self.num_edges
+
+    def find(self, node: Hashable) -> Hashable:
+        """Union-find root of ``node``'s component."""
+        root = node
+        while self._uf_parent[root] != root:
+            root = self._uf_parent[root]
+        while self._uf_parent[node] != root:
+            self._uf_parent[node], node = root, self._uf_parent[node]
+        return root
+
+    def connected(self, u: Hashable, v: Hashable) -> bool:
+        """Whether ``u`` and ``v`` lie in the same component."""
+        return self.find(u) == self.find(v)
+
+    def add_node(self, node: Hashable):
+        """Register an isolated node (no-op if already known)."""
+        if node in self._uf_parent:
+            return
+        self._uf_parent[node] = node
+        self._uf_size[node] = 1
+        self._tree_parent[node] = None
+        self._tree_adj[node] = set()
+        self._depth[node] = 0
+        self.num_nodes += 1
+        self.num_components += 1
+
+    def add_edge(self, u: Hashable, v: Hashable) -> Optional[List[Hashable]]:
+        """
+        Register a new edge. Returns the fundamental cycle it closes, or None
+        if it merged two components. The caller guarantees the edge is new.
+        """
+        self.add_node(u)
+        self.add_node(v)
+        self.num_edges += 1
+        ru, rv = self.find(u), self.find(v)
+        if ru != rv:
+            # Hang the smaller tree off the larger one
+            if self._uf_size[ru] < self._uf_size[rv]:
+                u, v, ru, rv = v, u, rv, ru
+            self._reroot(v)
+            self._tree_parent[v] = u
+            self._tree_adj[u].add(v)
+            self._tree_adj[v].add(u)
+            self._set_depths(v, self._depth[u] + 1)
+            self._uf_parent[rv] = ru
+            self._uf_size[ru] += self._uf_size[rv]
+            self.num_components -= 1
+            return None
+        cycle = self._tree_path(u, v)
+        self.cycles.append(cycle)
+        self.length_counts[len(cycle)] = self.length_counts.get(len(cycle), 0) + 1
+        return cycle
+
+    def cycle_length_histogram(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Distinct basis cycle lengths (ascending) and how many cycles have each."""
+        lengths = np.fromiter(sorted(self.length_counts), dtype=np.int64, count=len(self.length_counts))
+        counts = np.fromiter((self.length_counts[L] for L in lengths.tolist()), dtype=np.int64,
+                             count=len(lengths))
+        return lengths, counts
+
+    def _tree_path(self, u: Hashable, v: Hashable) -> List[Hashable]:
+        """Forest path from ``u`` to ``v`` through their lowest common ancestor."""
+        left, right = [u], [v]
+        while self._depth[u] > self._depth[v]:
+            u = self._tree_parent[u]
+            left.append(u)
+        while self._depth[v] > self._depth[u]:
+            v = self._tree_parent[v]
+            right.append(v)
+        while u != v:
+            u = self._tree_parent[u]
+            v = self._tree_parent[v]
+            left.append(u)
+            right.append(v)
+        right.pop()  # the common ancestor is already in ``left``
+        return left + right[::-1]
+
+    def _reroot(self, node: Hashable):
+        """Make ``node`` the root of its tree by reversing parent pointers."""
+        prev = None
+        while node is not None:
+            nxt = self._tree_parent[node]
+            self._tree_parent[node] = prev
+            prev, node = node, nxt
+
+    def _set_depths(self, root: Hashable, depth: int):
+        """Recompute depths over the subtree hanging from ``root``."""
+        self._depth[root] = depth
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            for child in self._tree_adj[node]:
+                if child != self._tree_parent[node]:
+                    self._depth[child] = self._depth[node] + 1
+                    stack.append(child)
+
+
+class _CycleBasisView(Sequence):
+    """Read-only list of the basis cycles stored flat in an ``ArrayTopologyTracker``."""
+    def __init__(self, tracker: "ArrayTopologyTracker"):
+        self._tracker = tracker
+
+    def __len__(self) -> int:
+        return self._tracker.num_cycles
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("cycle index out of range")
+        t = self._tracker
+        return t._cycle_nodes[t._cycle_offsets[index]:t._cycle_offsets[index + 1]].tolist()
+
+
+def _grown(array: np.ndarray, size: int, fill: int = 0) -> np.ndarray:
+    """``array`` with room for at least ``size`` entries, doubling its capacity."""
+    if size <= len(array):
+        return array
+    grown = np.full(max(size, 2 * len(array)), fill, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class ArrayTopologyTracker(TopologyTracker):
+    """
+    TopologyTracker for graphs on dense node ids 0..n-1 (the CSR backend).
+
+    The union-find, spanning forest and depths are int arrays indexed by
+    node, forest adjacency is a linked list over edge slots, and the cycle
+    basis is one flat node array cut by offsets, so memory stays a few
+    machine words per node and per cycle entry. ``from_graph`` builds the
+    forest and basis with array operations (BFS forest, vectorized tree
+    paths); edges and nodes added later are tracked incrementally, as in
+    ``TopologyTracker``. Roots have tree parent -1.
+    """
+    def __init__(self, capacity: int = 0):
+        self.num_nodes = 0
+        self.num_edges = 0
+        self.num_components = 0
+        self.num_cycles = 0
+        self.length_counts: Dict[int, int] = {}
+        self._uf_parent = np.zeros(capacity, dtype=np.int64)
+        self._uf_size = np.zeros(capacity, dtype=np.int64)
+        self._tree_parent = np.full(capacity, -1, dtype=np.int64)
+        self._depth = np.zeros(capacity, dtype=np.int64)
+        # Forest adjacency: first slot per node, next slot per slot, neighbor per slot
+        self._adj_head = np.full(capacity, -1, dtype=np.int64)
+        self._adj_next = np.zeros(0, dtype=np.int64)
+        self._adj_to = np.zeros(0, dtype=np.int64)
+        self._num_slots = 0
+        self._cycle_nodes = np.zeros(0, dtype=np.int64)
+        self._cycle_offsets = np.zeros(1, dtype=np.int64)
+
+    @classmethod
+    def from_graph(cls, G) -> "ArrayTopologyTracker":
+        """Build from a graph whose nodes are 0..n-1, with array operations throughout."""
+        indptr, indices = csr_arrays(G)
+        n = len(indptr) - 1
+        parent, depth = bfs_forest(indptr, indices)
+        tracker = cls(n)
+        tracker.num_nodes = n
+        tracker.num_edges = G.number_of_edges()
+        # Union-find: every node points straight at its tree's root
+        root = np.where(parent < 0, np.arange(n, dtype=np.int64), parent)
+        while True:
+            jumped = root[root]
+            if np.array_equal(jumped, root):
+                break
+            root = jumped
+        tracker.num_components = int(np.count_nonzero(parent < 0))
+        tracker._uf_parent[:] = root
+        tracker._uf_size[:] = np.bincount(root, minlength=n)
+        tracker._tree_parent[:] = parent
+        tracker._depth[:] = depth
+
+        # Both directions of every forest edge, chained per node in slot order
+        child = np.flatnonzero(parent >= 0)
+        ends = np.concatenate([child, parent[child]])
+        order = np.argsort(ends, kind='stable')
+        ends = ends[order]
+        m = len(ends)
+        tracker._adj_to = np.concatenate([parent[child], child])[order]
+        tracker._adj_next = np.full(m, -1, dtype=np.int64)
+        same = np.flatnonzero(ends[1:] == ends[:-1])
+        tracker._adj_next[same] = same + 1
+        first = np.flatnonzero(np.r_[True, ends[1:] != ends[:-1]]) if m else np.zeros(0, dtype=np.int64)
+        tracker._adj_head[ends[first]] = first
+        tracker._num_slots = m
+
+        # Every non-tree edge closes one fundamental cycle
+        rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr))
+        cols = indices.astype(np.int64)
+        upper = rows <= cols
+        u, v = rows[upper], cols[upper]
+        non_tree = (parent[v] != u) & (parent[u] != v)
+        tracker._set_basis(*_tree_paths(parent, depth, u[non_tree], v[non_tree]))
+        return tracker
+
+    @property
+    def cycles(self) -> Sequence[List[int]]:
+        """Basis cycles as node lists, read from the flat arrays on access."""
+        return _CycleBasisView(self)
+
+    def add_node(self, node: int):
+        """Register ``node`` and any lower ids not yet known, as isolated nodes."""
+        node = int(node)
+        if node < self.num_nodes:
+            return
+        lo, hi = self.num_nodes, node + 1
+        self._uf_parent = _grown(self._uf_parent, hi)
+        self._uf_size = _grown(self._uf_size, hi)
+        self._tree_parent = _grown(self._tree_parent, hi, -1)
+        self._depth = _grown(self._depth, hi)
+        self._adj_head = _grown(self._adj_head, hi, -1)
+        self._uf_parent[lo:hi] = np.arange(lo, hi)
+        self._uf_size[lo:hi] = 1
+        self._tree_parent[lo:hi] = -1
+        self._depth[lo:hi] = 0
+        self._adj_head[lo:hi] = -1
+        self.num_nodes = hi
+        self.num_components += hi - lo
+
+    def find(self, node: int) -> int:
+        """Union-find root of ``node``'s component."""
+        return int(super().find(int(node)))
+
+    def add_edge(self, u: int, v: int) -> Optional[List[int]]:
+        """
+        Register a new edge. Returns the fundamental cycle it closes, or None
+        if it merged two components. The caller guarantees the edge is new.
+        """
+        u, v = int(u), int(v)
+        self.add_node(max(u, v))
+        self.num_edges += 1
+        ru, rv = self.find(u), self.find(v)
+        if ru != rv:
+            # Hang the smaller tree off the larger one
+            if self._uf_size[ru] < self._uf_size[rv]:
+                u, v, ru, rv = v, u, rv, ru
+            self._reroot(v)
+            self._tree_parent[v] = u
+            self._link(u, v)
+            self._link(v, u)
+            self._set_depths(v, int(self._depth[u]) + 1)
+            self._uf_parent[rv] = ru
+            self._uf_size[ru] += self._uf_size[rv]
+            self.num_components -= 1
+            return None
+        cycle = [int(node) for node in self._tree_path(u, v)]
+        self._set_basis(np.asarray(cycle, dtype=np.int64), np.array([0, len(cycle)], dtype=np.int64))
+        return cycle
+
+    def nbytes(self) -> int:
+        """Memory held by the tracker's arrays."""
+        return sum(a.nbytes for a in (self._uf_parent, self._uf_size, self._tree_parent, self._depth,
+                                      self._adj_head, self._adj_next, self._adj_to,
+                                      self._cycle_nodes, self._cycle_offsets))
+
+    def _set_basis(self, nodes: np.ndarray, offsets: np.ndarray):
+        """Append cycles given flat (``nodes`` cut by ``offsets``) to the basis."""
+        count = len(offsets) - 1
+        if count == 0:
+            return
+        start = int(self._cycle_offsets[self.num_cycles])
+        self._cycle_nodes = _grown(self._cycle_nodes, start + len(nodes))
+        self._cycle_nodes[start:start + len(nodes)] = nodes
+        self._cycle_offsets = _grown(self._cycle_offsets, self.num_cycles + count + 1)
+        self._cycle_offsets[self.num_cycles + 1:self.num_cycles + count + 1] = offsets[1:] + start
+        self.num_cycles += count
+        lengths = np.bincount(np.diff(offsets))
+        for L in np.flatnonzero(lengths).tolist():
+            self.length_counts[L] = self.length_counts.get(L, 0) + int(lengths[L])
+
+    def _link(self, u: int, v: int):
+        """Add ``v`` to ``u``'s forest adjacency."""
+        slot = self._num_slots
+        self._adj_next = _grown(self._adj_next, slot + 1)
+        self._adj_to = _grown(self._adj_to, slot + 1)
+        self._adj_next[slot] = self._adj_head[u]
+        self._adj_to[slot] = v
+        self._adj_head[u] = slot
+        self._num_slots += 1
+
+    def _reroot(self, node: int):
+        """Make ``node`` the root of its tree by reversing parent pointers."""
+        prev = -1
+        while node >= 0:
+            nxt = int(self._tree_parent[node])
+            self._tree_parent[node] = prev
+            prev, node = node, nxt
+
+    def _set_depths(self, root: int, depth: int):
+        """Recompute depths over the subtree hanging from ``root``."""
+        self._depth[root] = depth
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            parent, child_depth = self._tree_parent[node], self._depth[node] + 1
+            slot = int(self._adj_head[node])
+            while slot >= 0:
+                child = int(self._adj_to[slot])
+                if child != parent:
+                    self._depth[child] = child_depth
+                    stack.append(child)
+                slot = int(self._adj_next[slot])
+
+
+def _tree_paths(parent: np.ndarray, depth: np.ndarray, u: np.ndarray,
+                v: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fundamental cycles of the non-tree edges (u, v) over a forest, flat:
+    cycle i is u → lca → v, stored in ``nodes[offsets[i]:offsets[i+1]]``.
+    Both endpoints climb one level per round, all cycles at once.
+    """
+    k = len(u)
+    a, b = u.copy(), v.copy()
+    left_len = np.ones(k, dtype=np.int64)
+    right_len = np.ones(k, dtype=np.int64)
+    # (cycle, step, node) along each side; step 0 is the endpoint itself
+    left = [(np.arange(k), np.zeros(k, dtype=np.int64), a.copy())]
+    right = [(np.arange(k), np.zeros(k, dtype=np.int64), b.copy())]
+    active = np.arange(k)
+    while len(active):
+        da, db = depth[a[active]], depth[b[active]]
+        level = (da == db) & (a[active] != b[active])
+        climb_a, climb_b = active[(da > db) | level], active[(db > da) | level]
+        for ends, lens, side, climbing in ((a, left_len, left, climb_a), (b, right_len, right, climb_b)):
+            ends[climbing] = parent[ends[climbing]]
+            side.append((climbing, lens[climbing].copy(), ends[climbing]))
+            lens[climbing] += 1
+        active = active[a[active] != b[active]]
+    lengths = left_len + right_len - 1
+    offsets = np.zeros(k + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    nodes = np.empty(offsets[-1], dtype=np.int64)
+    for cycle, step, node in left:
+        nodes[offsets[cycle] + step] = node
+    for cycle, step, node in right:
+        # The right side runs v → lca; the lca is already on the left
+        keep = step < right_len[cycle] - 1
+        cycle, step, node = cycle[keep], step[keep], node[keep]
+        nodes[offsets[cycle] + lengths[cycle] - 1 - step] = node
+    return nodes, offsets
+
+
+def make_topology_tracker(G) -> TopologyTracker:
+    """Tracker for G: array-backed for the CSR backend, dict-backed otherwise."""
+    if isinstance(G, CSRGraph):
+        return ArrayTopologyTracker.from_graph(G)
+    return TopologyTracker.from_graph(G)
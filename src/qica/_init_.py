@@ -5,18 +5,38 @@ Framework for simulating emergent computation through dynamic thresholds
 and self-referential processing.
 """
 
+from typing import TYPE_CHECKING
+
+from core.lazy import lazy_attributes
+
 __version__ = "0.1.0"
 
-from .engine import EnhancedQICAEngine
-from .field import EnhancedConsciousnessField
-from .constants import EnhancedConsciousnessConstants
-from .states import EnhancedConsciousnessState
-from .memory import ConsciousnessMemory
-from .self_reference import SelfReferenceEngine
-from .threshold_controller import DynamicThresholdController
+# Public name -> defining module, imported on first access
+_LAZY_ATTRS = {
+    'EnhancedQICAEngine': '.engine',
+    'EnhancedConsciousnessField': '.field',
+    'EnhancedConsciousnessConstants': '.constants',
+    'EnhancedConsciousnessState': '.states',
+    'ConsciousnessMemory': '.memory',
+    'SelfReferenceEngine': '.self_reference',
+    'DynamicThresholdController': '.threshold_controller',
+}
+
+if TYPE_CHECKING:
+    from .engine import EnhancedQICAEngine
+    from .field import EnhancedConsciousnessField
+    from .constants import EnhancedConsciousnessConstants
+    from .states import EnhancedConsciousnessState
+    from .memory import ConsciousnessMemory
+    from .self_reference import SelfReferenceEngine
+    from .threshold_controller import DynamicThresholdController
 
 __all__ = [
     'EnhancedQICAEngine', 'EnhancedConsciousnessField', 'EnhancedConsciousnessConstants',
     'EnhancedConsciousnessState', 'ConsciousnessMemory', 'SelfReferenceEngine',
     'DynamicThresholdController'
 ]
+
+
+# PEP 562: imported on first access, then cached on the package
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRS, __all__)
@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 import unittest
 import numpy as np
+import networkx as nx
 from pprp.options import PPRIPOptions
 from pprp.system_api import EnhancedCGOSSyscall
 
@@ -63,6 +64,60 @@ class TestPPRP(unittest.TestCase):
             self.assertEqual(len(state), 4)  # 4D state vectors
             self.assertTrue(all(isinstance(x, (int, float)) for x in state))
     
+    def test_state_array_views(self):
+        """Test node states are row views into the contiguous state array."""
+        M = self.syscall.M
+        self.assertEqual(M.state_array.shape, (M.G.number_of_nodes(), 4))
+        M.node_states[0][:] = 0.25
+        np.testing.assert_array_equal(M.state_array[0], np.full(4, 0.25))
+        M.inject_noise(0.01)
+        self.assertIs(M.node_states[0].base, M.state_array)
+        # Assigning a row writes through and invalidates the running moments
+        M.moments()
+        version = M.version
+        M.node_states[1] = np.full(4, 0.5)
+        np.testing.assert_array_equal(M.state_array[1], np.full(4, 0.5))
+        self.assertGreater(M.version, version)
+        self.assertAlmostEqual(M.state_variance(), float(np.var(M.state_array)))
+        np.testing.assert_array_equal(np.asarray(M.node_states), M.state_array)
+    
+    def test_topology_tracker(self):
+        """Test incremental β₁ and cycle basis track networkx."""
+        M = self.syscall.M
+        self.assertEqual(M.get_topology().beta1, len(nx.cycle_basis(M.G)))
+        u, v = next((u, v) for u in M.G for v in M.G if u != v and not M.G.has_edge(u, v))
+        self.assertTrue(M.add_edge(u, v))
+        self.assertFalse(M.add_edge(u, v))
+        self.assertEqual(M.get_topology().beta1, len(nx.cycle_basis(M.G)))
+        cycle = M.cycle_basis()[-1]
+        for a, b in zip(cycle, cycle[1:] + cycle[:1]):
+            self.assertTrue(M.G.has_edge(a, b))
+        # The β and Ω cores read β₁ from the tracker
+        components = nx.number_connected_components(M.G)
+        self.assertEqual(M.betti1(), M.G.number_of_edges() - M.G.number_of_nodes() + components)
+        self.assertEqual(M.omega_complexity(), M.betti1() / M.G.number_of_nodes())
+        # Edges added behind the tracker's back are noticed after mark_modified
+        tracker = M.get_topology()
+        u, v = next((u, v) for u in M.G for v in M.G if u != v and not M.G.has_edge(u, v))
+        M.G.add_edge(u, v)
+        M.mark_modified(states=False)
+        self.assertIsNot(M.get_topology(), tracker)
+        self.assertEqual(M.get_topology().beta1, len(nx.cycle_basis(M.G)))
+    
+    def test_metric_cache(self):
+        """Test cores are evaluated once per manifold version."""
+        first = self.syscall._evaluate_cores()
+        second = self.syscall._evaluate_cores()
+        self.assertEqual([m.value for m in first], [m.value for m in second])
+        stats = self.syscall.get_metric_cache_stats()
+        self.assertEqual(stats['misses'], 4)
+        self.assertEqual(stats['hits'], 4)
+        version = self.syscall.M.version
+        self.syscall.M.inject_noise(0.01)
+        self.assertGreater(self.syscall.M.version, version)
+        self.syscall._evaluate_cores()
+        self.assertEqual(self.syscall.get_metric_cache_stats()['misses'], 8)
+    
     def test_process_numeric_input(self):
         """Test processing numeric input."""
         result = self.syscall.process_input(3.14159)
@@ -115,6 +170,688 @@ class TestPPRP(unittest.TestCase):
             self.assertIsInstance(nodes, list)
             for node in nodes:
                 self.assertIsInstance(node, int)
+    
+    def test_prime_incidence(self):
+        """Test the CSR incidence index matches index-modulo-p assignment."""
+        M = self.syscall.M
+        expected = {p: [n for i, n in enumerate(M.G.nodes()) if i % p == 0] for p in M.primes}
+        self.assertEqual(M.assign_nodes_to_primes(), expected)
+        incidence = M.prime_incidence()
+        self.assertIs(M.prime_incidence(), incidence)
+        M.add_node(max(M.G.nodes()) + 1)
+        self.assertIsNot(M.prime_incidence(), incidence)
+        self.assertEqual(M.state_array.shape[0], M.G.number_of_nodes())
+    
+    def test_fused_nodule_executor(self):
+        """Test the fused ψₚ layer composes blends in prime order over step-start means."""
+        syscall = EnhancedCGOSSyscall(PPRIPOptions(initial_num_nodes=10, nodule_mode="fused"))
+        M = syscall.M
+        start = M.state_array.copy()
+        expected = start.copy()
+        incidence = M.prime_incidence()
+        for psi_unit in syscall.nodules:
+            rows = incidence.rows(psi_unit.p)
+            expected[rows] = 0.5 * (expected[rows] + psi_unit.process(start[rows]))
+        syscall.nodule_executor.run(syscall.nodules, M, syscall.global_c)
+        np.testing.assert_allclose(M.state_array, expected)
+        self.assertIn('processed_state', syscall.nodules[0].state)
+    
+    def test_process_batch(self):
+        """Test batch processing returns columnar results."""
+        result = self.syscall.process_batch([1.0, 2, "test string", None])
+        self.assertEqual(len(result['emergence_detected']), 4)
+        self.assertEqual(result['emergence_detected'].dtype, bool)
+        for axiom_id in ('π', 'φ', 'Ω', 'β'):
+            self.assertEqual(result['system_metrics'][axiom_id].shape, (4,))
+        self.assertEqual(list(result['timestamp']), [1, 2, 3, 4])
+        
+        # A 2-D array is one input per row
+        rows = np.arange(6.0).reshape(3, 2)
+        values, lengths = self.syscall.input_encoder.encode_batch(rows)
+        self.assertEqual(lengths.tolist(), [2, 2, 2])
+        self.assertEqual(len(self.syscall.process_batch(rows)['emergence_detected']), 3)
+    
+    def test_analyze_data_streams(self):
+        """Test vectorized stream analysis matches the per-stream version."""
+        from pprp.resonance_engine import PiPhiResonanceEngine
+        engine = PiPhiResonanceEngine()
+        streams = [[1.0, 2.0, 3.0], [], [4.0], [0.0, 5.0, 1.0]]
+        packed = engine.analyze_data_streams(
+            [v for s in streams for v in s], [len(s) for s in streams])['dev_phi_data']
+        for stream, dev in zip(streams, packed):
+            self.assertAlmostEqual(engine.analyze_data_stream(stream)['dev_phi_data'], dev)
+    
+    def test_streaming_phi_analyzer(self):
+        """Test chunked streaming φ-analysis matches whole-stream analysis."""
+        from pprp.resonance_engine import PiPhiResonanceEngine
+        engine = PiPhiResonanceEngine()
+        data = np.random.default_rng(0).random(1000)
+        stream = engine.stream(window=50)
+        for chunk in np.array_split(data, 7):
+            stream.update(chunk)
+        stream.update(iter([]))
+        self.assertAlmostEqual(stream.dev_phi(), engine.analyze_data_stream(data)['dev_phi_data'])
+        cumsum = np.cumsum(data)
+        rates = cumsum[1:] / cumsum[:-1]
+        result = stream.result()
+        self.assertEqual(result['count'], 1000)
+        self.assertAlmostEqual(result['growth_rate_mean'], rates.mean())
+        self.assertAlmostEqual(result['window_growth_rate_max'], rates[-50:].max())
+    
+    def test_input_stream_phi(self):
+        """Test successive inputs feed one φ stream."""
+        self.assertEqual(self.syscall.process_input(1.0)['input_resonance_metrics']['dev_phi_data'], float('inf'))
+        dev = self.syscall.process_input(2.0)['input_resonance_metrics']['dev_phi_data']
+        self.assertAlmostEqual(dev, abs(3.0 / 1.0 - (1 + 5 ** 0.5) / 2))
+    
+    def test_pi_deviation_spectrum(self):
+        """Test the cycle-length histogram spectrum matches a per-cycle scan."""
+        M = self.syscall.M
+        lengths = sorted({len(c) for c in M.cycle_basis()})
+        spectrum = M.pi_deviation_spectrum()
+        self.assertEqual(list(spectrum['length']), lengths)
+        self.assertEqual(spectrum['count'].sum(), M.get_topology().beta1)
+        expected = [abs(L - 2 * np.pi * round(L / (2 * np.pi))) for L in lengths]
+        np.testing.assert_allclose(spectrum['deviation'], expected)
+        # The π core scores distinct lengths; a scan over every basis cycle agrees
+        from pprp.cgos import SubstrateManifold
+        from pprp.core import EnhancedPiCore
+        cycles = SubstrateManifold.pi_resonant_cycles(M)
+        self.assertEqual(M.pi_resonant_cycles(), sorted(cycles))
+        best = min(abs(hr - 1.0) for _, hr in cycles)
+        metric = EnhancedPiCore()(M)
+        self.assertAlmostEqual(metric.value, (best + min(expected)) / 2)
+        self.assertTrue(metric.exact)
+        self.assertIsNone(metric.confidence_interval)
+    
+    def test_csr_graph_backend(self):
+        """Test the CSR backend agrees with networkx and drives the system."""
+        from pprp.graph_backend import CSRGraph
+        G = nx.gnm_random_graph(20, 40, seed=1)
+        csr = CSRGraph.from_networkx(G)
+        for u, v in [(0, 19), (3, 3), (5, 6)]:
+            G.add_edge(u, v)
+            csr.add_edge(u, v)
+        self.assertEqual(csr.number_of_edges(), G.number_of_edges())
+        self.assertEqual(sorted(csr.edges()), sorted(tuple(sorted(e)) for e in G.edges()))
+        csr.compact()
+        for u in G:
+            self.assertEqual(sorted(csr.neighbors(u).tolist()), sorted(G.neighbors(u)))
+        self.assertEqual(csr.number_connected_components(), nx.number_connected_components(G))
+        
+        syscall = EnhancedCGOSSyscall(PPRIPOptions(initial_num_nodes=10, graph_backend="csr"))
+        self.assertIsInstance(syscall.M.G, CSRGraph)
+        result = syscall.process_input(1.0)
+        self.assertEqual(result['graph_info']['num_edges'], syscall.M.G.number_of_edges())
+        # Compaction keeps every row sorted
+        for u, v in [(1, 7), (7, 2), (0, 0)]:
+            csr.add_edge(u, v)
+        csr.compact()
+        for u in csr:
+            row = csr.neighbors(u)
+            self.assertTrue((np.diff(row) > 0).all())
+        # Removal is refused before the manifold changes anything
+        edges, delta = syscall.M.G.number_of_edges(), syscall.M.drain_topology_delta()
+        with self.assertRaises(NotImplementedError):
+            syscall.M.remove_node(0)
+        self.assertEqual(syscall.M.G.number_of_edges(), edges)
+        self.assertEqual(syscall.M.drain_topology_delta()['removed_edges'], [])
+        # Node ids stay dense, one state row per node
+        n = syscall.M.G.number_of_nodes()
+        with self.assertRaises(ValueError):
+            syscall.M.add_node(n + 30)
+        syscall.M.add_node(n)
+        self.assertEqual(syscall.M.G.number_of_nodes(), n + 1)
+        self.assertEqual(len(syscall.M.state_array), n + 1)
+        self.assertEqual(syscall.M.drain_topology_delta()['added_nodes'], [n])
+    
+    def test_csr_topology_memory(self):
+        """Test the CSR manifold's array-backed tracker matches networkx and stays compact."""
+        import gc
+        import tracemalloc
+        from pprp.manifold import EnhancedSubstrateManifold
+        from pprp.topology import ArrayTopologyTracker
+        n = 5000
+        options = PPRIPOptions(initial_num_nodes=n, graph_backend="csr")
+        # Warm the shared prime table and imports so only the manifold is measured
+        EnhancedSubstrateManifold(n, 4, options, rng=np.random.default_rng(0)).get_topology()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            M = EnhancedSubstrateManifold(n, 4, options, rng=np.random.default_rng(1))
+            topology = M.get_topology()
+            gc.collect()
+            used = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        self.assertIsInstance(topology, ArrayTopologyTracker)
+        # States, CSR arrays, tracker and cycle basis together
+        self.assertLess(used / n, 512)
+        G = M.G.to_networkx()
+        self.assertEqual(topology.beta1, len(nx.cycle_basis(G)))
+        self.assertEqual(len(M.cycle_basis()), topology.beta1)
+        for cycle in M.cycle_basis()[::97]:
+            for a, b in zip(cycle, cycle[1:] + cycle[:1]):
+                self.assertTrue(G.has_edge(a, b))
+        # Incremental updates after the array build
+        u, v = 0, n // 2
+        self.assertFalse(G.has_edge(u, v))
+        M.add_edge(u, v)
+        M.add_node(n)
+        M.add_edge(n, 1)
+        self.assertEqual(M.get_topology().beta1, topology.beta1)
+        self.assertIs(M.get_topology(), topology)
+        G.add_edges_from([(u, v), (n, 1)])
+        self.assertEqual(topology.beta1, len(nx.cycle_basis(G)))
+        self.assertTrue(topology.connected(n, u))
+    
+    def test_prime_table(self):
+        """Test the shared segmented sieve, including growth and persistence."""
+        import tempfile
+        from pprp.primes import PrimeTable
+        def naive(n):
+            return [p for p in range(2, n + 1) if all(p % d for d in range(2, int(p ** 0.5) + 1))]
+        table = PrimeTable(segment_size=100)
+        for n in [0, 2, 30, 29, 1000, 999, 5000]:
+            self.assertEqual(table.primes_up_to(n).tolist(), naive(n))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'primes.npy')
+            table.save(path)
+            restored = PrimeTable()
+            restored.load(path)
+            self.assertEqual(restored.limit, 5000)
+            self.assertEqual(restored.primes_up_to(6000).tolist(), naive(6000))
+    
+    def test_delta_graph_info(self):
+        """Test delta awareness reports topology changes and lazy full views."""
+        syscall = EnhancedCGOSSyscall(PPRIPOptions(initial_num_nodes=10, awareness_mode="delta"))
+        syscall.process_input(1.0)
+        M = syscall.M
+        u, v = next((u, v) for u in M.G for v in M.G if u != v and not M.G.has_edge(u, v))
+        M.add_edge(u, v)
+        syscall.Â(syscall.global_c, syscall._evaluate_cores(), M)
+        graph_info = syscall.global_c['graph_info']
+        self.assertIn((u, v), graph_info['added_edges'])
+        self.assertEqual(graph_info['num_edges'], M.G.number_of_edges())
+        self.assertEqual(list(graph_info['nodes']), list(M.G.nodes()))
+        self.assertEqual(len(graph_info['edges']), M.G.number_of_edges())
+        
+        # Views belong to the step that produced them
+        syscall.Â(syscall.global_c, syscall._evaluate_cores(), M)
+        stale = syscall.global_c['graph_info']['edges']
+        M.repair_edge()
+        with self.assertRaises(RuntimeError):
+            len(stale)
+        csr = EnhancedCGOSSyscall(PPRIPOptions(initial_num_nodes=10, awareness_mode="delta", graph_backend="csr"))
+        csr.Â(csr.global_c, csr._evaluate_cores(), csr.M)
+        edges = list(csr.M.G.edges())
+        view = csr.global_c['graph_info']['edges']
+        csr.M.repair_edge()
+        self.assertEqual(list(view), edges)
+    
+    def test_edge_repair_index(self):
+        """Test β₁ repair candidates for every policy."""
+        from pprp.repair import EdgeRepairIndex
+        from pprp.topology import TopologyTracker
+        G = nx.gnm_random_graph(15, 60, seed=2)
+        def first_missing(G):
+            nodes = list(G.nodes())
+            return next((nodes[i], nodes[j]) for i in range(len(nodes))
+                        for j in range(i + 1, len(nodes)) if not G.has_edge(nodes[i], nodes[j]))
+        index = EdgeRepairIndex(G, 'lowest')
+        for _ in range(10):
+            edge = index.propose()
+            self.assertEqual(edge, first_missing(G))
+            G.add_edge(*edge)
+        topology = TopologyTracker.from_graph(G)
+        for policy in ['random', 'shortest_cycle']:
+            index = EdgeRepairIndex(G, policy, rng=np.random.default_rng(0))
+            u, v = index.propose(topology)
+            self.assertFalse(G.has_edge(u, v))
+            self.assertTrue(topology.connected(u, v))
+            if policy == 'shortest_cycle':
+                self.assertTrue(set(G.neighbors(u)) & set(G.neighbors(v)))
+        self.assertIsNone(EdgeRepairIndex(nx.complete_graph(5)).propose())
+        
+        syscall = EnhancedCGOSSyscall(PPRIPOptions(initial_num_nodes=10, repair_policy="shortest_cycle"))
+        beta1 = syscall.M.get_topology().beta1
+        self.assertIsNotNone(syscall.M.repair_edge())
+        self.assertEqual(syscall.M.get_topology().beta1, beta1 + 1)
+    
+    def test_ensemble_runner(self):
+        """Test seeded ensembles are reproducible regardless of worker count."""
+        from pprp.ensemble import EnsembleRunner, make_jobs
+        options = PPRIPOptions(initial_num_nodes=10)
+        jobs = make_jobs(options, [1.0, 2.0, 0.5, 3.0], num_runs=4, master_seed=7)
+        serial = EnsembleRunner(max_workers=1).run(jobs)
+        pooled = EnsembleRunner(max_workers=2).run(jobs)
+        self.assertEqual([s.index for s in pooled], [0, 1, 2, 3])
+        for a, b in zip(serial, pooled):
+            self.assertEqual(a.final_metrics, b.final_metrics)
+            np.testing.assert_array_equal(a.emergence_steps, b.emergence_steps)
+        self.assertNotEqual(serial[0].final_metrics, serial[1].final_metrics)
+        
+        stats = EnsembleRunner(max_workers=1).run_seeded(options, [1.0, 2.0], 3, master_seed=7)
+        self.assertEqual(stats['num_runs'], 3)
+        self.assertTrue(0.0 <= stats['emergence_rate'] <= 1.0)
+        self.assertEqual(set(stats['final_metrics_mean']), set(serial[0].final_metrics))
+        # Every run releases its core worker threads
+        import threading
+        threads = threading.active_count()
+        EnsembleRunner(max_workers=1).run(make_jobs(PPRIPOptions(initial_num_nodes=10, core_workers=2),
+                                                    [1.0], num_runs=2, master_seed=7))
+        self.assertEqual(threading.active_count(), threads)
+    
+    def test_checkpoint_roundtrip(self):
+        """Test a saved system restores its graph, states and context."""
+        import tempfile
+        from pprp.graph_backend import CSRGraph
+        for backend in ['networkx', 'csr']:
+            syscall = EnhancedCGOSSyscall(PPRIPOptions(initial_num_nodes=12, graph_backend=backend))
+            for x in [1.0, 2.0, 3.0]:
+                syscall.process_input(x)
+            with tempfile.TemporaryDirectory() as tmp:
+                syscall.save_checkpoint(tmp)
+                restored = EnhancedCGOSSyscall.load_checkpoint(tmp)
+                self.assertIsInstance(restored.M.state_array, np.memmap)
+                np.testing.assert_array_equal(restored.M.state_array, syscall.M.state_array)
+                self.assertEqual(sorted(map(sorted, restored.M.G.edges())), sorted(map(sorted, syscall.M.G.edges())))
+                self.assertEqual(restored.M.primes, syscall.M.primes)
+                self.assertEqual(restored.M.get_topology().beta1, syscall.M.get_topology().beta1)
+                self.assertEqual(restored.global_c['timestamp'], syscall.global_c['timestamp'])
+                self.assertEqual(restored.global_c['prime_mask'], syscall.global_c['prime_mask'])
+                self.assertEqual(len(restored.global_c['emergence_history']),
+                                 len(syscall.global_c['emergence_history']))
+                self.assertEqual(restored.global_c['emergence_history'].total,
+                                 syscall.global_c['emergence_history'].total)
+                self.assertEqual(restored.rng.random(), syscall.rng.random())
+                if backend == 'csr':
+                    self.assertIsInstance(restored.M.G, CSRGraph)
+                restored.process_input(4.0)
+                self.assertEqual(restored.global_c['timestamp'], syscall.global_c['timestamp'] + 1)
+                del restored
+        
+        # Saving a restored system back over the files it still maps
+        syscall = EnhancedCGOSSyscall(PPRIPOptions(initial_num_nodes=300, emergence_capacity=2))
+        for t in range(5):
+            syscall.global_c['emergence_history'].record(t, "insight", {'π': 0.0})
+        with tempfile.TemporaryDirectory() as tmp:
+            syscall.save_checkpoint(tmp)
+            restored = EnhancedCGOSSyscall.load_checkpoint(tmp)
+            restored.save_checkpoint(tmp)
+            again = EnhancedCGOSSyscall.load_checkpoint(tmp)
+            np.testing.assert_array_equal(again.M.state_array, syscall.M.state_array)
+            # Events evicted by the ring buffer still count towards the total
+            self.assertEqual(len(again.global_c['emergence_history']), 2)
+            self.assertEqual(again.global_c['emergence_history'].total, 5)
+            del restored, again
+            
+            # An overwrite that fails part-way leaves no sidecar behind
+            from unittest import mock
+            with mock.patch('numpy.save', side_effect=[None, OSError("disk full")]):
+                with self.assertRaises(OSError):
+                    syscall.save_checkpoint(tmp)
+            with self.assertRaises(FileNotFoundError):
+                EnhancedCGOSSyscall.load_checkpoint(tmp)
+    
+    def test_emergence_log(self):
+        """Test the columnar emergence log: retention, queries and spill."""
+        import tempfile
+        from pprp.emergence_log import EmergenceLog
+        with tempfile.TemporaryDirectory() as tmp:
+            spill = os.path.join(tmp, 'emergence.bin')
+            log = EmergenceLog(capacity=4, spill_path=spill)
+            for t in range(10):
+                log.append({'timestamp': t, 'insight': 'even' if t % 2 == 0 else 'odd',
+                            'metrics': {'π': t, 'φ': 0.0, 'Ω': 2.0 * t, 'β': 1}})
+            self.assertEqual(len(log), 4)
+            self.assertEqual(log.total, 10)
+            restored = EmergenceLog.from_arrays(**log.to_arrays(), insights=log.insights, capacity=4,
+                                                total=log.total)
+            self.assertEqual((len(restored), restored.total), (4, 10))
+            with self.assertRaises(ValueError):
+                EmergenceLog(capacity=0)
+            with self.assertRaises(ValueError):
+                PPRIPOptions(emergence_capacity=0)
+            self.assertEqual(log.timestamps.tolist(), [6, 7, 8, 9])
+            self.assertEqual(log[-1]['insight'], 'odd')
+            self.assertEqual([e['timestamp'] for e in log], [6, 7, 8, 9])
+            self.assertEqual(log.count_by_insight(), {'even': 2, 'odd': 2})
+            window = log.between(7, 8)
+            self.assertEqual(window['timestamp'].tolist(), [7, 8])
+            self.assertEqual(window['metrics']['Ω'].tolist(), [14.0, 16.0])
+            self.assertEqual(log.aggregate(start=8)['metrics']['π']['mean'], 8.5)
+            log.close()
+            spilled = EmergenceLog.read_spill(spill)
+            self.assertEqual(spilled['timestamp'].tolist(), list(range(10)))
+            self.assertEqual([spilled['insights'][c] for c in spilled['insight'][:2]], ['even', 'odd'])
+        
+        syscall = EnhancedCGOSSyscall(PPRIPOptions(initial_num_nodes=10, emergence_capacity=3))
+        emerged = sum(syscall.process_input(float(i))['emergence_detected'] for i in range(8))
+        history = syscall.global_c['emergence_history']
+        self.assertEqual(history.total, emerged)
+        self.assertEqual(len(history), min(emerged, 3))
+    
+    def test_state_moments(self):
+        """Test running Ω and φ moments track the state array exactly."""
+        syscall = EnhancedCGOSSyscall(PPRIPOptions(initial_num_nodes=20, nodule_mode="fused"))
+        M = syscall.M
+        for x in range(5):
+            syscall.process_input(float(x))
+        M.write_rows(np.array([1, 4, 7]), np.ones((3, 4)))
+        M.inject_noise(0.5)
+        M.write_rows(np.array([0]), np.full((1, 4), 3.0))
+        self.assertAlmostEqual(M.state_variance(), float(np.var(M.state_array)))
+        cumsum = np.cumsum(np.linalg.norm(M.state_array, axis=1))
+        total, prev_total = M.cumulative_magnitudes()
+        self.assertAlmostEqual(total, cumsum[-1])
+        self.assertAlmostEqual(prev_total, cumsum[-2])
+        M.state_array[2] = 10.0  # direct write, announced via mark_modified
+        M.mark_modified()
+        self.assertAlmostEqual(M.state_variance(), float(np.var(M.state_array)))
+        from pprp.integrator import OmegaBetaIntegrator
+        omega, _ = OmegaBetaIntegrator(M.options).monitor(M.state_array, M.G, moments=M.moments())
+        self.assertAlmostEqual(omega, float(np.var(M.state_array)))
+    
+    def test_input_encoder(self):
+        """Test buffer-protocol inputs encode stably and stream in chunks."""
+        import mmap
+        import tempfile
+        from pprp.encoding import InputEncoder
+        encoder = InputEncoder(chunk_size=3)
+        expected = (np.frombuffer(b'h\xc3\xa9llo', dtype=np.uint8) + 1) / 256
+        for data in ['héllo', 'héllo'.encode('utf-8'), bytearray('héllo'.encode('utf-8')),
+                     memoryview('héllo'.encode('utf-8'))]:
+            np.testing.assert_array_equal(encoder.encode(data), expected)
+        np.testing.assert_array_equal(np.concatenate(list(encoder.chunks('héllo'))), expected)
+        values = np.arange(6, dtype=np.int32).reshape(2, 3)
+        np.testing.assert_array_equal(encoder.encode(values), np.arange(6.0))
+        self.assertEqual(encoder.encode(2).tolist(), [2.0])
+        self.assertEqual(encoder.encode(None).tolist(), [1.0])
+        with tempfile.TemporaryFile() as f:
+            f.write(b'\x00\xff' * 4)
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                self.assertEqual(encoder.encode(mm).tolist(), [1 / 256, 1.0] * 4)
+        
+        a = EnhancedCGOSSyscall(PPRIPOptions(initial_num_nodes=10))
+        b = EnhancedCGOSSyscall(PPRIPOptions(initial_num_nodes=10))
+        b.input_encoder.chunk_size = 2
+        payload = bytes(range(256)) * 8
+        self.assertAlmostEqual(a.process_input(payload)['input_resonance_metrics']['dev_phi_data'],
+                               b.process_input(payload)['input_resonance_metrics']['dev_phi_data'])
+        self.assertEqual(a.input_stream.count, len(payload))
+    
+    def test_state_dim_and_dtype(self):
+        """Test state_dim/dtype are honoured end to end without upcasting."""
+        for mode in ['sequential', 'fused']:
+            syscall = EnhancedCGOSSyscall(PPRIPOptions(initial_num_nodes=15, state_dim=7,
+                                                       dtype="float32", nodule_mode=mode))
+            M = syscall.M
+            self.assertEqual(M.state_array.shape, (15, 7))
+            self.assertEqual(M.state_array.dtype, np.float32)
+            for x in range(4):
+                result = syscall.process_input(float(x))
+            M.inject_noise(0.1)
+            M.add_node(99)
+            self.assertEqual(M.state_array.dtype, np.float32)
+            self.assertEqual(M.state_array.shape, (16, 7))
+            for psi_unit in syscall.nodules:
+                if 'processed_state' in psi_unit.state:
+                    self.assertEqual(psi_unit.state['processed_state'].dtype, np.float32)
+            self.assertTrue(all(np.isfinite(v) or v == float('inf') for v in result['system_metrics'].values()))
+            self.assertAlmostEqual(M.state_variance(), float(np.var(M.state_array, dtype=np.float64)), places=5)
+        with self.assertRaises(ValueError):
+            EnhancedCGOSSyscall(PPRIPOptions(initial_num_nodes=10, dtype="float16"))
+    
+    def test_core_executor(self):
+        """Test concurrent core evaluation matches serial evaluation, in order."""
+        serial = EnhancedCGOSSyscall(PPRIPOptions(initial_num_nodes=12), rng=np.random.default_rng(5))
+        threaded = EnhancedCGOSSyscall(PPRIPOptions(initial_num_nodes=12, core_workers=4),
+                                       rng=np.random.default_rng(5))
+        for x in [1.0, 2.0, 3.0]:
+            a = serial.process_input(x)
+            b = threaded.process_input(x)
+            self.assertEqual(list(a['system_metrics'].items()), list(b['system_metrics'].items()))
+        self.assertEqual(set(threaded.get_core_latencies()), set(a['system_metrics']))
+        self.assertTrue(threaded.M.state_array.flags.writeable)
+        
+        from pprp.core_executor import CoreExecutor
+        def writer(manifold):
+            manifold.state_array[0] = 0.0
+        with self.assertRaises(ValueError):
+            CoreExecutor(2).evaluate([writer], threaded.M)
+        self.assertTrue(threaded.M.state_array.flags.writeable)
+        threaded.close()
+    
+    def test_approximate_metrics(self):
+        """Test sampled metrics: exact on recalibration, tagged and close otherwise."""
+        from pprp.sampling import sample_cycle_lengths
+        from pprp.topology import TopologyTracker
+        G = nx.connected_watts_strogatz_graph(200, 6, 0.2, seed=4)
+        lengths, total = sample_cycle_lengths(G, 10**6, np.random.default_rng(0))
+        self.assertEqual(total, TopologyTracker.from_graph(G).beta1)
+        self.assertEqual(len(lengths), total)
+        self.assertTrue((lengths >= 3).all())
+        # One BFS tree per component, all grown together
+        rings = nx.disjoint_union_all([nx.cycle_graph(k) for k in (3, 5, 8)] + [nx.empty_graph(2)])
+        lengths, total = sample_cycle_lengths(rings, 10, np.random.default_rng(0))
+        self.assertEqual(sorted(lengths.tolist()), [3, 5, 8])
+        from pprp.resonance_engine import PiPhiResonanceEngine
+        sampled = PiPhiResonanceEngine().analyze_graph(G, sample_size=50, rng=np.random.default_rng(0))
+        self.assertFalse(sampled['exact'])
+        
+        options = PPRIPOptions(initial_num_nodes=400, approximate_metrics=True, sample_size=200,
+                               recalibrate_every=3)
+        syscall = EnhancedCGOSSyscall(options, rng=np.random.default_rng(1))
+        M = syscall.M
+        tags = []
+        for step in range(6):
+            M.inject_noise(0.05)  # leaves the running moments stale
+            metrics = {m.axiom_id: m for m in (core(M) for core in syscall.cores)}
+            tags.append(metrics['Ω'].exact)
+            self.assertTrue(metrics['β'].exact)
+            if not metrics['Ω'].exact:
+                lo, hi = metrics['Ω'].confidence_interval
+                self.assertLessEqual(lo, metrics['Ω'].value)
+                self.assertLessEqual(metrics['Ω'].value, hi)
+                exact_omega = (M.omega_complexity() + float(np.var(M.state_array))) / 2
+                self.assertAlmostEqual(metrics['Ω'].value, exact_omega, delta=5 * (hi - lo) + 1e-3)
+        self.assertEqual(tags, [True, False, False, True, False, False])
+        
+        # Each evaluation draws its own sample, so the intervals cover at the stated rate
+        from pprp.sampling import ApproximateMetrics
+        approximate = ApproximateMetrics(sample_size=100, recalibrate_every=10**6, rng=np.random.default_rng(2))
+        approximate.omega(M)  # the first evaluation is exact
+        M.inject_noise(0.05)
+        true_var = float(np.var(M.state_array))
+        covered = 0
+        for _ in range(400):
+            estimate, (lo, hi), exact = approximate.omega(M)
+            self.assertFalse(exact)
+            covered += lo <= true_var <= hi
+        self.assertGreater(covered / 400, 0.88)
+        
+        # π samples only while the topology tracker is stale
+        approximate = M.approximate_metrics()
+        self.assertTrue(approximate.pi_scores(M)[2])
+        self.assertNotIn('π', approximate.evaluations)
+        exact = []
+        for node in range(10**6, 10**6 + 3):
+            M.G.add_node(node)  # behind the tracker's back
+            M.mark_modified(states=False)
+            exact.append(approximate.pi_scores(M)[2])
+        self.assertEqual(exact, [True, False, False])
+        self.assertEqual(approximate.evaluations['π'], 3)
+        
+        # In the normal flow, edges added to G directly are sampled until π recalibrates
+        syscall = EnhancedCGOSSyscall(options, rng=np.random.default_rng(3))
+        M = syscall.M
+        syscall.process_input("warm up")
+        rng = np.random.default_rng(4)
+        exact = []
+        for step in range(4):
+            nodes = rng.choice(M.G.number_of_nodes(), size=(3, 2), replace=False)
+            M.G.add_edges_from(nodes.tolist())
+            M.mark_modified(states=False)
+            tracker = M.topology
+            syscall.process_input(f"step {step}")
+            metrics = {m.axiom_id: m for m in syscall._evaluate_cores()}
+            exact.append(metrics['π'].exact)
+            self.assertEqual(M.topology is tracker, not metrics['π'].exact)
+            G = M.G
+            self.assertEqual(M.betti1(), G.number_of_edges() - G.number_of_nodes()
+                             + nx.number_connected_components(G))
+            self.assertEqual(syscall.global_c['graph_info']['num_edges'], G.number_of_edges())
+        # The first stale evaluation recalibrates; later steps sample between recalibrations
+        self.assertTrue(exact[0])
+        self.assertIn(False, exact)
+    
+    def test_sharded_nodules(self):
+        """Test the sharded ψₚ layer matches the fused one and restores private states on close."""
+        fused = EnhancedCGOSSyscall(PPRIPOptions(initial_num_nodes=300, nodule_mode="fused"),
+                                    rng=np.random.default_rng(5))
+        sharded = EnhancedCGOSSyscall(PPRIPOptions(initial_num_nodes=300, nodule_mode="fused", shards=2),
+                                      rng=np.random.default_rng(5))
+        try:
+            for _ in range(3):
+                fused.nodule_executor.run(fused.nodules, fused.M, fused.global_c)
+                sharded.nodule_executor.run(sharded.nodules, sharded.M, sharded.global_c)
+                np.testing.assert_allclose(sharded.M.state_array, fused.M.state_array, rtol=1e-12)
+            self.assertAlmostEqual(sharded.M.state_variance(), float(np.var(sharded.M.state_array)))
+            np.testing.assert_allclose(sharded.M.state_magnitudes(),
+                                       np.linalg.norm(sharded.M.state_array, axis=1))
+            stats = sharded.nodule_executor.stats()
+            self.assertEqual(sum(stats['shard_sizes']), 300)
+            sharded.M.add_node(300)  # replaces state_array: re-shared on the next step
+            sharded.nodule_executor.run(sharded.nodules, sharded.M, sharded.global_c)
+            self.assertEqual(len(sharded.M.state_array), 301)
+        finally:
+            sharded.close()
+        self.assertIsNone(sharded.M.state_array.base)
+        self.assertAlmostEqual(sharded.M.state_variance(), float(np.var(sharded.M.state_array)))
+        # Shards only run the fused layer
+        with self.assertRaises(ValueError):
+            PPRIPOptions(shards=2, nodule_mode="sequential")
+    
+    def test_multi_system_engine(self):
+        """Test the block-diagonal engine matches per-system fused steps and cores."""
+        from pprp.multi_system import MultiSystemEngine, INSIGHTS
+        def system(n):
+            # thresholds that never trigger noise or repair: a step is the nodule layer only
+            return EnhancedCGOSSyscall(PPRIPOptions(initial_num_nodes=n, nodule_mode="fused",
+                                                    thresh_omega=-1.0, thresh_beta1=0),
+                                       rng=np.random.default_rng(n))
+        def systems():
+            return [system(n) for n in (20, 30, 45, 60)]
+        packed, reference = systems(), systems()
+        engine = MultiSystemEngine.from_systems(packed, rng=np.random.default_rng(0))
+        self.assertEqual(len(engine.states), 155)
+        indptr, indices = engine.csr()
+        self.assertEqual(indptr[-1], 2 * sum(s.M.G.number_of_edges() for s in packed))
+        for _ in range(3):
+            result = engine.step()
+            for s in reference:
+                s.nodule_executor.run(s.nodules, s.M, s.global_c)
+        self.assertEqual(result['timestamp'], 3)
+        self.assertEqual(result['emergence_detected'].shape, (4,))
+        self.assertTrue(all(INSIGHTS[c] is None or c > 0 for c in result['insight']))
+        engine.sync()
+        for i, (p, r) in enumerate(zip(packed, reference)):
+            # Each system's graph comes from its own generator, not the global ones
+            self.assertEqual(sorted(p.M.G.edges()), sorted(r.M.G.edges()))
+            np.testing.assert_allclose(p.M.state_array, r.M.state_array, rtol=1e-12)
+            for core in r.cores:
+                metric = core(r.M)
+                self.assertAlmostEqual(result['system_metrics'][metric.axiom_id][i], metric.value)
+        
+        # Low Ω everywhere: every system gets noise, stacked per step
+        engine.options = PPRIPOptions(thresh_omega=1e9)
+        before = engine.states.copy()
+        run = engine.run(2)
+        self.assertEqual(run['system_metrics']['Ω'].shape, (2, 4))
+        self.assertTrue((engine.states != before).any(axis=1).all())
+    
+    def test_prime_activation(self):
+        """Test the prime activation array: int compatibility, bulk updates and masked nodules."""
+        from pprp.prime_mask import PrimeActivation
+        primes = [2, 3, 5, 7, 11, 13]
+        mask = PrimeActivation.from_int(primes, 0b101010)
+        self.assertEqual(int(mask), 0b101010)
+        self.assertEqual(mask, 0b101010)
+        self.assertTrue(mask & (1 << 3))
+        self.assertFalse((1 << 2) & mask)
+        self.assertTrue(mask.is_active(5))
+        self.assertFalse(mask.is_active(7))
+        mask.enable(lo=7, hi=12)
+        self.assertEqual(mask.active_primes().tolist(), [3, 5, 7, 11])
+        mask.disable(where=lambda p: p % 4 == 3)
+        self.assertEqual(mask.active_primes().tolist(), [5])
+        self.assertEqual(bin(mask), bin(0b10 | 1 << 5))
+        mask.disable().enable(fraction=0.5, rng=np.random.default_rng(0))
+        self.assertEqual(len(mask.active_primes()), 3)
+        from pprp.primes import primes_up_to
+        large = PrimeActivation.from_int(primes_up_to(10**5), 0).enable(lo=99000)
+        self.assertTrue(large.is_active(99991))
+        self.assertTrue(large & (1 << 99991))
+        self.assertFalse(large.is_active(98999))
+        # Bit-setting operators keep the activation type
+        mask = PrimeActivation.from_int(primes, 0b101010)
+        mask |= 1 << 7
+        self.assertIsInstance(mask, PrimeActivation)
+        self.assertTrue(mask.is_active(7))
+        self.assertEqual(mask | 1 << 13 | 1 << 4, 0b101010 | 1 << 7 | 1 << 13 | 1 << 4)
+        self.assertEqual((1 << 11) | mask, 0b101010 | 1 << 7 | 1 << 11)
+        self.assertEqual(mask ^ (1 << 3), 0b100010 | 1 << 7)
+        mask ^= 1 << 5
+        self.assertFalse(mask.is_active(5))
+        self.assertEqual((~mask).active_primes().tolist(), [2, 5, 11, 13])
+        
+        syscall = EnhancedCGOSSyscall(PPRIPOptions(nodule_mode="fused", mask_nodules=True),
+                                      rng=np.random.default_rng(3))
+        syscall.global_c['prime_mask'].disable()
+        before = syscall.M.state_array.copy()
+        syscall.nodule_executor.run(syscall.nodules, syscall.M, syscall.global_c)
+        # Every prime masked: only the 0.5-per-prime decay remains
+        np.testing.assert_allclose(syscall.M.state_array[1], before[1])
+        np.testing.assert_allclose(syscall.M.state_array[2], 0.5 * before[2])
+        self.assertFalse(any(u.state['active'] for u in syscall.nodules))
+    
+    def test_select_batch(self):
+        """Test alias-table draws follow their weights and batched selection is thread-safe."""
+        from concurrent.futures import ThreadPoolExecutor
+        from pprp.selection import AliasTable
+        rng = np.random.default_rng(0)
+        cases = [rng.random(500), np.r_[1e6, np.full(999, 1e-3)], np.r_[0.0, np.full(300, 1.001), 0.5]]
+        for weights in cases:
+            table = AliasTable(weights, max_rounds=2)
+            # Each column's kept mass plus the mass aliased to it reproduces the weights
+            mass = table.prob.copy()
+            np.add.at(mass, table.alias, 1.0 - table.prob)
+            np.testing.assert_allclose(mass / len(weights), weights / weights.sum(), atol=1e-9)
+        draws = AliasTable([1.0, 2.0, 7.0]).draw(rng.random(200000))
+        np.testing.assert_allclose(np.bincount(draws) / len(draws), [0.1, 0.2, 0.7], atol=0.01)
+        with self.assertRaises(ValueError):
+            AliasTable([0.0, 0.0])
+        
+        syscall = EnhancedCGOSSyscall(rng=np.random.default_rng(0))
+        selection = syscall.ℛ
+        choices = np.arange(1000)
+        picked = selection.select_batch(choices, 0.5, 64, syscall.options, rng=np.random.default_rng(1))
+        self.assertEqual(picked.shape, (64,))
+        self.assertTrue(np.isin(picked, choices).all())
+        # No jitter: weights are the coherence values, and their table is reused
+        fixed = PPRIPOptions(coupling_strength=0.0)
+        coherence = np.zeros(1000)
+        coherence[7] = 1.0
+        self.assertTrue((selection.select_batch(choices, coherence, 10, fixed) == 7).all())
+        selection.select_batch(choices, coherence, 10, fixed)
+        self.assertEqual(selection._selector.hits, 1)
+        self.assertEqual(list(selection.select_batch(['a', 'b'], 1.0, 3, fixed, rng=np.random.default_rng(2))),
+                         list(np.array(['a', 'b'], dtype=object)[(np.random.default_rng(2).random(3) * 2).astype(int)]))
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: selection.select_batch(choices, 0.3, 1000, syscall.options), range(16)))
+        self.assertTrue(all(r.shape == (1000,) for r in results))
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Startup Tests
+
+Cold-import budgets. The package namespaces' lazy ``_init_.py`` must not
+pull in NumPy, networkx or matplotlib until a name that needs them is used.
+Those files are not ``__init__.py``, so a plain ``import pprp`` never runs
+them; the probe loads them explicitly, and the real import path is timed
+separately through ``import pprp.system_api``, which defers sharding,
+thread-pool and checkpoint modules to the systems that use them.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# Wall-time budget (seconds) for importing one namespace in a fresh interpreter
+IMPORT_BUDGET = 0.25
+
+# Wall-time budget (seconds) for a real ``import pprp.system_api`` once NumPy and networkx are loaded
+SYSTEM_API_BUDGET = 0.15
+
+HEAVY_MODULES = ('numpy', 'networkx', 'matplotlib')
+
+# Imported by EnhancedCGOSSyscall only for shards, core_workers or checkpoints
+DEFERRED_MODULES = ('pprp.sharding', 'pprp.core_executor', 'pprp.checkpoint', 'multiprocessing.shared_memory')
+
+# Runs in a fresh interpreter: loads a namespace from its ``_init_.py``,
+# optionally touches attributes, and reports the import time and heavy modules loaded
+PROBE = '''
+import importlib.util, json, os, sys, time
+src, package, attrs, heavy = sys.argv[1], sys.argv[2], sys.argv[3].split(), sys.argv[4].split()
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location(
+    package, os.path.join(src, package, '_init_.py'),
+    submodule_search_locations=[os.path.join(src, package)])
+module = importlib.util.module_from_spec(spec)
+sys.modules[package] = module
+spec.loader.exec_module(module)
+elapsed = time.perf_counter() - start
+for attr in attrs:
+    getattr(module, attr)
+print(json.dumps({'elapsed': elapsed, 'loaded': [m for m in heavy if m in sys.modules]}))
+'''
+
+# Runs in a fresh interpreter: times the import statement users actually run,
+# after NumPy and networkx so only the package's own modules count
+SYSTEM_API_PROBE = '''
+import json, sys, time
+import numpy, networkx
+watched = sys.argv[1].split()
+start = time.perf_counter()
+import pprp.system_api
+elapsed = time.perf_counter() - start
+print(json.dumps({'elapsed': elapsed, 'loaded': [m for m in watched if m in sys.modules]}))
+'''
+
+class TestStartup(unittest.TestCase):
+    """Test cases for lazy package imports."""
+    
+    def probe(self, package, attrs=()):
+        """Import ``package`` cold in a subprocess; returns its import time and heavy modules loaded."""
+        out = subprocess.run(
+            [sys.executable, '-c', PROBE, SRC, package, ' '.join(attrs), ' '.join(HEAVY_MODULES)],
+            capture_output=True, text=True, check=True, cwd=SRC).stdout
+        return json.loads(out)
+    
+    def test_namespaces_import_lazily(self):
+        """Test every namespace imports within budget without heavy dependencies."""
+        for package in ('pprp', 'qica', 'learning', 'core'):
+            with self.subTest(package=package):
+                result = self.probe(package)
+                self.assertEqual(result['loaded'], [])
+                self.assertLess(result['elapsed'], IMPORT_BUDGET)
+    
+    def test_light_names_stay_light(self):
+        """Test names from dependency-free modules resolve without loading heavy modules."""
+        self.assertEqual(self.probe('learning', ['ModelRegistry', 'ValidationLayer'])['loaded'], [])
+        self.assertEqual(self.probe('qica', ['EnhancedConsciousnessConstants'])['loaded'], [])
+        self.assertEqual(self.probe('pprp', ['PPRIPOptions'])['loaded'], [])
+    
+    def test_heavy_names_load_on_first_use(self):
+        """Test a name from a NumPy-backed module imports it on first access."""
+        self.assertIn('numpy', self.probe('learning', ['EnhancedAutonomousLearningCycle'])['loaded'])
+    
+    def test_system_api_import(self):
+        """Test a real ``import pprp.system_api`` stays within budget and defers optional machinery."""
+        out = subprocess.run(
+            [sys.executable, '-c', SYSTEM_API_PROBE, ' '.join(('matplotlib',) + DEFERRED_MODULES)],
+            capture_output=True, text=True, check=True, cwd=SRC).stdout
+        result = json.loads(out)
+        self.assertEqual(result['loaded'], [])
+        self.assertLess(result['elapsed'], SYSTEM_API_BUDGET)
+    
+    def test_unknown_name(self):
+        """Test unknown attributes still raise AttributeError."""
+        with self.assertRaises(subprocess.CalledProcessError):
+            self.probe('learning', ['NoSuchName'])
+
+if __name__ == '__main__':
+    unittest.main()